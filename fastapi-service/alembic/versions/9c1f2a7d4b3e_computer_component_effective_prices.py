@@ -0,0 +1,53 @@
+"""computer component effective prices
+
+Revision ID: 9c1f2a7d4b3e
+Revises: 4049d8459057
+Create Date: 2026-10-18 09:12:41.331208
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from src.computer_components.effective_price_triggers import (
+    REFRESH_FUNCTION_SQL,
+    TRIGGER_FUNCTION_SQL,
+    TRIGGERS_SQL,
+    BACKFILL_SQL
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c1f2a7d4b3e'
+down_revision: Union[str, None] = '4049d8459057'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('computer_component_effective_prices',
+    sa.Column('component_id', sa.Integer(), nullable=False),
+    sa.Column('day_type', sa.Integer(), nullable=False),
+    sa.Column('price_per_unit', sa.Numeric(precision=20, scale=6), nullable=False),
+    sa.ForeignKeyConstraint(['component_id'], ['computer_components.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('component_id', 'day_type')
+    )
+    op.create_index('ix_effective_prices_day_type_price', 'computer_component_effective_prices', ['day_type', 'price_per_unit', 'component_id'], unique=False)
+
+    op.execute(REFRESH_FUNCTION_SQL)
+    op.execute(TRIGGER_FUNCTION_SQL)
+    for statement in TRIGGERS_SQL:
+        op.execute(statement)
+    op.execute(BACKFILL_SQL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS sell_price_settings_inserted ON computer_component_sell_price_settings")
+    op.execute("DROP TRIGGER IF EXISTS sell_price_settings_updated ON computer_component_sell_price_settings")
+    op.execute("DROP TRIGGER IF EXISTS sell_price_settings_deleted ON computer_component_sell_price_settings")
+    op.execute("DROP FUNCTION IF EXISTS computer_component_sell_price_settings_changed()")
+    op.execute("DROP FUNCTION IF EXISTS refresh_component_effective_prices(integer[])")
+    op.drop_index('ix_effective_prices_day_type_price', table_name='computer_component_effective_prices')
+    op.drop_table('computer_component_effective_prices')
@@ -0,0 +1,56 @@
+"""computer component rating summaries
+
+Revision ID: b7e3d91c5a20
+Revises: 9c1f2a7d4b3e
+Create Date: 2026-10-18 10:02:17.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from src.computer_components.rating_summary_triggers import (
+    APPLY_CHANGES_FUNCTION_SQL,
+    TRIGGER_FUNCTION_SQL,
+    TRIGGERS_SQL,
+    BACKFILL_SQL
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3d91c5a20'
+down_revision: Union[str, None] = '9c1f2a7d4b3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('computer_component_rating_summaries',
+    sa.Column('component_id', sa.Integer(), nullable=False),
+    sa.Column('review_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('rating_sum', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('rating_1_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('rating_2_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('rating_3_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('rating_4_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('rating_5_count', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['component_id'], ['computer_components.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('component_id')
+    )
+
+    op.execute(APPLY_CHANGES_FUNCTION_SQL)
+    op.execute(TRIGGER_FUNCTION_SQL)
+    for statement in TRIGGERS_SQL:
+        op.execute(statement)
+    op.execute(BACKFILL_SQL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS component_reviews_inserted ON computer_component_reviews")
+    op.execute("DROP TRIGGER IF EXISTS component_reviews_updated ON computer_component_reviews")
+    op.execute("DROP TRIGGER IF EXISTS component_reviews_deleted ON computer_component_reviews")
+    op.execute("DROP FUNCTION IF EXISTS computer_component_reviews_changed()")
+    op.execute("DROP FUNCTION IF EXISTS apply_component_rating_changes(integer[], integer[], integer)")
+    op.drop_table('computer_component_rating_summaries')
@@ -0,0 +1,52 @@
+"""payment daily rollups
+
+Revision ID: c8f1a3e6d024
+Revises: a6d2e4f7b915
+Create Date: 2026-10-18 19:12:08.331726
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from src.infrastructure.persistence.payment_rollup_triggers import (
+    APPLY_CHANGES_FUNCTION_SQL,
+    TRIGGER_FUNCTION_SQL,
+    TRIGGERS_SQL,
+    BACKFILL_SQL
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f1a3e6d024'
+down_revision: Union[str, None] = 'a6d2e4f7b915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('payment_daily_rollups',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('currency', sa.Integer(), nullable=False),
+    sa.Column('payment_method', sa.Integer(), nullable=False),
+    sa.Column('payment_count', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('amount', sa.Numeric(precision=26, scale=6), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('day', 'currency', 'payment_method')
+    )
+
+    op.execute(APPLY_CHANGES_FUNCTION_SQL)
+    op.execute(TRIGGER_FUNCTION_SQL)
+    for statement in TRIGGERS_SQL:
+        op.execute(statement)
+    op.execute(BACKFILL_SQL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS payments_inserted ON payments")
+    op.execute("DROP TRIGGER IF EXISTS payments_updated ON payments")
+    op.execute("DROP TRIGGER IF EXISTS payments_deleted ON payments")
+    op.execute("DROP FUNCTION IF EXISTS payments_changed()")
+    op.execute("DROP FUNCTION IF EXISTS apply_payment_rollup_changes(date[], integer[], integer[], numeric[], integer)")
+    op.drop_table('payment_daily_rollups')
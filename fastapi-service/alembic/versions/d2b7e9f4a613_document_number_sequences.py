@@ -0,0 +1,36 @@
+"""document number sequences
+
+Revision ID: d2b7e9f4a613
+Revises: c8f1a3e6d024
+Create Date: 2026-10-18 20:31:47.552093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from src.document_numbers.sequences import (
+    DOCUMENT_SEQUENCES,
+    create_sequence_sql,
+    sync_sequence_sql
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b7e9f4a613'
+down_revision: Union[str, None] = 'c8f1a3e6d024'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for sequence in DOCUMENT_SEQUENCES:
+        op.execute(create_sequence_sql(sequence))
+        op.execute(sync_sequence_sql(sequence))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for sequence in DOCUMENT_SEQUENCES:
+        op.execute(f"DROP SEQUENCE IF EXISTS {sequence.name}")
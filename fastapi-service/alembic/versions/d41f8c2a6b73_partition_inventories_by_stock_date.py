@@ -0,0 +1,90 @@
+"""partition inventories by stock_date
+
+Revision ID: d41f8c2a6b73
+Revises: b7e3d91c5a20
+Create Date: 2026-10-18 13:20:05.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from src.inventories.partitions import ENSURE_PARTITIONS_FUNCTION_SQL
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f8c2a6b73'
+down_revision: Union[str, None] = 'b7e3d91c5a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = (
+    "id, in_stock, out_stock, stock_date, component_id, resource_type, resource_id, "
+    "resource_line_type, resource_line_id, buy_price, created_at, updated_at"
+)
+
+
+def create_inventories_table(primary_key, **kwargs) -> None:
+    op.create_table('inventories',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('inventories_id_seq')"), nullable=False),
+    sa.Column('in_stock', sa.Numeric(precision=20, scale=6), nullable=True),
+    sa.Column('out_stock', sa.Numeric(precision=20, scale=6), nullable=True),
+    sa.Column('stock_date', sa.Date(), nullable=False),
+    sa.Column('component_id', sa.Integer(), nullable=False),
+    sa.Column('resource_type', sa.String(), nullable=False),
+    sa.Column('resource_id', sa.Integer(), nullable=False),
+    sa.Column('resource_line_type', sa.String(), nullable=False),
+    sa.Column('resource_line_id', sa.Integer(), nullable=False),
+    sa.Column('buy_price', sa.Numeric(precision=20, scale=6), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['component_id'], ['computer_components.id'], ),
+    primary_key,
+    **kwargs
+    )
+    op.execute("ALTER SEQUENCE inventories_id_seq OWNED BY inventories.id")
+    op.create_index('ix_resource_type_id', 'inventories', ['resource_type', 'resource_id'], unique=False)
+
+
+def rename_old_table() -> None:
+    """Moves the current table aside, its id sequence is kept for the new one"""
+    op.execute("ALTER SEQUENCE inventories_id_seq OWNED BY NONE")
+    op.rename_table('inventories', 'inventories_old')
+    op.execute("ALTER TABLE inventories_old RENAME CONSTRAINT inventories_pkey TO inventories_old_pkey")
+    op.execute("ALTER INDEX ix_resource_type_id RENAME TO ix_resource_type_id_old")
+
+
+def copy_from_old_table() -> None:
+    op.execute(f"INSERT INTO inventories ({COLUMNS}) SELECT {COLUMNS} FROM inventories_old")
+    op.drop_table('inventories_old')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    rename_old_table()
+    create_inventories_table(
+        sa.PrimaryKeyConstraint('id', 'stock_date', name='inventories_pkey'),
+        postgresql_partition_by='RANGE (stock_date)'
+    )
+    op.create_index('ix_inventories_component_id_stock_date', 'inventories', ['component_id', 'stock_date'], unique=False)
+    op.execute("CREATE TABLE inventories_default PARTITION OF inventories DEFAULT")
+    op.execute(ENSURE_PARTITIONS_FUNCTION_SQL)
+
+    # Every month that has rows gets its partition before the copy, so nothing lands in the default one
+    op.execute("""
+        SELECT ensure_inventory_partitions(
+            LEAST(MIN(stock_date), current_date),
+            (GREATEST(MAX(stock_date), current_date) + interval '3 months')::date
+        )
+        FROM inventories_old
+    """)
+    copy_from_old_table()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    rename_old_table()
+    create_inventories_table(sa.PrimaryKeyConstraint('id', name='inventories_pkey'))
+    copy_from_old_table()
+    op.execute("DROP FUNCTION IF EXISTS ensure_inventory_partitions(date, date)")
@@ -0,0 +1,54 @@
+"""hot query indexes
+
+Revision ID: e8a2c5f10d94
+Revises: d41f8c2a6b73
+Create Date: 2026-10-18 14:05:37.652019
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8a2c5f10d94'
+down_revision: Union[str, None] = 'd41f8c2a6b73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# name: (table, columns, partial index predicate)
+INDEXES = {
+    'ix_purchase_invoices_deleted_invoice_date': ('purchase_invoices', ['deleted', 'invoice_date'], None),
+    'ix_purchase_invoice_lines_purchase_invoice_id': ('purchase_invoice_lines', ['purchase_invoice_id'], None),
+    'ix_inbound_delivery_lines_purchase_invoice_line_id': ('inbound_delivery_lines', ['purchase_invoice_line_id'], None),
+    'ix_sales_invoices_customer_id_status': ('sales_invoices', ['customer_id', 'status'], None),
+    'ix_sales_invoices_pending': ('sales_invoices', ['id'], 'status = 0'),
+    'ix_sales_invoice_lines_sales_invoice_id': ('sales_invoice_lines', ['sales_invoice_id'], None),
+    'ix_payments_created_at': ('payments', ['created_at'], None),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps the tables writable while the indexes build, it cannot run inside a transaction.
+    # A build that fails halfway leaves an INVALID index behind: drop it and run the upgrade again.
+    with op.get_context().autocommit_block():
+        for name, (table, columns, where) in INDEXES.items():
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, (table, _, _) in INDEXES.items():
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
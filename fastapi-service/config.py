@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from pathlib import Path
+from typing import Optional
 
 class Settings(BaseSettings):
     JWT_SECRET_KEY: str
@@ -9,6 +10,7 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_MINUTES: int
     AWS_ACCESS_KEY_ID: str
     AWS_SECRET_ACCESS_KEY: str
+    AWS_S3_ENDPOINT_URL: Optional[str] = None
     DB_TEST_ENGINE: str
     DB_TEST_USERNAME: str
     DB_TEST_PASSWORD: str
@@ -31,10 +33,21 @@ class Settings(BaseSettings):
     WEB_ENVIRONMENT: str
     OPENAI_API_KEY: str
     OPENAI_BOT_MODEL: str
+    OPENAI_BASE_URL: Optional[str] = None
+    RAILS_BASE_URL: str = "http://rails:3000"
     ADYEN_API_KEY: str
     ADYEN_MERCHANT_ACCOUNT: str
     ADYEN_CLIENT_KEY: str
     ADYEN_HMAC_KEY: str
+    DB_POOL_MODE: Optional[str] = None
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: Optional[int] = None
+    DB_POOL_RECYCLE: Optional[int] = None
+    DB_POOL_PRE_PING: Optional[bool] = None
+    DB_ECHO: bool = False
+    # Document numbers each process reserves at once, 1 keeps them ordered across processes
+    DOCUMENT_NUMBER_BLOCK_SIZE: int = 1
 
     class Config:
         env_file = Path(Path(__file__).resolve().parent.resolve().parent) / ".env"
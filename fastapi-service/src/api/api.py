@@ -1,10 +1,10 @@
-import requests
-import uuid
+import httpx
 from src.schemas import ( UploadResponseSchema, ListUploadResponseSchema )
 from fastapi import FastAPI, File, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from botocore.exceptions import ClientError
-from src.api.s3_dependencies import ( bucket_name, s3_client )
+from src.uploads.s3_upload_service import S3UploadService
+from src.api.dependencies.http_clients import ( build_upload_http_client, get_upload_http_client, build_rails_client )
+from src.chatgpt.report_analyzer import build_report_analyzer
 from typing import List
 from src.api.routers import (
     computer_components,
@@ -23,7 +23,9 @@ from src.api.routers import (
     ai_report_analyzer,
     purchase_invoices_query_analysis,
     payment,
-    jobs
+    jobs,
+    health,
+    bulk_data
 )
 from src.api.routers.sales_payment import (
     bank_transfer,
@@ -37,22 +39,58 @@ from contextlib import asynccontextmanager
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from datetime import datetime
 import os
+import asyncio
 from src.api.session_db import get_db
 from sqlalchemy.orm import Session
 from fastapi import Depends
-from src.sales_deliveries.create_service import CreateService as SalesDeliveryCreateService
+from src.sales_deliveries.worker import SalesDeliveryWorker
+from src.inventories.partition_service import PartitionService
+from src.infrastructure.persistence.job_store import JobCache
+from src.infrastructure.http.user_validation_cache import UserValidationCache
+from src.infrastructure.messaging.outbox_dispatcher import ( OutboxDispatcher, OUTBOX_POLL_SECONDS )
+from src.database import SessionLocal
 from config import setting
 
 scheduler = AsyncIOScheduler()
 
-def create_sales_delivery_every_thirty_seconds(db: Session = next(get_db())):
-    create_service = SalesDeliveryCreateService(db)
-    create_service.call()
+async def create_sales_deliveries(worker: SalesDeliveryWorker):
+    await asyncio.to_thread(worker.run)
+
+def ensure_inventory_partitions_daily(db: Session = next(get_db())):
+    PartitionService(db).ensure_upcoming()
+    db.commit()
+
+async def dispatch_outbox(dispatcher: OutboxDispatcher):
+    await dispatcher.dispatch()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    app.state.upload_http_client = build_upload_http_client()
+    app.state.rails_client = build_rails_client()
+    app.state.user_validation_cache = UserValidationCache()
+    app.state.report_analyzer = build_report_analyzer()
+    app.state.job_cache = JobCache()
+    app.state.outbox_dispatcher = OutboxDispatcher(SessionLocal, app.state.rails_client)
+    app.state.sales_delivery_worker = SalesDeliveryWorker(SessionLocal)
+
     if not os.environ.get('TESTING'):
-        scheduler.add_job(create_sales_delivery_every_thirty_seconds, 'interval', seconds=30) # Run every 30 seconds\
+        scheduler.add_job(
+            create_sales_deliveries,
+            'interval',
+            seconds=30,
+            args=[app.state.sales_delivery_worker],
+            max_instances=1,
+            coalesce=True
+        )
+        scheduler.add_job(ensure_inventory_partitions_daily, 'interval', days=1, next_run_time=datetime.now())
+        scheduler.add_job(
+            dispatch_outbox,
+            'interval',
+            seconds=OUTBOX_POLL_SECONDS,
+            args=[app.state.outbox_dispatcher],
+            max_instances=1,
+            coalesce=True
+        )
         scheduler.start()
 
     yield
@@ -60,6 +98,10 @@ async def lifespan(app: FastAPI):
     if not os.environ.get('TESTING'):
         scheduler.shutdown()
 
+    await app.state.upload_http_client.aclose()
+    await app.state.rails_client.aclose()
+    await app.state.report_analyzer.aclose()
+
 app = FastAPI(lifespan=lifespan) # add lifespan to fastapi initialization
 
 origins = [
@@ -95,90 +137,21 @@ app.include_router(webhook.router)
 app.include_router(sessions.router)
 app.include_router(payment.router)
 app.include_router(jobs.router)
+app.include_router(health.router)
+app.include_router(bulk_data.router)
 
 @app.get("/")
 async def root():
     return { "message": "Hello World" }
 
 @app.post("/api/upload_url", response_model=UploadResponseSchema)
-async def upload_file(file: UploadFile):
-    uuid4_value = uuid.uuid4()
-    s3_filename = f"{uuid4_value}_{file.filename}"
-
-    presigned_post = create_presigned_post(s3_filename)
-    if presigned_post is None:
-        exit(1)
-
-    try:
-        file_content = await file.read()
-        files = { 'file': (s3_filename, file_content) }
-        http_response = requests.post(
-            presigned_post['url'],
-            data=presigned_post['fields'],
-            files=files
-        )
-
-        return {
-            'status_code': http_response.status_code,
-            's3_key': presigned_post['fields']['key']
-        }
-    except ClientError as e:
-        logging.error(e)
-        return False
+async def upload_file(file: UploadFile, http_client: httpx.AsyncClient = Depends(get_upload_http_client)):
+    upload_service = S3UploadService(http_client)
+    return await upload_service.upload(file)
     
 @app.post("/api/multi_upload_url", response_model=ListUploadResponseSchema)
-async def upload_files(files: List[UploadFile] = File(...)):
-    presigned_posts = []
+async def upload_files(files: List[UploadFile] = File(...), http_client: httpx.AsyncClient = Depends(get_upload_http_client)):
+    upload_service = S3UploadService(http_client)
+    final_result = await upload_service.upload_many(files)
 
-    for file in files:
-        uuid4_value = uuid.uuid4()
-        s3_filename = f"{uuid4_value}_{file.filename}"
-
-        presigned_post = create_presigned_post(s3_filename)
-        if presigned_post is None:
-            exit(1)
-
-        post_result = {
-            's3_filename': s3_filename,
-            'presigned_post': presigned_post
-        }
-        presigned_posts.append(post_result)
-
-    try:
-        final_result = []
-        for i, post_result in enumerate(presigned_posts):
-            presigned_post = post_result['presigned_post']
-            s3_filename = post_result['s3_filename']
-
-            file_content = await files[i].read()
-            files_to_upload = { 'file': (s3_filename, file_content) }
-            http_response = requests.post(
-                presigned_post['url'],
-                data=presigned_post['fields'],
-                files=files_to_upload
-            )
-
-            result = {
-                'status_code': http_response.status_code,
-                's3_key': presigned_post['fields']['key']
-            }
-            final_result.append(result)
-
-        return {'image_list': final_result}
-    except ClientError as e:
-        logging.error(e)
-        return False
-
-def create_presigned_post(file_name: str):
-    try:
-        response = s3_client().generate_presigned_post(
-            bucket_name(),
-            file_name,
-            ExpiresIn=3600
-        )
-    except ClientError as e:
-        logging.error(e)
-        return None
-    
-    # The response contains the presigned URL and required fields
-    return response
\ No newline at end of file
+    return {'image_list': final_result}
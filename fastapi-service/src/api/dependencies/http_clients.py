@@ -0,0 +1,20 @@
+from fastapi import Request
+from src.infrastructure.http.rails_client import RailsClient
+from config import setting
+import httpx
+
+# Presigned POSTs go straight to S3; uploads can be large so only connecting is bounded tightly
+UPLOAD_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+UPLOAD_HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+
+def build_upload_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(timeout=UPLOAD_HTTP_TIMEOUT, limits=UPLOAD_HTTP_LIMITS)
+
+def get_upload_http_client(request: Request) -> httpx.AsyncClient:
+    return request.app.state.upload_http_client
+
+def build_rails_client() -> RailsClient:
+    return RailsClient(setting.RAILS_BASE_URL)
+
+def get_rails_client(request: Request) -> RailsClient:
+    return request.app.state.rails_client
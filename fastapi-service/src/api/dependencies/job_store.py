@@ -0,0 +1,6 @@
+from fastapi import Request, Depends
+from src.api.session_db import get_session_factory
+from src.infrastructure.persistence.job_store import JobStore
+
+def get_job_store(request: Request, session_factory = Depends(get_session_factory)) -> JobStore:
+    return JobStore(session_factory, request.app.state.job_cache)
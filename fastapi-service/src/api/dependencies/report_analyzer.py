@@ -0,0 +1,5 @@
+from fastapi import Request
+from src.chatgpt.report_analyzer import ReportAnalyzer
+
+def get_report_analyzer(request: Request) -> ReportAnalyzer:
+    return request.app.state.report_analyzer
@@ -0,0 +1,5 @@
+from fastapi import Request
+from src.infrastructure.http.user_validation_cache import UserValidationCache
+
+def get_user_validation_cache(request: Request) -> UserValidationCache:
+    return request.app.state.user_validation_cache
@@ -1,21 +1,73 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.schemas import (
     ReportAnalyzerParams,
     ReportAnalyzerResponse
 )
+import json
 import logging
-from src.chatgpt.ask_chatgpt import AskChatGPT
+from src.chatgpt.report_analyzer import ( ReportAnalyzer, AnalyzerBusyError )
+from src.api.dependencies.report_analyzer import get_report_analyzer
+from src.api.session_db import get_db_async
+from src.chatgpt.digest_prompt_service import DigestPromptService
 
 
 router = APIRouter(prefix='/api/chatbot/analyze_report', tags=["Report Analyzer"])
 
 @router.post("", response_model=ReportAnalyzerResponse, status_code=200)
-def analyze_report(params: ReportAnalyzerParams):
+async def analyze_report(
+        params: ReportAnalyzerParams,
+        analyzer: ReportAnalyzer = Depends(get_report_analyzer),
+        db: AsyncSession = Depends(get_db_async)
+    ):
     try:
-        user_input = params.user_input
-        response_from_chatgpt = AskChatGPT.build_response(user_input)
+        user_input = await build_user_input(params, db)
+        response_from_chatgpt, cached = await analyzer.analyze(user_input)
 
-        return { 'chatgpt_response': response_from_chatgpt }
+        return { 'chatgpt_response': response_from_chatgpt, 'cached': cached }
+    except AnalyzerBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={ 'Retry-After': '5' })
     except Exception as e:
         logging.error(f"An error occurred while in analyze report: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/stream", status_code=200)
+async def stream_analyze_report(
+        params: ReportAnalyzerParams,
+        analyzer: ReportAnalyzer = Depends(get_report_analyzer),
+        db: AsyncSession = Depends(get_db_async)
+    ):
+    """Server-sent events: one message per token chunk ({"delta": ...}), then a `done` event,
+    or an `error` event when the upstream call fails halfway"""
+    user_input = await build_user_input(params, db)
+    try:
+        deltas, cached = await analyzer.open_stream(user_input)
+    except AnalyzerBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={ 'Retry-After': '5' })
+
+    async def events():
+        try:
+            async for delta in deltas:
+                yield sse_event({ 'delta': delta })
+            yield sse_event({ 'cached': cached }, event='done')
+        except Exception as e:
+            logging.error(f"An error occurred while streaming analyze report: {e}")
+            yield sse_event({ 'detail': str(e) }, event='error')
+
+    return StreamingResponse(
+        events(),
+        media_type='text/event-stream',
+        headers={ 'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no' }
+    )
+
+async def build_user_input(params: ReportAnalyzerParams, db: AsyncSession) -> str:
+    """Pasted report output goes to the model as is, a report with filters is digested server-side first"""
+    if params.report is None:
+        return params.user_input
+
+    return await db.run_sync(lambda session: DigestPromptService(session, params).call())
+
+def sse_event(data: dict, event: str = None) -> str:
+    event_line = f"event: {event}\n" if event else ""
+    return f"{event_line}data: {json.dumps(data)}\n\n"
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, HTTPException
+from src.schemas import (
+    BulkDataParams,
+    BulkDataResponse
+)
+import logging
+import os
+from sqlalchemy.orm import Session
+from src.api.session_db import get_db
+from src.bulk_data.generate_service import GenerateService
+
+router = APIRouter(prefix='/api/bulk-data', tags=["Bulk Data"])
+
+@router.post("", response_model=BulkDataResponse, status_code=201)
+def generate(params: BulkDataParams, db: Session = Depends(get_db)):
+    if os.environ.get('WEB_ENVIRONMENT') == 'production':
+        raise HTTPException(status_code=403, detail="Bulk data generation is disabled in production")
+
+    try:
+        result = GenerateService(db, params).call()
+        return { 'message': 'Successfully generated bulk data', **result }
+    except Exception as e:
+        db.rollback()
+        logging.error(f"An error occurred while generating bulk data: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        db.close()
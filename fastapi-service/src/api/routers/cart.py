@@ -19,7 +19,7 @@ from src.api.session_db import get_db
 from datetime import datetime
 from utils.auth import get_current_user
 from src.computer_components.service import Service
-from src.api.s3_dependencies import ( bucket_name, s3_client )
+from src.api.s3_dependencies import ( presigned_url )
 
 router = APIRouter(prefix='/api/cart', tags=['Cart'])
   
@@ -49,12 +49,7 @@ def index(
 
             images = []
             if component.images:
-                presigned_url = s3_client().generate_presigned_url(
-                    'get_object',
-                    Params={'Bucket': bucket_name(), 'Key': component.images[0]},
-                    ExpiresIn=3600
-                )
-                images = [presigned_url]
+                images = [presigned_url(component.images[0])]
 
             result.append({
                 'sell_price': price,
@@ -13,20 +13,22 @@ from src.models import (
 import logging
 from src.api.s3_dependencies import ( bucket_name, s3_client )
 from sqlalchemy.orm import joinedload, Session
-from src.api.session_db import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.api.session_db import get_db_async
 
 router = APIRouter(
     prefix='/api/computer-component-categories'
 )
   
 @router.get("", response_model=ComputerComponentCategoryAsListResponse)
-def index(db: Session = Depends(get_db)):
-    try:
-        components = db.query(ComputerComponentCategory).order_by(ComputerComponentCategory.name).all()
+async def index(db: AsyncSession = Depends(get_db_async)):
+    result = await db.execute(
+        select(ComputerComponentCategory.id, ComputerComponentCategory.name)
+            .order_by(ComputerComponentCategory.name)
+    )
+    components = result.all()
 
-        if not components:
-            return { 'computer_component_categories': [] }
-        
-        return { 'computer_component_categories': components }
-    finally:
-        db.close()
+    if not components:
+        return { 'computer_component_categories': [] }
+    
+    return { 'computer_component_categories': [component._asdict() for component in components] }
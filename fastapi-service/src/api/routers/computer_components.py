@@ -26,9 +26,10 @@ from src.models import (
     InboundDeliveryLine
 )
 import logging
-from src.api.s3_dependencies import ( bucket_name, s3_client )
+from src.api.s3_dependencies import ( presigned_url )
 from sqlalchemy.orm import joinedload, Session
-from src.api.session_db import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.api.session_db import get_db, get_db_async
 from src.data.review_schema import component_reviews_hash_map
 import random
 
@@ -37,72 +38,68 @@ router = APIRouter(
 )
 
 @router.get("", response_model=ComputerComponentAsListResponse)
-def index(db: Session = Depends(get_db)):
-    try:
-        components = (
-            db.query(ComputerComponent)
-            .options(joinedload(ComputerComponent.component_category), joinedload(ComputerComponent.computer_component_sell_price_settings))
-            .order_by(ComputerComponent.name).all()
+async def index(db: AsyncSession = Depends(get_db_async)):
+    return await db.run_sync(load_computer_components)
+
+def load_computer_components(db: Session):
+    components = (
+        db.query(ComputerComponent)
+        .options(joinedload(ComputerComponent.component_category), joinedload(ComputerComponent.computer_component_sell_price_settings))
+        .order_by(ComputerComponent.name).all()
+    )
+
+    if not components:
+        return { 'computer_components': [] }
+    
+    response_components = []
+    for component in components:
+        images = []
+        if component.images:
+            images = [presigned_url(component.images[0])]
+
+        response_components.append(
+            ComputerComponentAsResponse(
+                id=component.id,
+                name=component.name,
+                product_code=component.product_code,
+                component_category_name=getattr(component.component_category, 'name', None),
+                component_category_id=component.component_category_id,
+                computer_component_sell_price_settings=component.computer_component_sell_price_settings,
+                images=images,
+                description=component.description,
+                status=component.status,
+                created_at=component.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+                updated_at=component.updated_at.strftime("%Y-%m-%d %H:%M:%S")
+            )
         )
 
-        if not components:
-            return { 'computer_components': [] }
-        
-        response_components = []
-        for component in components:
-            images = []
-            if component.images:
-                presigned_url = s3_client().generate_presigned_url(
-                    'get_object',
-                    Params={'Bucket': bucket_name(), 'Key': component.images[0]},
-                    ExpiresIn=3600
-                )
-                images = [presigned_url]
-
-            response_components.append(
-                ComputerComponentAsResponse(
-                    id=component.id,
-                    name=component.name,
-                    product_code=component.product_code,
-                    component_category_name=getattr(component.component_category, 'name', None),
-                    component_category_id=component.component_category_id,
-                    computer_component_sell_price_settings=component.computer_component_sell_price_settings,
-                    images=images,
-                    description=component.description,
-                    status=component.status,
-                    created_at=component.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                    updated_at=component.updated_at.strftime("%Y-%m-%d %H:%M:%S")
-                )
-            )
-
-        return { 'computer_components': response_components }
-    finally:
-        db.close()
+    return { 'computer_components': response_components }
 
 @router.get("/{id}", response_model=ComputerComponentAsResponse)
-def show(id: int, db: Session = Depends(get_db)):
-    try:
-        computer_component = (
-            db.query(ComputerComponent)
-            .options(joinedload(ComputerComponent.computer_component_sell_price_settings), joinedload(ComputerComponent.component_category))
-            .filter(ComputerComponent.id == id)
-            .first()
-        )
-        if computer_component is None:
-            raise HTTPException(status_code=404, detail="Computer not found")
-        
-        computer_component.component_category_name = computer_component.component_category.name
+async def show(id: int, db: AsyncSession = Depends(get_db_async)):
+    return await db.run_sync(load_computer_component, id=id)
+
+def load_computer_component(db: Session, *, id: int):
+    computer_component = (
+        db.query(ComputerComponent)
+        .options(joinedload(ComputerComponent.computer_component_sell_price_settings), joinedload(ComputerComponent.component_category))
+        .filter(ComputerComponent.id == id)
+        .first()
+    )
+    if computer_component is None:
+        raise HTTPException(status_code=404, detail="Computer not found")
+    
+    computer_component.component_category_name = computer_component.component_category.name
 
-        sell_price_settings = computer_component.computer_component_sell_price_settings
-        sorted_sell_price_settings = sorted(
-            sell_price_settings,
-            key=lambda setting: setting.day_type
-        )
-        computer_component.computer_component_sell_price_settings = sorted_sell_price_settings
+    sell_price_settings = computer_component.computer_component_sell_price_settings
+    sorted_sell_price_settings = sorted(
+        sell_price_settings,
+        key=lambda setting: setting.day_type
+    )
+    computer_component.computer_component_sell_price_settings = sorted_sell_price_settings
 
-        return computer_component
-    finally:
-        db.close()
+    # Validate while still inside run_sync so every attribute is read before the session goes back to the event loop
+    return ComputerComponentAsResponse.model_validate(computer_component, from_attributes=True)
 
 @router.post("", response_model=ComputerComponentAsResponse)
 def create(params: ComputerComponentAsParams, db: Session = Depends(get_db)):
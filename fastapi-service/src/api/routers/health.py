@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from src.database import engine, async_engine
+from src.database_pool import pool_status
+
+router = APIRouter(prefix='/api/health', tags=["Health"])
+
+@router.get("/db-pool", response_model=dict, status_code=200)
+def db_pool():
+    return {
+        'sync': pool_status(engine),
+        'async': pool_status(async_engine.sync_engine)
+    }
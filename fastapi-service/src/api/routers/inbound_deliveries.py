@@ -172,7 +172,12 @@ def destroy(id: int, db: Session = Depends(get_db)):
             raise HTTPException(status_code=404, detail="Data not found")
         
         db.delete(inbound_delivery)
-        stmt = delete(Inventory).where(and_(Inventory.resource_id == id, Inventory.resource_type == "InboundDelivery"))
+        # Inbound inventories are dated on the delivery date, matching it keeps the delete in one partition
+        stmt = delete(Inventory).where(and_(
+            Inventory.stock_date == inbound_delivery.inbound_delivery_date,
+            Inventory.resource_id == id,
+            Inventory.resource_type == "InboundDelivery"
+        ))
         db.execute(stmt)
         db.commit()
 
@@ -6,34 +6,42 @@ from ..schemas.job_schemas import (
 from src.domain.payment.commands.generate_payment_load_command import GeneratePaymentLoadCommand
 from src.domain.payment.handlers.payment_load_test_handler import PaymentLoadTestHandler
 from src.api.dependencies.token_fetcher import get_token
-from sqlalchemy.orm import Session
-from src.api.session_db import get_db
+from src.api.dependencies.job_store import get_job_store
+from src.api.dependencies.http_clients import get_rails_client
+from src.api.dependencies.user_validation_cache import get_user_validation_cache
+from src.infrastructure.http.rails_client import RailsClient
+from src.infrastructure.http.user_validation_cache import UserValidationCache
+from src.infrastructure.persistence.job_store import JobStore
 import logging
 import uuid
-from datetime import datetime
 
 router = APIRouter(prefix="/api/jobs", tags=['jobs'])
 logger = logging.getLogger(__name__)
 
-# in memory storage for job results (in production, use redis or db)
-job_results = {}
+PAYMENT_LOAD_TEST = "payment-load-test"
 
 @router.post("/payment-load-test", response_model=PaymentLoadTestResponseSchema, status_code=202)
 async def create_payment_load_test(
     request: PaymentLoadTestRequestSchema,
     background_tasks: BackgroundTasks,
     token: str = Depends(get_token),
-    db: Session = Depends(get_db)
+    job_store: JobStore = Depends(get_job_store),
+    rails_client: RailsClient = Depends(get_rails_client),
+    user_cache: UserValidationCache = Depends(get_user_validation_cache)
 ):
-    job_id = f"payment-load-test-{uuid.uuid4().hex[:12]}"
+    job_id = f"{PAYMENT_LOAD_TEST}-{uuid.uuid4().hex[:12]}"
 
     command = GeneratePaymentLoadCommand(
         num_requests=request.num_requests,
         user_id=request.user_id,
-        account_id=request.account_id
+        account_id=request.account_id,
+        concurrency=request.concurrency,
+        target_rps=request.target_rps,
+        ramp_up_seconds=request.ramp_up_seconds
     )
 
-    background_tasks.add_task(execute_load_test, job_id, command, token, db)
+    job_store.create(job_id, PAYMENT_LOAD_TEST, request.num_requests)
+    background_tasks.add_task(execute_load_test, job_id, command, token, job_store, rails_client=rails_client, user_cache=user_cache)
 
     logger.info(f"Created job {job_id} for {request.num_requests} payment requests")
 
@@ -48,47 +56,72 @@ async def execute_load_test(
     job_id: str,
     command: GeneratePaymentLoadCommand,
     token: str,
-    db: Session
+    job_store: JobStore,
+    rails_client: RailsClient = None,
+    user_cache: UserValidationCache = None
 ):
+    # The request session is closed by the time this runs, the job opens its own
+    db = job_store.session_factory()
     try:
         logger.info(f"Job {job_id}: Starting execution")
-        job_results[job_id] = {"status": "running", "started_at": datetime.now().isoformat() }
+        job_store.start(job_id)
 
-        handler = PaymentLoadTestHandler()
+        handler = PaymentLoadTestHandler(rails_client, user_cache)
 
-        await handler.handle_generate_load(command, token, db)
+        result = await handler.handle_generate_load(
+            command,
+            token,
+            db,
+            progress=lambda successful, failed: job_store.report_progress(job_id, successful, failed)
+        )
+        job_store.finish(job_id, "cancelled" if result["cancelled"] else "completed", result=result)
     except Exception as e:
         logger.error(f"Job {job_id}: Failed with error: {str(e)}")
-        job_results[job_id] = {
-            "status": "failed",
-            "started_at": job_results[job_id].get("started_at"),
-            "completed_at": datetime.now().isoformat(),
-            "error": str(e)
-        }
+        job_store.finish(job_id, "failed", error=str(e))
     finally:
         db.close()
 
 @router.get("/payment-load-test/{job_id}", response_model=dict)
-async def get_payment_load_test_status(job_id: str, token: str = Depends(get_token)):
-    if job_id not in job_results:
+async def get_payment_load_test_status(
+    job_id: str,
+    token: str = Depends(get_token),
+    job_store: JobStore = Depends(get_job_store)
+):
+    return job_response(job_id, job_store.get(job_id))
+
+@router.post("/payment-load-test/{job_id}/cancel", response_model=dict, status_code=202)
+async def cancel_payment_load_test(
+    job_id: str,
+    token: str = Depends(get_token),
+    job_store: JobStore = Depends(get_job_store)
+):
+    return job_response(job_id, job_store.request_cancel(job_id))
+
+def job_response(job_id: str, job: dict) -> dict:
+    if job is None:
         return {
             "job_id": job_id,
             "status": "not found",
             "message": "Job not found"
         }
-    
-    job_data = job_results[job_id]
+
     response = {
         "job_id": job_id,
-        "status": job_data["status"],
-        "started_at": job_data.get("started_at")
+        "status": job["status"],
+        "started_at": job["started_at"],
+        "cancel_requested": job["cancel_requested"],
+        "progress": {
+            "total": job["total"],
+            "successful": job["successful"],
+            "failed": job["failed"]
+        }
     }
 
-    if job_data["status"] == "completed":
-        response["completed_at"] = job_data.get("completed_at")
-        response["result"] = job_data.get("result")
-    elif job_data["status"] == "failed":
-        response["completed_at"] = job_data.get("completed_at")
-        response["error"] = job_data.get("error")
-    
+    if job["status"] in ("completed", "cancelled"):
+        response["completed_at"] = job["completed_at"]
+        response["result"] = job["result"]
+    elif job["status"] == "failed":
+        response["completed_at"] = job["completed_at"]
+        response["error"] = job["error"]
+
     return response
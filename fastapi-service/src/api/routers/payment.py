@@ -1,14 +1,29 @@
 from fastapi import APIRouter, Depends, BackgroundTasks, Query
-from ..schemas.payment_schemas import PaymentRequestSchema, PaymentResponseSchema
+from ..schemas.payment_schemas import (
+    PaymentRequestSchema,
+    PaymentResponseSchema,
+    PaymentBatchRequestSchema,
+    PaymentBatchResponseSchema
+)
 from src.domain.payment.commands.process_payment_command import ProcessPaymentCommand
 from src.domain.payment.handlers.payment_command_handler import PaymentCommandHandler
+from src.domain.payment.commands.process_payment_batch_command import ProcessPaymentBatchCommand
+from src.domain.payment.handlers.payment_batch_command_handler import PaymentBatchCommandHandler
 from src.api.dependencies.token_fetcher import get_token
+from src.api.dependencies.http_clients import get_rails_client
+from src.api.dependencies.user_validation_cache import get_user_validation_cache
+from src.infrastructure.http.rails_client import RailsClient
+from src.infrastructure.http.user_validation_cache import UserValidationCache
 from sqlalchemy.orm import Session
 from src.api.session_db import get_db
 from src.domain.payment.value_objects.currency import CurrencyEnum
 from src.domain.payment.value_objects.payment_method import PaymentMethod
 from src.domain.payment.entities.payment_index import PaymentIndex
+from src.domain.payment.entities.payment_rollup import PaymentRollupIndex
 from src.payments.filter_service import FilterService
+from src.payments.rollup_service import RollupService
+from typing import Optional
+from datetime import date
 import logging
 from fastapi import HTTPException
 
@@ -19,20 +34,24 @@ async def index(
     token: str = Depends(get_token),
     db: Session = Depends(get_db),
     page: str = Query('1'),
-    item_per_page: int = 50
+    item_per_page: int = 50,
+    cursor: Optional[str] = Query(None)
 ):
     try:
         filter_service = FilterService(db=db,
             page=page,
-            item_per_page=item_per_page
+            item_per_page=item_per_page,
+            cursor=cursor
         )
 
-        payments = filter_service.call()
+        payments_page = filter_service.call()
     
         return {
-            'report_body': generate_response(payments),
+            'report_body': generate_response(payments_page.items),
             'page': page,
-            'item_per_page': item_per_page
+            'item_per_page': item_per_page,
+            'has_next_page': payments_page.has_next_page,
+            'next_cursor': payments_page.next_cursor
         }
     except Exception as e:
         logging.error(f"Failed to load payments: {e}")
@@ -40,6 +59,35 @@ async def index(
     finally:
         db.close()
 
+@router.get("/rollups", response_model=PaymentRollupIndex, status_code=200)
+async def rollups(
+    token: str = Depends(get_token),
+    db: Session = Depends(get_db),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    currency: Optional[str] = Query(None),
+    payment_method: Optional[str] = Query(None)
+):
+    """Payment count and amount per day, currency and payment method"""
+    try:
+        rollup_service = RollupService(db=db,
+            start_date=start_date,
+            end_date=end_date,
+            currency=currency,
+            payment_method=payment_method
+        )
+    except ValueError as e:
+        db.close()
+        raise HTTPException(status_code=422, detail=str(e))
+
+    try:
+        return { 'report_body': rollup_service.call() }
+    except Exception as e:
+        logging.error(f"Failed to load payment rollups: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        db.close()
+
 def generate_response(payments):
     result = []
 
@@ -60,7 +108,9 @@ def generate_response(payments):
 async def create_payment(
     request: PaymentRequestSchema,
     token: str = Depends(get_token),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    rails_client: RailsClient = Depends(get_rails_client),
+    user_cache: UserValidationCache = Depends(get_user_validation_cache)
 ):
     """Create a new payment"""
     command = ProcessPaymentCommand(
@@ -72,7 +122,7 @@ async def create_payment(
         description=request.description
     )
 
-    payment = await PaymentCommandHandler().handle_process_payment(command, token, db)
+    payment = await PaymentCommandHandler(rails_client, user_cache).handle_process_payment(command, token, db)
     return PaymentResponseSchema(
         payment_id=payment.id,
         currency=CurrencyEnum(payment.currency).name,
@@ -80,6 +130,32 @@ async def create_payment(
         message="Payment is being processed"
     )
 
+@router.post("/batch", response_model=PaymentBatchResponseSchema, status_code=200)
+async def create_payment_batch(
+    request: PaymentBatchRequestSchema,
+    token: str = Depends(get_token),
+    db: Session = Depends(get_db),
+    rails_client: RailsClient = Depends(get_rails_client),
+    user_cache: UserValidationCache = Depends(get_user_validation_cache)
+):
+    """Create many payments in one transaction, with a result per item"""
+    command = ProcessPaymentBatchCommand(items=request.payments, all_or_nothing=request.all_or_nothing)
+
+    try:
+        return await PaymentBatchCommandHandler(rails_client, user_cache).handle_process_payment_batch(command, token, db)
+    finally:
+        db.close()
+
+@router.delete("/user-validation-cache/{user_id}", status_code=200)
+async def invalidate_user_validation(
+    user_id: int,
+    token: str = Depends(get_token),
+    user_cache: UserValidationCache = Depends(get_user_validation_cache)
+):
+    """Hook for Rails to call when a user is deleted or changed. Each worker keeps its own cache,
+    entries on the other workers expire with the TTL."""
+    return { 'user_id': user_id, 'invalidated': user_cache.invalidate(user_id) }
+
 @router.get("/{payment_id}")
 async def get_payment_status(payment_id: str):
     # TODO
@@ -1,34 +1,35 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from src.schemas import (
     PurchaseInvoicesQueryAnalysis
 )
 import logging
-from src.chatgpt.ask_chatgpt import AskChatGPT
-from sqlalchemy.orm import joinedload, Session
+from sqlalchemy.orm import Session
 from src.api.session_db import get_db
-import random
+from src.query_analysis.benchmark_service import ( BenchmarkService, DEFAULT_DATA_COUNTS, STRATEGIES )
+from typing import List
 
+MAX_DATA_COUNT = 5000000
 
 router = APIRouter(prefix='/api/purchase_invoices_query_analysis', tags=["Purchase Invoices Query Analysis"])
 
 @router.get("", response_model=PurchaseInvoicesQueryAnalysis, status_code=200)
-def analyze(db: Session = Depends(get_db)):
+def analyze(
+    data_counts: List[int] = Query(DEFAULT_DATA_COUNTS),
+    runs: int = Query(3, ge=1, le=20),
+    item_per_page: int = Query(5, ge=1, le=100),
+    reset: bool = Query(False),
+    db: Session = Depends(get_db)
+    ):
+    if any(data_count < 1 or data_count > MAX_DATA_COUNT for data_count in data_counts):
+        raise HTTPException(status_code=422, detail=f"data_counts must be between 1 and {MAX_DATA_COUNT}")
+
     try:
-        data_counts = [100000, 200000, 300000, 400000, 500000, 6000000, 700000, 800000, 900000, 1000000]
-        qtime1 = [0.63, 1.08, 1.34, 1.47, 1.65, 7.56, 7.13, 7.19, 7.32, 7.02]
-        qtime2 = [0.30, 0.30, 0.28, 0.27, 0.32, 0.28, 0.29, 0.28, 0.31, 0.30]
-        qtime3 = [60.0, 61.0, 61.0, 60.0, 61.0, 62.0, 60.0, 61.0, 62.0, 63.0]
+        benchmark_service = BenchmarkService(db, runs=runs, item_per_page=item_per_page, reset=reset)
+        result = benchmark_service.call(data_counts)
 
-        result = []
-        for index, data_count in enumerate(data_counts):
-            result.append({
-                'data_count': data_count,
-                'query_time1': qtime1[index],
-                'query_time2': qtime2[index],
-                'query_time3': qtime3[index],
-            })
-            
-        return { 'message': 'Successfully analyzed 3 query performance', 'data': result }
+        return { 'message': f'Successfully analyzed {len(STRATEGIES)} query performance', 'data': result }
     except Exception as e:
         logging.error(f"An error occurred while performing query analysis: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        db.close()
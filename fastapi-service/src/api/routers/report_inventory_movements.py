@@ -25,6 +25,7 @@ def index(
     component_category_id: Optional[str] = Query(None),
     transaction_type: Optional[str] = Query(None),
     keyword: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db)
     ):
     try:
@@ -36,23 +37,35 @@ def index(
             component_name=component_name,
             component_category_id=component_category_id,
             transaction_type=transaction_type,
-            keyword=keyword)
-        inventories = filter_service.call()
+            keyword=keyword,
+            cursor=cursor)
+        report_page = filter_service.call()
 
         total_query = TotalItemQueryService(db)
-        total_item = total_query.call()
+        total_item = total_query.call(filter_service.filtered_query())
 
         paging_service = PagingService(db)
         paging = paging_service.call(
             page=page,
             item_per_page=item_per_page,
             total_item=total_item,
-            endpoint="/api/report/inventory-movement"
+            endpoint="/api/report/inventory-movement",
+            has_next_page=report_page.has_next_page,
+            next_cursor=report_page.next_cursor,
+            params={
+                'start_date': start_date,
+                'end_date': end_date,
+                'item_per_page': item_per_page,
+                'component_name': component_name,
+                'component_category_id': component_category_id,
+                'transaction_type': transaction_type,
+                'keyword': keyword
+            }
         )
 
         return {
             'report_headers': generate_headers(),
-            'report_body': generate_report(inventories, component_name, component_category_id),
+            'report_body': generate_report(report_page.items, component_name, component_category_id),
             'paging': paging
 
         }
@@ -10,7 +10,6 @@ from sqlalchemy import (
         desc,
         text,
         and_,
-        event,
         or_
 )
 from src.schemas import (
@@ -30,37 +29,15 @@ from sqlalchemy.orm import joinedload, Session
 from src.api.session_db import get_db
 from datetime import datetime
 from utils.auth import get_current_user
-import re
 from .constants import bbb_bank_transfer
 from fastapi.encoders import jsonable_encoder
+from src.document_numbers.numbering_service import NumberingService
+from src.document_numbers.sequences import SALES_PAYMENT_INVOICE_NO
 
 router = APIRouter(
     prefix='/api/sales-payment/bank-transfer'
 )
 
-@event.listens_for(Session, "before_flush")
-def check_change_object(session: Session, flush_context, instances):
-    for obj in session.new.union(session.dirty):
-        if isinstance(obj, SalesInvoice) and not obj.sales_invoice_no:
-            result = session.execute(text(
-                "SELECT sales_invoice_no " \
-                "FROM sales_invoices " \
-                "ORDER BY id DESC LIMIT 1 " \
-                "FOR UPDATE"
-            )).first()
-
-            if result and result[0]:
-                match = re.search(r"HSF-SALES-(\d+)", result[0])
-                if match:
-                    last_number = int(match.group(1))
-                    next_number = last_number + 1
-                else:
-                    next_number = 1
-            else:
-                next_number = 1
-            
-            obj.sales_invoice_no = f"HSF-SALES-{next_number:05d}"
-
 @router.post("", status_code=201)
 def pay(
         param: SalesPaymentParam,
@@ -90,6 +67,7 @@ def pay(
         sales_invoice = SalesInvoice(
                 customer_id=sales_quote.customer_id,
                 status=0,
+                sales_invoice_no=NumberingService(db).next_number(SALES_PAYMENT_INVOICE_NO),
                 sales_quote_no=sales_quote.sales_quote_no,
                 sum_total_line_amounts=sales_quote.sum_total_line_amounts,
                 total_payable_amount=sales_quote.total_payable_amount,
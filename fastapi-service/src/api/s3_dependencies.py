@@ -1,10 +1,69 @@
 import boto3
 from config import setting
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+import time
+
+# Presigned GET links are valid for PRESIGNED_URL_EXPIRES_IN seconds, a cached link is handed out
+# for at most PRESIGNED_URL_CACHE_TTL seconds so every response still carries >= 10 minutes of validity.
+PRESIGNED_URL_EXPIRES_IN = 3600
+PRESIGNED_URL_CACHE_TTL = 3000
+PRESIGNED_URL_CACHE_MAX_SIZE = 10000
 
 def bucket_name():
     return 'hassle-free-computers-bucket'
 
+@lru_cache(maxsize=None)
 def s3_client():
+    # boto3 clients are thread-safe, one per process is shared by every request
     return boto3.client('s3',
+                         endpoint_url=setting.AWS_S3_ENDPOINT_URL,
                          aws_access_key_id=setting.AWS_ACCESS_KEY_ID,
-                         aws_secret_access_key=setting.AWS_SECRET_ACCESS_KEY)
\ No newline at end of file
+                         aws_secret_access_key=setting.AWS_SECRET_ACCESS_KEY)
+
+class PresignedUrlCache:
+    def __init__(self, *, ttl_seconds: int, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._urls = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, s3_key: str):
+        with self._lock:
+            cached = self._urls.get(s3_key)
+            if cached is None:
+                return None
+
+            url, cached_at = cached
+            if time.monotonic() - cached_at >= self.ttl_seconds:
+                del self._urls[s3_key]
+                return None
+
+            self._urls.move_to_end(s3_key)
+            return url
+
+    def set(self, s3_key: str, url: str):
+        with self._lock:
+            self._urls[s3_key] = (url, time.monotonic())
+            self._urls.move_to_end(s3_key)
+            while len(self._urls) > self.max_size:
+                self._urls.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._urls.clear()
+
+presigned_url_cache = PresignedUrlCache(ttl_seconds=PRESIGNED_URL_CACHE_TTL, max_size=PRESIGNED_URL_CACHE_MAX_SIZE)
+
+def presigned_url(s3_key: str) -> str:
+    url = presigned_url_cache.get(s3_key)
+    if url is None:
+        url = s3_client().generate_presigned_url(
+            'get_object',
+            Params={'Bucket': bucket_name(), 'Key': s3_key},
+            ExpiresIn=PRESIGNED_URL_EXPIRES_IN
+        )
+        presigned_url_cache.set(s3_key, url)
+
+    return url
@@ -5,13 +5,19 @@ class PaymentLoadTestRequestSchema(BaseModel):
     num_requests: int = Field(gt=0, le=100000, description="Number of payment requests to generate")
     user_id: int = Field(gt=0, description="User ID for test payments")
     account_id: int = Field(gt=0, description="Account ID for test payments")
+    concurrency: int = Field(default=10, gt=0, le=200, description="Number of payments in flight at once")
+    target_rps: Optional[float] = Field(default=None, gt=0, description="Requests per second to pace the load at, unbounded when empty")
+    ramp_up_seconds: float = Field(default=0, ge=0, le=600, description="Seconds to ramp linearly up to target_rps")
 
     class Config:
         json_schema_extra = {
             "example": {
                 "num_requests": 10000,
                 "user_id": 1,
-                "account_id": 1
+                "account_id": 1,
+                "concurrency": 20,
+                "target_rps": 200,
+                "ramp_up_seconds": 10
             }
         }
 
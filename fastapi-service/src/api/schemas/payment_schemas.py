@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator, condecimal
-from typing import Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 class PaymentRequestSchema(BaseModel):
     """Request schema for creating payment"""
@@ -42,4 +42,23 @@ class PaymentResponseSchema(BaseModel):
     payment_id: Union[str,int]
     currency: str
     payment_method: str
-    message: str
\ No newline at end of file
+    message: str
+
+MAX_PAYMENT_BATCH_SIZE = 10000
+
+class PaymentBatchRequestSchema(BaseModel):
+    """Items are validated one by one so a bad row is reported instead of rejecting the batch"""
+    payments: List[Dict[str, Any]] = Field(..., min_length=1, max_length=MAX_PAYMENT_BATCH_SIZE)
+    all_or_nothing: bool = Field(False, description="Create nothing when any item is invalid")
+
+class PaymentBatchItemResultSchema(BaseModel):
+    index: int
+    status: str
+    payment_id: Optional[int] = None
+    errors: List[str] = []
+
+class PaymentBatchResponseSchema(BaseModel):
+    total: int
+    created: int
+    failed: int
+    results: List[PaymentBatchItemResultSchema]
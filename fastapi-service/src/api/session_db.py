@@ -1,10 +1,8 @@
-from src.database import SessionLocal
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from src.database import SessionLocal, AsyncSessionLocal
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import AsyncGenerator, Annotated
 from fastapi import Depends
 
-AsyncSessionLocal = async_sessionmaker(...)
-
 def get_db():
     db = SessionLocal()
     try:
@@ -12,8 +10,12 @@ def get_db():
     finally:
         db.close()
 
+def get_session_factory():
+    """For work that outlives the request, e.g. background tasks opening their own sessions"""
+    return SessionLocal
+
 async def get_db_async() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
 
-AsyncDbSession = Annotated[AsyncSession, Depends(get_db_async)]
\ No newline at end of file
+AsyncDbSession = Annotated[AsyncSession, Depends(get_db_async)]
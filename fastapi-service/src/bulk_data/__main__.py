@@ -0,0 +1,31 @@
+"""Fills the configured database with generated rows for capacity tests, through COPY.
+
+    python -m src.bulk_data --purchase-invoices 1000000 --sales-invoices 500000 --payments 1000000 --seed 42
+
+Every BulkDataParams field is available as a --dashed-option.
+"""
+from src.database import SessionLocal
+from src.schemas import BulkDataParams
+from src.bulk_data.generate_service import GenerateService
+import argparse
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate bulk data with COPY")
+    for name, field in BulkDataParams.model_fields.items():
+        option_type = int if field.annotation in (int, type(None)) or name == 'seed' else field.annotation
+        parser.add_argument(f"--{name.replace('_', '-')}", dest=name, type=option_type, default=field.default)
+    args = parser.parse_args()
+
+    params = BulkDataParams(**vars(args))
+    db = SessionLocal()
+    try:
+        result = GenerateService(db, params).call()
+    finally:
+        db.close()
+
+    for table, row_count in result['row_counts'].items():
+        print(f"{table:<40} {row_count:>12,}")
+    print(f"{sum(result['row_counts'].values()):,} rows in {result['elapsed_seconds']}s")
+
+if __name__ == '__main__':
+    main()
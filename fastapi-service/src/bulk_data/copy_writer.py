@@ -0,0 +1,51 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+import csv
+import io
+
+FLUSH_ROWS = 50000
+
+class CopyWriter:
+    """Buffers generated rows per table as CSV and streams them with COPY FROM STDIN.
+    Tables are flushed in the order given, so parents always land before their children."""
+    def __init__(self, db: Session, tables: dict, *, flush_rows: int = FLUSH_ROWS):
+        self.db = db
+        self.tables = tables
+        self.flush_rows = flush_rows
+        self.buffers = { table: io.StringIO() for table in tables }
+        self.writers = { table: csv.writer(self.buffers[table]) for table in tables }
+        self.row_counts = { table: 0 for table in tables }
+        self.pending_rows = 0
+
+    def write(self, table: str, row: tuple):
+        self.writers[table].writerow(row)
+        self.row_counts[table] += 1
+        self.pending_rows += 1
+        if self.pending_rows >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        cursor = self.db.connection().connection.cursor()
+        try:
+            for table, columns in self.tables.items():
+                buffer = self.buffers[table]
+                if buffer.tell() == 0:
+                    continue
+
+                buffer.seek(0)
+                cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+                buffer.seek(0)
+                buffer.truncate()
+        finally:
+            cursor.close()
+
+        self.pending_rows = 0
+
+    def close(self):
+        self.flush()
+        # Rows carry explicit ids, move every serial sequence past them
+        for table in self.tables:
+            if self.row_counts[table]:
+                self.db.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+                ))
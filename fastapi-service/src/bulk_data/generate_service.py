@@ -0,0 +1,459 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from src.schemas import (
+    BulkDataParams,
+    PurchaseInvoiceStatusEnum,
+    SalesInvoiceStatusEnum,
+    SalesDeliveryStatusEnum,
+    UserRoleEnum
+)
+from src.domain.payment.value_objects.currency import CurrencyEnum
+from src.domain.payment.value_objects.payment_method import PaymentMethod as PaymentMethodEnum
+from src.domain.account_journal.value_objects.account_type import AccountTypeEnum
+from src.domain.account_journal.value_objects.normal_balance import NormalBalanceEnum
+from src.data.review_schema import component_reviews_hash_map
+from src.bulk_data.copy_writer import CopyWriter
+from src.inventories.partition_service import PartitionService
+from src.document_numbers.sequences import (
+    DocumentSequence,
+    PURCHASE_INVOICE_NO_SEQUENCE,
+    INBOUND_DELIVERY_NO_SEQUENCE,
+    SALES_INVOICE_NO_SEQUENCE,
+    SALES_DELIVERY_NO_SEQUENCE,
+    sync_document_sequences
+)
+from utils.password import secure_pwd
+from datetime import datetime, timedelta
+from decimal import Decimal
+import itertools
+import random
+import time
+
+BULK_PASSWORD = 'bulkpassword'
+PLACEHOLDER_IMAGE_KEY = 'bulk/placeholder.jpg'
+
+# COPY order: every table comes after the tables its foreign keys point to
+TABLES = {
+    'users': ('id', 'fullname', 'username', 'role', 'hashed_password', 'created_at', 'updated_at'),
+    'payment_methods': ('id', 'name', 'created_at', 'updated_at'),
+    'computer_component_categories': ('id', 'name', 'status', 'created_at', 'updated_at'),
+    'computer_components': (
+        'id', 'name', 'product_code', 'images', 'description', 'component_category_id', 'status', 'created_at', 'updated_at'
+    ),
+    'computer_component_sell_price_settings': ('id', 'component_id', 'day_type', 'price_per_unit', 'active', 'created_at', 'updated_at'),
+    'computer_component_reviews': ('id', 'user_id', 'component_id', 'user_fullname', 'rating', 'comments', 'created_at', 'updated_at'),
+    'purchase_invoices': (
+        'id', 'purchase_invoice_no', 'invoice_date', 'expected_delivery_date', 'notes', 'supplier_name',
+        'status', 'sum_total_line_amounts', 'created_at', 'updated_at', 'deleted'
+    ),
+    'purchase_invoice_lines': (
+        'id', 'purchase_invoice_id', 'component_id', 'component_name', 'component_category_id', 'component_category_name',
+        'quantity', 'price_per_unit', 'total_line_amount', 'created_at', 'updated_at'
+    ),
+    'inbound_deliveries': (
+        'id', 'purchase_invoice_id', 'purchase_invoice_no', 'inbound_delivery_no', 'inbound_delivery_date',
+        'inbound_delivery_reference', 'received_by', 'notes', 'status', 'created_at', 'updated_at', 'deleted'
+    ),
+    'inbound_delivery_lines': (
+        'id', 'inbound_delivery_id', 'purchase_invoice_line_id', 'component_id', 'component_name', 'component_category_id',
+        'component_category_name', 'expected_quantity', 'received_quantity', 'damaged_quantity', 'price_per_unit',
+        'total_line_amount', 'created_at', 'updated_at', 'deleted'
+    ),
+    'inbound_delivery_attachments': ('id', 'inbound_delivery_id', 'file_s3_key', 'uploaded_by', 'created_at', 'updated_at'),
+    'sales_quotes': (
+        'id', 'customer_id', 'sales_quote_no', 'sum_total_line_amounts', 'total_payable_amount', 'customer_name',
+        'shipping_address', 'payment_method_id', 'payment_method_name', 'virtual_account_no', 'created_at', 'updated_at'
+    ),
+    'sales_quote_lines': ('id', 'sales_quote_id', 'component_id', 'quantity', 'price_per_unit', 'total_line_amount', 'created_at', 'updated_at'),
+    'sales_invoices': (
+        'id', 'customer_id', 'status', 'sales_invoice_no', 'sales_quote_no', 'sum_total_line_amounts', 'total_payable_amount',
+        'customer_name', 'shipping_address', 'payment_method_id', 'payment_method_name', 'virtual_account_no', 'created_at', 'updated_at'
+    ),
+    'sales_invoice_lines': (
+        'id', 'sales_invoice_id', 'component_id', 'component_name', 'quantity', 'price_per_unit', 'total_line_amount', 'created_at', 'updated_at'
+    ),
+    'sales_deliveries': ('id', 'status', 'sales_invoice_id', 'sales_delivery_no', 'created_at', 'updated_at'),
+    'sales_delivery_lines': ('id', 'sales_delivery_id', 'component_id', 'quantity', 'created_at', 'updated_at'),
+    'inventories': (
+        'id', 'in_stock', 'out_stock', 'stock_date', 'component_id', 'resource_type', 'resource_id',
+        'resource_line_type', 'resource_line_id', 'buy_price', 'created_at', 'updated_at'
+    ),
+    'cart_lines': ('id', 'status', 'customer_id', 'component_id', 'quantity', 'created_at', 'updated_at'),
+    'accounts': (
+        'id', 'account_code', 'account_name', 'account_type', 'subtype', 'parent_id', 'normal_balance', 'is_active',
+        'created_at', 'updated_at'
+    ),
+    'payments': ('id', 'user_id', 'amount', 'account_id', 'debit_account_id', 'currency', 'payment_method', 'created_at', 'updated_at')
+}
+
+PAYMENT_METHOD_NAMES = ['BCA Virtual Account', 'BNI Virtual Account', 'BBB Virtual Account', 'Bank Transfer']
+
+CATEGORY_NAMES = [
+    'Graphic Cards', 'Processors', 'Macs', 'Power Supplies', 'Cpu Coolers',
+    'RAMs', 'Monitors', 'Laptops', 'Motherboards', 'Others'
+]
+BRANDS = ['ASUS', 'MSI', 'Gigabyte', 'Corsair', 'Noctua', 'Kingston', 'Samsung', 'AMD', 'Intel', 'NZXT', 'Lian Li', 'Seasonic']
+SUPPLIERS = ['Aftershock PC', 'Dynacore', 'Enter Komputer', 'Rakitan Jaya', 'Bhinneka', 'Jakarta Notebook']
+FIRST_NAMES = ['Sean', 'Ayu', 'Budi', 'Citra', 'Dewi', 'Eko', 'Fajar', 'Gita', 'Hadi', 'Indra', 'Joko', 'Kartika', 'Lestari', 'Made']
+LAST_NAMES = ['Ali', 'Santoso', 'Wijaya', 'Pratama', 'Saputra', 'Halim', 'Gunawan', 'Kusuma', 'Nugroho', 'Siregar']
+CITIES = ['Jakarta', 'Bandung', 'Surabaya', 'Medan', 'Yogyakarta', 'Denpasar', 'Makassar', 'Semarang']
+
+# Ratings skew positive like real shop reviews, currencies and payment methods skew to IDR and bank transfers
+RATING_WEIGHTS = [3, 4, 10, 30, 53]
+CURRENCY_WEIGHTS = { CurrencyEnum.IDR: 70, CurrencyEnum.USD: 12, CurrencyEnum.EUR: 8, CurrencyEnum.AUD: 5, CurrencyEnum.CAD: 5 }
+PAYMENT_METHOD_WEIGHTS = { PaymentMethodEnum.CASH: 20, PaymentMethodEnum.BCA_TRANSFER: 50, PaymentMethodEnum.BNI_TRANSFER: 30 }
+
+# Minimal chart of accounts, created only when the table is empty
+CHART_OF_ACCOUNTS = [
+    (1000, 'Cash', AccountTypeEnum.ASSET, NormalBalanceEnum.DEBIT),
+    (1010, 'Bank BCA', AccountTypeEnum.ASSET, NormalBalanceEnum.DEBIT),
+    (1020, 'Bank BNI', AccountTypeEnum.ASSET, NormalBalanceEnum.DEBIT),
+    (1100, 'Accounts Receivable', AccountTypeEnum.ASSET, NormalBalanceEnum.DEBIT),
+    (1200, 'Inventory', AccountTypeEnum.ASSET, NormalBalanceEnum.DEBIT),
+    (2000, 'Accounts Payable', AccountTypeEnum.LIABILITY, NormalBalanceEnum.CREDIT),
+    (3000, 'Owner Equity', AccountTypeEnum.EQUITY, NormalBalanceEnum.CREDIT),
+    (4000, 'Sales Revenue', AccountTypeEnum.REVENUE, NormalBalanceEnum.CREDIT),
+    (5000, 'Cost of Goods Sold', AccountTypeEnum.EXPENSE, NormalBalanceEnum.DEBIT)
+]
+
+class GenerateService:
+    """Writes a referentially consistent data set for every table through COPY.
+    Ids are assigned here (tables are locked against concurrent writers for the transaction),
+    document numbers continue from the numbering sequences, which are moved past the generated ones."""
+    def __init__(self, db: Session, params: BulkDataParams):
+        self.db = db
+        self.params = params
+        self.random = random.Random(params.seed)
+        self.now = datetime.now().replace(microsecond=0)
+        self.history_start = self.now - timedelta(days=params.history_days)
+
+    def call(self) -> dict:
+        started_at = time.perf_counter()
+        # Inventories are spread over the whole history, give every month its partition up front
+        PartitionService(self.db).call(self.history_start.date(), self.now.date())
+        self.db.execute(text(f"LOCK TABLE {', '.join(TABLES)} IN SHARE ROW EXCLUSIVE MODE"))
+        self.next_ids = { table: self.last_value(f"SELECT MAX(id) FROM {table}") + 1 for table in TABLES }
+        sync_document_sequences(self.db)
+        self.writer = CopyWriter(self.db, TABLES)
+
+        self.generate_users()
+        self.generate_catalog()
+        self.generate_purchasing()
+        self.generate_sales()
+        self.generate_cart_lines()
+        self.generate_payments()
+
+        self.writer.close()
+        sync_document_sequences(self.db)
+        self.db.commit()
+
+        return {
+            'elapsed_seconds': round(time.perf_counter() - started_at, 3),
+            'row_counts': { table: count for table, count in self.writer.row_counts.items() if count }
+        }
+
+    def last_value(self, sql) -> int:
+        return self.db.execute(text(sql)).scalar() or 0
+
+    def last_document_number(self, sequence: DocumentSequence) -> int:
+        row = self.db.execute(text(f"SELECT last_value, is_called FROM {sequence.name}")).one()
+        return row.last_value if row.is_called else 0
+
+    def next_id(self, table) -> int:
+        next_id = self.next_ids[table]
+        self.next_ids[table] += 1
+        return next_id
+
+    def random_datetime(self, start=None, end=None) -> datetime:
+        start = start or self.history_start
+        end = end or self.now
+        seconds = max(int((end - start).total_seconds()), 0)
+        return start + timedelta(seconds=self.random.randint(0, seconds))
+
+    def spread_datetimes(self, count):
+        """count timestamps in increasing order across the history window, like rows created over time"""
+        window = (self.now - self.history_start).total_seconds()
+        step = window / max(count, 1)
+        for index in range(count):
+            yield self.history_start + timedelta(seconds=int(index * step + self.random.random() * step))
+
+    def random_name(self) -> str:
+        return f"{self.random.choice(FIRST_NAMES)} {self.random.choice(LAST_NAMES)}"
+
+    def pick_components(self, count):
+        return self.random.choices(self.components, cum_weights=self.component_cum_weights, k=count)
+
+    def generate_users(self):
+        params = self.params
+        hashed_password = secure_pwd(BULK_PASSWORD)
+        self.buyers = []
+        self.sellers = []
+
+        for created_at in self.spread_datetimes(params.users):
+            user_id = self.next_id('users')
+            role = UserRoleEnum.SELLER if self.random.random() < 0.1 else UserRoleEnum.BUYER
+            fullname = self.random_name()
+            self.writer.write('users', (user_id, fullname, f"bulk_user_{user_id}", role.value, hashed_password, created_at, created_at))
+            (self.sellers if role == UserRoleEnum.SELLER else self.buyers).append((user_id, fullname))
+
+        # Reuse existing users when this run adds none of a role
+        if not self.buyers:
+            self.buyers = [tuple(row) for row in self.db.execute(text(
+                "SELECT id, fullname FROM users WHERE role = :role ORDER BY id LIMIT 10000"), { 'role': UserRoleEnum.BUYER.value }
+            )]
+        if not self.sellers:
+            self.sellers = [tuple(row) for row in self.db.execute(text(
+                "SELECT id, fullname FROM users WHERE role = :role ORDER BY id LIMIT 1000"), { 'role': UserRoleEnum.SELLER.value }
+            )] or self.buyers
+
+        self.payment_methods = [tuple(row) for row in self.db.execute(text("SELECT id, name FROM payment_methods ORDER BY id"))]
+        if not self.payment_methods:
+            for name in PAYMENT_METHOD_NAMES:
+                payment_method_id = self.next_id('payment_methods')
+                self.writer.write('payment_methods', (payment_method_id, name, self.now, self.now))
+                self.payment_methods.append((payment_method_id, name))
+
+    def generate_catalog(self):
+        params = self.params
+        self.categories = []
+        for index in range(params.component_categories):
+            category_id = self.next_id('computer_component_categories')
+            name = f"{CATEGORY_NAMES[index % len(CATEGORY_NAMES)]} #{category_id}"
+            self.writer.write('computer_component_categories', (category_id, name, 0, self.history_start, self.history_start))
+            self.categories.append((category_id, name))
+
+        # Component popularity follows a Zipf-like curve, a few best sellers and a long tail
+        self.components = []
+        weights = []
+        for rank in range(1, params.computer_components + 1):
+            component_id = self.next_id('computer_components')
+            category_id, category_name = self.random.choice(self.categories)
+            brand = self.random.choice(BRANDS)
+            name = f"{brand} {category_name.split(' #')[0]} {component_id}"
+            sell_price = Decimal(round(self.random.lognormvariate(14, 1.0), -3) or 1000)
+            self.writer.write('computer_components', (
+                component_id, name, f"bulk-{component_id}", f"{{{PLACEHOLDER_IMAGE_KEY}}}",
+                f"{brand} {category_name.split(' #')[0]}", category_id, 0, self.history_start, self.history_start
+            ))
+            self.components.append({
+                'id': component_id,
+                'name': name,
+                'category_id': category_id,
+                'category_name': category_name,
+                'sell_price': sell_price,
+                'buy_price': (sell_price * Decimal('0.8')).quantize(Decimal('1'))
+            })
+            weights.append(1 / (rank ** params.component_popularity_skew))
+
+        self.component_cum_weights = list(itertools.accumulate(weights))
+
+        for component in self.components:
+            self.writer.write('computer_component_sell_price_settings', (
+                self.next_id('computer_component_sell_price_settings'), component['id'], 0,
+                component['sell_price'], True, self.history_start, self.history_start
+            ))
+            for day_type in range(1, 8):
+                if self.random.random() < params.weekday_price_ratio:
+                    discount = Decimal(self.random.choice(['0.90', '0.95', '0.97']))
+                    self.writer.write('computer_component_sell_price_settings', (
+                        self.next_id('computer_component_sell_price_settings'), component['id'], day_type,
+                        (component['sell_price'] * discount).quantize(Decimal('1')), True, self.history_start, self.history_start
+                    ))
+
+        if not self.buyers:
+            return
+        for index in range(int(params.reviews_per_component * len(self.components))):
+            component = self.pick_components(1)[0]
+            user_id, fullname = self.random.choice(self.buyers)
+            rating = self.random.choices(range(1, 6), weights=RATING_WEIGHTS)[0]
+            created_at = self.random_datetime()
+            self.writer.write('computer_component_reviews', (
+                self.next_id('computer_component_reviews'), user_id, component['id'], fullname, rating,
+                component_reviews_hash_map[index % len(component_reviews_hash_map)], created_at, created_at
+            ))
+
+    def generate_purchasing(self):
+        params = self.params
+        invoice_no = self.last_document_number(PURCHASE_INVOICE_NO_SEQUENCE)
+        delivery_no = self.last_document_number(INBOUND_DELIVERY_NO_SEQUENCE)
+        receivers = [fullname for _, fullname in self.sellers] or [self.random_name()]
+
+        for created_at in self.spread_datetimes(params.purchase_invoices):
+            invoice_id = self.next_id('purchase_invoices')
+            invoice_no += 1
+            purchase_invoice_no = f"BUY-{invoice_no:07d}"
+            delivered = self.random.random() < params.inbound_delivery_ratio
+            cancelled = not delivered and self.random.random() < 0.1
+            status = (
+                PurchaseInvoiceStatusEnum.COMPLETED if delivered
+                else PurchaseInvoiceStatusEnum.CANCELLED if cancelled
+                else PurchaseInvoiceStatusEnum.PENDING
+            )
+
+            line_count = self.random.randint(params.lines_per_purchase_invoice_min, params.lines_per_purchase_invoice_max)
+            lines = []
+            for component in self.pick_components(line_count):
+                quantity = self.random.randint(1, 20)
+                lines.append((self.next_id('purchase_invoice_lines'), component, quantity, component['buy_price'] * quantity))
+
+            self.writer.write('purchase_invoices', (
+                invoice_id, purchase_invoice_no, created_at, (created_at + timedelta(days=7)).date(), 'bulk generated',
+                self.random.choice(SUPPLIERS), status.value, sum(line[3] for line in lines), created_at, created_at, False
+            ))
+            for line_id, component, quantity, total in lines:
+                self.writer.write('purchase_invoice_lines', (
+                    line_id, invoice_id, component['id'], component['name'], component['category_id'], component['category_name'],
+                    quantity, component['buy_price'], total, created_at, created_at
+                ))
+
+            if delivered:
+                delivery_no += 1
+                self.write_inbound_delivery(invoice_id, purchase_invoice_no, f"IBD-{delivery_no:05d}", created_at, lines, receivers)
+
+    def write_inbound_delivery(self, invoice_id, purchase_invoice_no, inbound_delivery_no, invoice_created_at, lines, receivers):
+        delivery_id = self.next_id('inbound_deliveries')
+        delivered_at = min(invoice_created_at + timedelta(days=self.random.randint(1, 14)), self.now)
+        received_by = self.random.choice(receivers)
+        self.writer.write('inbound_deliveries', (
+            delivery_id, invoice_id, purchase_invoice_no, inbound_delivery_no, delivered_at.date(),
+            f"REF-{delivery_id}", received_by, 'bulk generated', 0, delivered_at, delivered_at, False
+        ))
+
+        for invoice_line_id, component, quantity, total in lines:
+            damaged = 1 if self.random.random() < self.params.damaged_ratio else 0
+            delivery_line_id = self.next_id('inbound_delivery_lines')
+            self.writer.write('inbound_delivery_lines', (
+                delivery_line_id, delivery_id, invoice_line_id, component['id'], component['name'], component['category_id'],
+                component['category_name'], quantity, quantity, damaged, component['buy_price'], total,
+                delivered_at, delivered_at, False
+            ))
+            self.writer.write('inventories', (
+                self.next_id('inventories'), quantity - damaged, None, delivered_at.date(), component['id'],
+                'InboundDelivery', delivery_id, 'InboundDeliveryLine', delivery_line_id, component['buy_price'],
+                delivered_at, delivered_at
+            ))
+
+        if self.random.random() < self.params.attachment_ratio:
+            self.writer.write('inbound_delivery_attachments', (
+                self.next_id('inbound_delivery_attachments'), delivery_id, f"bulk/inbound-deliveries/{delivery_id}.pdf",
+                received_by, delivered_at, delivered_at
+            ))
+
+    def generate_sales(self):
+        params = self.params
+        if not self.buyers:
+            return
+
+        invoice_no = self.last_document_number(SALES_INVOICE_NO_SEQUENCE)
+        delivery_no = self.last_document_number(SALES_DELIVERY_NO_SEQUENCE)
+
+        for created_at in self.spread_datetimes(params.sales_invoices):
+            customer_id, customer_name = self.random.choice(self.buyers)
+            payment_method_id, payment_method_name = self.random.choice(self.payment_methods)
+            shipping_address = f"Jl. Bulk No. {self.random.randint(1, 300)}, {self.random.choice(CITIES)}"
+            virtual_account_no = f"8{self.random.randint(10 ** 14, 10 ** 15 - 1)}"
+            quote_id = self.next_id('sales_quotes')
+            # Q prefix keeps these apart from the 8 hex characters the app uses
+            sales_quote_no = f"Q{quote_id:07d}"
+
+            line_count = self.random.randint(params.lines_per_sales_invoice_min, params.lines_per_sales_invoice_max)
+            lines = []
+            for component in self.pick_components(line_count):
+                quantity = self.random.randint(1, 3)
+                lines.append((component, quantity, component['sell_price'] * quantity))
+            total = sum(line[2] for line in lines)
+
+            self.writer.write('sales_quotes', (
+                quote_id, customer_id, sales_quote_no, total, total, customer_name, shipping_address,
+                payment_method_id, payment_method_name, virtual_account_no, created_at, created_at
+            ))
+            for component, quantity, line_total in lines:
+                self.writer.write('sales_quote_lines', (
+                    self.next_id('sales_quote_lines'), quote_id, component['id'], quantity, component['sell_price'],
+                    line_total, created_at, created_at
+                ))
+
+            delivered = self.random.random() < params.sales_delivery_ratio
+            sales_invoice_id = self.next_id('sales_invoices')
+            invoice_no += 1
+            status = SalesInvoiceStatusEnum.COMPLETED if delivered else SalesInvoiceStatusEnum.PENDING
+            self.writer.write('sales_invoices', (
+                sales_invoice_id, customer_id, status.value, f"PS-CUAN-{invoice_no:08d}", sales_quote_no, total, total,
+                customer_name, shipping_address, payment_method_id, payment_method_name, virtual_account_no, created_at, created_at
+            ))
+            for component, quantity, line_total in lines:
+                self.writer.write('sales_invoice_lines', (
+                    self.next_id('sales_invoice_lines'), sales_invoice_id, component['id'], component['name'], quantity,
+                    component['sell_price'], line_total, created_at, created_at
+                ))
+
+            if delivered:
+                delivery_no += 1
+                self.write_sales_delivery(sales_invoice_id, f"OUTBOUND-DELIVERY-{delivery_no:05d}", created_at, lines)
+
+    def write_sales_delivery(self, sales_invoice_id, sales_delivery_no, invoice_created_at, lines):
+        delivery_id = self.next_id('sales_deliveries')
+        delivered_at = min(invoice_created_at + timedelta(days=self.random.randint(0, 3)), self.now)
+        self.writer.write('sales_deliveries', (
+            delivery_id, SalesDeliveryStatusEnum.DELIVERED.value, sales_invoice_id, sales_delivery_no, delivered_at, delivered_at
+        ))
+
+        for component, quantity, _ in lines:
+            delivery_line_id = self.next_id('sales_delivery_lines')
+            self.writer.write('sales_delivery_lines', (
+                delivery_line_id, delivery_id, component['id'], quantity, delivered_at, delivered_at
+            ))
+            self.writer.write('inventories', (
+                self.next_id('inventories'), None, quantity, delivered_at.date(), component['id'],
+                'SalesDelivery', delivery_id, 'SalesDeliveryLine', delivery_line_id, None, delivered_at, delivered_at
+            ))
+
+    def generate_cart_lines(self):
+        if not self.buyers:
+            return
+
+        for _ in range(self.params.cart_lines):
+            customer_id, _ = self.random.choice(self.buyers)
+            component = self.pick_components(1)[0]
+            created_at = self.random_datetime(start=self.now - timedelta(days=30))
+            self.writer.write('cart_lines', (
+                self.next_id('cart_lines'), 0, customer_id, component['id'], self.random.randint(1, 3), created_at, created_at
+            ))
+
+    def generate_payments(self):
+        params = self.params
+        accounts = { row.account_code: row.id for row in self.db.execute(text("SELECT id, account_code FROM accounts")) }
+        if not accounts:
+            for account_code, account_name, account_type, normal_balance in CHART_OF_ACCOUNTS:
+                account_id = self.next_id('accounts')
+                self.writer.write('accounts', (
+                    account_id, account_code, account_name, account_type.value, 0, None, normal_balance.value, True,
+                    self.history_start, self.history_start
+                ))
+                accounts[account_code] = account_id
+
+        account_ids = list(accounts.values())
+        credit_account_id = accounts.get(4000, account_ids[0])
+        debit_account_ids = {
+            PaymentMethodEnum.CASH: accounts.get(1000, account_ids[0]),
+            PaymentMethodEnum.BCA_TRANSFER: accounts.get(1010, account_ids[0]),
+            PaymentMethodEnum.BNI_TRANSFER: accounts.get(1020, account_ids[0])
+        }
+        payers = self.buyers or self.sellers
+        if not payers:
+            return
+
+        currencies = list(CURRENCY_WEIGHTS)
+        currency_weights = list(CURRENCY_WEIGHTS.values())
+        payment_methods = list(PAYMENT_METHOD_WEIGHTS)
+        payment_method_weights = list(PAYMENT_METHOD_WEIGHTS.values())
+
+        for created_at in self.spread_datetimes(params.payments):
+            user_id, _ = self.random.choice(payers)
+            currency = self.random.choices(currencies, weights=currency_weights)[0]
+            payment_method = self.random.choices(payment_methods, weights=payment_method_weights)[0]
+            amount = Decimal(round(self.random.lognormvariate(13, 1.2) if currency == CurrencyEnum.IDR else self.random.lognormvariate(4, 1.0), 2))
+            self.writer.write('payments', (
+                self.next_id('payments'), user_id, amount, credit_account_id, debit_account_ids[payment_method],
+                currency.value, payment_method.value, created_at, created_at
+            ))
@@ -1,24 +1,52 @@
-from dotenv import load_dotenv
-from openai import OpenAI
-import os
+from openai import AsyncOpenAI
+from config import setting
+from typing import AsyncIterator, Optional
+import httpx
 
-load_dotenv()
-openai_api_key = os.getenv('OPENAI_API_KEY')
-openai_bot_model = os.getenv('OPENAI_BOT_MODEL')
-client = OpenAI(api_key=openai_api_key)
+SYSTEM_PROMPT = "Limit response to 300 characters. analyze report based on the user input"
+
+# A report analysis is one short completion, anything slower than this is better reported than waited on
+OPENAI_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+OPENAI_MAX_RETRIES = 1
+
+def build_openai_client() -> AsyncOpenAI:
+    # OPENAI_BASE_URL points the client at any OpenAI compatible server, e.g. a local stub
+    return AsyncOpenAI(
+        api_key=setting.OPENAI_API_KEY,
+        base_url=setting.OPENAI_BASE_URL,
+        timeout=OPENAI_TIMEOUT,
+        max_retries=OPENAI_MAX_RETRIES
+    )
 
 class AskChatGPT:
-    def build_response(userinput: str) -> str:
-        response = client.chat.completions.create(
-            model= openai_bot_model,
-            messages=[
-                {
-                    "role": "system", "content": "Limit response to 300 characters. analyze report based on the user input"
-                },
-                {
-                    "role": "user", "content": userinput
-                }
-            ]
+    def __init__(self, client: AsyncOpenAI, *, model: Optional[str] = None):
+        self.client = client
+        self.model = model or setting.OPENAI_BOT_MODEL
+
+    def messages(self, user_input: str) -> list:
+        return [
+            {
+                "role": "system", "content": SYSTEM_PROMPT
+            },
+            {
+                "role": "user", "content": user_input
+            }
+        ]
+
+    async def build_response(self, user_input: str) -> str:
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=self.messages(user_input)
         )
 
         return response.choices[0].message.content
+
+    async def stream_response(self, user_input: str) -> AsyncIterator[str]:
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=self.messages(user_input),
+            stream=True
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
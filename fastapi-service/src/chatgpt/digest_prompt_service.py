@@ -0,0 +1,41 @@
+from src.schemas import ( ReportAnalyzerParams, ReportDigestTypeEnum )
+from src.report_inventory_movements.digest_service import DigestService as InventoryMovementDigestService
+from src.report_purchase_invoices.digest_service import DigestService as PurchaseInvoiceDigestService
+from sqlalchemy.orm import Session
+import json
+
+DEFAULT_QUESTION = "Point out the notable totals, top movers, outliers and category trends in this report."
+
+class DigestPromptService:
+    """Builds the analyzer prompt from a server-side digest of the report instead of the report rows"""
+    def __init__(self, db: Session, params: ReportAnalyzerParams):
+        self.db = db
+        self.params = params
+
+    def call(self) -> str:
+        question = ' '.join((self.params.user_input or '').split()) or DEFAULT_QUESTION
+        digest = self.digest_service().call()
+        # Compact separators: the digest is all the model sees, every token in it should carry data
+        serialized = json.dumps({ 'report': self.params.report.value, 'filters': self.filters(), **digest }, separators=(',', ':'))
+
+        return f"{question}\n\nReport digest (JSON):\n{serialized}"
+
+    def filters(self) -> dict:
+        return self.params.filters.model_dump(mode='json', exclude_none=True)
+
+    def digest_service(self):
+        filters = self.params.filters
+        common = {
+            'db': self.db,
+            'start_date': filters.start_date.isoformat() if filters.start_date else None,
+            'end_date': filters.end_date.isoformat() if filters.end_date else None,
+            'component_name': filters.component_name,
+            'component_category_id': str(filters.component_category_id) if filters.component_category_id else None,
+            'keyword': filters.keyword
+        }
+
+        if self.params.report == ReportDigestTypeEnum.INVENTORY_MOVEMENT:
+            return InventoryMovementDigestService(**common, transaction_type=filters.transaction_type)
+
+        invoice_status = str(filters.invoice_status.value) if filters.invoice_status is not None else None
+        return PurchaseInvoiceDigestService(**common, invoice_status=invoice_status)
@@ -0,0 +1,83 @@
+from src.chatgpt.ask_chatgpt import ( AskChatGPT, build_openai_client )
+from src.chatgpt.response_cache import ResponseCache
+from typing import AsyncIterator, Tuple
+import asyncio
+
+MAX_CONCURRENT_REQUESTS = 4
+QUEUE_TIMEOUT_SECONDS = 10
+
+class AnalyzerBusyError(Exception):
+    pass
+
+class ReportAnalyzer:
+    """Answers report questions through the LLM. Identical questions are served from the cache,
+    at most max_concurrent_requests upstream calls run at once and callers wait queue_timeout
+    seconds for a free slot before AnalyzerBusyError."""
+    def __init__(
+        self,
+        ask_chatgpt: AskChatGPT,
+        *,
+        cache: ResponseCache = None,
+        max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+        queue_timeout: float = QUEUE_TIMEOUT_SECONDS
+    ):
+        self.ask_chatgpt = ask_chatgpt
+        self.cache = cache or ResponseCache()
+        self.semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self.queue_timeout = queue_timeout
+
+    def cache_key(self, user_input: str) -> str:
+        return ResponseCache.key(self.ask_chatgpt.model, user_input)
+
+    async def acquire(self):
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise AnalyzerBusyError("Report analyzer is busy, try again shortly")
+
+    async def analyze(self, user_input: str) -> Tuple[str, bool]:
+        """Returns the answer and whether it came from the cache"""
+        key = self.cache_key(user_input)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached, True
+
+        await self.acquire()
+        try:
+            response = await self.ask_chatgpt.build_response(user_input)
+        finally:
+            self.semaphore.release()
+
+        self.cache.set(key, response)
+        return response, False
+
+    async def open_stream(self, user_input: str) -> Tuple[AsyncIterator[str], bool]:
+        """Waits for an upstream slot (so a busy analyzer fails before any byte is sent) and returns
+        the token iterator with whether it replays a cached answer"""
+        key = self.cache_key(user_input)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return self.replay(cached), True
+
+        await self.acquire()
+        return self.relay(key, user_input), False
+
+    async def replay(self, response: str) -> AsyncIterator[str]:
+        yield response
+
+    async def relay(self, key: str, user_input: str) -> AsyncIterator[str]:
+        try:
+            parts = []
+            async for delta in self.ask_chatgpt.stream_response(user_input):
+                parts.append(delta)
+                yield delta
+            # Only complete answers are cached, a client hanging up mid-stream leaves nothing behind
+            self.cache.set(key, ''.join(parts))
+        finally:
+            self.semaphore.release()
+
+    async def aclose(self):
+        await self.ask_chatgpt.client.close()
+
+def build_report_analyzer() -> ReportAnalyzer:
+    return ReportAnalyzer(AskChatGPT(build_openai_client()))
@@ -0,0 +1,92 @@
+from sqlalchemy import DDL, event
+
+# computer_component_effective_prices holds one row per component and weekday (1-7, Mon-Sun):
+# the active weekday price, falling back to the active default (day_type 0) price.
+# Statement-level triggers on computer_component_sell_price_settings keep it in sync,
+# so bulk inserts recompute each touched component once.
+
+REFRESH_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION refresh_component_effective_prices(target_component_ids integer[]) RETURNS void AS $$
+BEGIN
+    WITH effective AS (
+        SELECT
+            component.id AS component_id,
+            weekday.day_type,
+            COALESCE(weekday_setting.price_per_unit, default_setting.price_per_unit) AS price_per_unit
+        FROM computer_components component
+        CROSS JOIN generate_series(1, 7) AS weekday(day_type)
+        LEFT JOIN LATERAL (
+            SELECT s.price_per_unit
+            FROM computer_component_sell_price_settings s
+            WHERE s.component_id = component.id AND s.day_type = weekday.day_type AND s.active
+            ORDER BY s.id
+            LIMIT 1
+        ) weekday_setting ON TRUE
+        LEFT JOIN LATERAL (
+            SELECT s.price_per_unit
+            FROM computer_component_sell_price_settings s
+            WHERE s.component_id = component.id AND s.day_type = 0 AND s.active
+            ORDER BY s.id
+            LIMIT 1
+        ) default_setting ON TRUE
+        WHERE component.id = ANY(target_component_ids)
+    ),
+    removed AS (
+        DELETE FROM computer_component_effective_prices effective_price
+        USING effective
+        WHERE effective_price.component_id = effective.component_id
+          AND effective_price.day_type = effective.day_type
+          AND effective.price_per_unit IS NULL
+    )
+    INSERT INTO computer_component_effective_prices (component_id, day_type, price_per_unit)
+    SELECT component_id, day_type, price_per_unit
+    FROM effective
+    WHERE price_per_unit IS NOT NULL
+    ON CONFLICT (component_id, day_type) DO UPDATE SET price_per_unit = EXCLUDED.price_per_unit;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGER_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION computer_component_sell_price_settings_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM refresh_component_effective_prices(ARRAY(SELECT DISTINCT component_id FROM new_settings));
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM refresh_component_effective_prices(ARRAY(
+            SELECT component_id FROM new_settings UNION SELECT component_id FROM old_settings
+        ));
+    ELSE
+        PERFORM refresh_component_effective_prices(ARRAY(SELECT DISTINCT component_id FROM old_settings));
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGERS_SQL = [
+    "DROP TRIGGER IF EXISTS sell_price_settings_inserted ON computer_component_sell_price_settings",
+    "CREATE TRIGGER sell_price_settings_inserted AFTER INSERT ON computer_component_sell_price_settings "
+    "REFERENCING NEW TABLE AS new_settings "
+    "FOR EACH STATEMENT EXECUTE FUNCTION computer_component_sell_price_settings_changed()",
+    "DROP TRIGGER IF EXISTS sell_price_settings_updated ON computer_component_sell_price_settings",
+    "CREATE TRIGGER sell_price_settings_updated AFTER UPDATE ON computer_component_sell_price_settings "
+    "REFERENCING OLD TABLE AS old_settings NEW TABLE AS new_settings "
+    "FOR EACH STATEMENT EXECUTE FUNCTION computer_component_sell_price_settings_changed()",
+    "DROP TRIGGER IF EXISTS sell_price_settings_deleted ON computer_component_sell_price_settings",
+    "CREATE TRIGGER sell_price_settings_deleted AFTER DELETE ON computer_component_sell_price_settings "
+    "REFERENCING OLD TABLE AS old_settings "
+    "FOR EACH STATEMENT EXECUTE FUNCTION computer_component_sell_price_settings_changed()"
+]
+
+# Fills the table once when it is created next to existing price settings
+BACKFILL_SQL = """
+SELECT refresh_component_effective_prices(ARRAY(SELECT id FROM computer_components))
+WHERE NOT EXISTS (SELECT 1 FROM computer_component_effective_prices)
+"""
+
+def register_effective_price_triggers(metadata):
+    statements = [REFRESH_FUNCTION_SQL, TRIGGER_FUNCTION_SQL] + TRIGGERS_SQL + [BACKFILL_SQL]
+    for statement in statements:
+        event.listen(metadata, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
@@ -1,17 +1,12 @@
 from src.models import ( ComputerComponent )
 from datetime import datetime
-from src.api.s3_dependencies import ( bucket_name, s3_client )
+from src.api.s3_dependencies import ( presigned_url )
 from typing import List
 
 class ImageService:
     def presigned_url_generator(self, component: ComputerComponent) -> List[str]:
         images = []
         if component.images:
-            presigned_url = s3_client().generate_presigned_url(
-                'get_object',
-                Params={'Bucket': bucket_name(), 'Key': component.images[0]},
-                ExpiresIn=3600
-            )
-            images = [presigned_url]
+            images = [presigned_url(component.images[0])]
             
         return images
\ No newline at end of file
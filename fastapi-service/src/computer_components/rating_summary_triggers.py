@@ -0,0 +1,80 @@
+from sqlalchemy import DDL, event
+
+# computer_component_rating_summaries keeps review count, rating sum and a 1-5 star histogram per component.
+# Statement-level triggers on computer_component_reviews apply the inserted/deleted ratings as deltas,
+# so reads never aggregate raw reviews.
+
+APPLY_CHANGES_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION apply_component_rating_changes(component_ids integer[], ratings integer[], direction integer) RETURNS void AS $$
+BEGIN
+    INSERT INTO computer_component_rating_summaries AS summary (
+        component_id, review_count, rating_sum,
+        rating_1_count, rating_2_count, rating_3_count, rating_4_count, rating_5_count
+    )
+    SELECT
+        change.component_id,
+        direction * COUNT(*),
+        direction * COALESCE(SUM(change.rating), 0),
+        direction * COUNT(*) FILTER (WHERE change.rating = 1),
+        direction * COUNT(*) FILTER (WHERE change.rating = 2),
+        direction * COUNT(*) FILTER (WHERE change.rating = 3),
+        direction * COUNT(*) FILTER (WHERE change.rating = 4),
+        direction * COUNT(*) FILTER (WHERE change.rating = 5)
+    FROM unnest(component_ids, ratings) AS change(component_id, rating)
+    GROUP BY change.component_id
+    ON CONFLICT (component_id) DO UPDATE SET
+        review_count = summary.review_count + EXCLUDED.review_count,
+        rating_sum = summary.rating_sum + EXCLUDED.rating_sum,
+        rating_1_count = summary.rating_1_count + EXCLUDED.rating_1_count,
+        rating_2_count = summary.rating_2_count + EXCLUDED.rating_2_count,
+        rating_3_count = summary.rating_3_count + EXCLUDED.rating_3_count,
+        rating_4_count = summary.rating_4_count + EXCLUDED.rating_4_count,
+        rating_5_count = summary.rating_5_count + EXCLUDED.rating_5_count;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGER_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION computer_component_reviews_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_component_rating_changes(changes.component_ids, changes.ratings, 1)
+        FROM (SELECT array_agg(component_id) AS component_ids, array_agg(rating) AS ratings FROM new_reviews) changes;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_component_rating_changes(changes.component_ids, changes.ratings, -1)
+        FROM (SELECT array_agg(component_id) AS component_ids, array_agg(rating) AS ratings FROM old_reviews) changes;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGERS_SQL = [
+    "DROP TRIGGER IF EXISTS component_reviews_inserted ON computer_component_reviews",
+    "CREATE TRIGGER component_reviews_inserted AFTER INSERT ON computer_component_reviews "
+    "REFERENCING NEW TABLE AS new_reviews "
+    "FOR EACH STATEMENT EXECUTE FUNCTION computer_component_reviews_changed()",
+    "DROP TRIGGER IF EXISTS component_reviews_updated ON computer_component_reviews",
+    "CREATE TRIGGER component_reviews_updated AFTER UPDATE ON computer_component_reviews "
+    "REFERENCING OLD TABLE AS old_reviews NEW TABLE AS new_reviews "
+    "FOR EACH STATEMENT EXECUTE FUNCTION computer_component_reviews_changed()",
+    "DROP TRIGGER IF EXISTS component_reviews_deleted ON computer_component_reviews",
+    "CREATE TRIGGER component_reviews_deleted AFTER DELETE ON computer_component_reviews "
+    "REFERENCING OLD TABLE AS old_reviews "
+    "FOR EACH STATEMENT EXECUTE FUNCTION computer_component_reviews_changed()"
+]
+
+# Fills the table once when it is created next to existing reviews
+BACKFILL_SQL = """
+SELECT apply_component_rating_changes(array_agg(component_id), array_agg(rating), 1)
+FROM computer_component_reviews
+WHERE NOT EXISTS (SELECT 1 FROM computer_component_rating_summaries)
+"""
+
+def register_rating_summary_triggers(metadata):
+    statements = [APPLY_CHANGES_FUNCTION_SQL, TRIGGER_FUNCTION_SQL] + TRIGGERS_SQL + [BACKFILL_SQL]
+    for statement in statements:
+        event.listen(metadata, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
@@ -1,6 +1,8 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.pool import NullPool
+from src.database_pool import InstrumentedQueuePool, InstrumentedAsyncAdaptedQueuePool
 from config import setting
 import os
 
@@ -12,13 +14,80 @@ elif web_environment == 'production':
 else:
     DATABASE_URL = f"{setting.DB_TEST_ENGINE}://{setting.DB_TEST_USERNAME}{setting.DB_TEST_PASSWORD}@{setting.DB_TEST_HOST}:{setting.DB_TEST_PORT}/{setting.DB_TEST_DATABASE}"
 
+# Same database, reached through asyncpg for the async def routes
+ASYNC_DATABASE_URL = make_url(DATABASE_URL).set(drivername="postgresql+asyncpg")
+
+# Per-environment pool defaults, each key can be overridden with the matching DB_POOL_* / DB_MAX_OVERFLOW setting.
+# Size the pool so that (pool_size + max_overflow) * uvicorn workers stays below Postgres max_connections.
+POOL_SETTINGS = {
+    'production': {
+        'pool_mode': 'queue',
+        'pool_size': 10,
+        'max_overflow': 10,
+        'pool_timeout': 10,
+        'pool_recycle': 1800,
+        'pool_pre_ping': True
+    },
+    'staging': {
+        'pool_mode': 'queue',
+        'pool_size': 5,
+        'max_overflow': 5,
+        'pool_timeout': 10,
+        'pool_recycle': 1800,
+        'pool_pre_ping': True
+    },
+    'test': {
+        'pool_mode': 'queue',
+        'pool_size': 5,
+        'max_overflow': 5,
+        'pool_timeout': 30,
+        'pool_recycle': 3600,
+        'pool_pre_ping': False
+    }
+}
+
+def pool_settings(environment) -> dict:
+    defaults = POOL_SETTINGS.get(environment, POOL_SETTINGS['test'])
+    overrides = {
+        'pool_mode': setting.DB_POOL_MODE,
+        'pool_size': setting.DB_POOL_SIZE,
+        'max_overflow': setting.DB_MAX_OVERFLOW,
+        'pool_timeout': setting.DB_POOL_TIMEOUT,
+        'pool_recycle': setting.DB_POOL_RECYCLE,
+        'pool_pre_ping': setting.DB_POOL_PRE_PING
+    }
+
+    return { key: (overrides[key] if overrides[key] is not None else value) for key, value in defaults.items() }
+
+def engine_options(environment, *, queue_pool_class=InstrumentedQueuePool) -> dict:
+    config = pool_settings(environment)
+    options = { 'echo': setting.DB_ECHO }
+
+    if config['pool_mode'] == 'null':
+        options['poolclass'] = NullPool
+        return options
+
+    options.update({
+        'poolclass': queue_pool_class,
+        'pool_size': config['pool_size'],
+        'max_overflow': config['max_overflow'],
+        'pool_timeout': config['pool_timeout'],
+        'pool_recycle': config['pool_recycle'],
+        'pool_pre_ping': config['pool_pre_ping']
+    })
+    return options
+
 engine = create_engine(
     DATABASE_URL,
-    echo=True,
-    poolclass=NullPool
+    **engine_options(web_environment)
+)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    **engine_options(web_environment, queue_pool_class=InstrumentedAsyncAdaptedQueuePool)
 )
 
 database_engine = engine
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=async_engine)
 Base = declarative_base()
-db = SessionLocal()
\ No newline at end of file
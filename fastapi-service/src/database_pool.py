@@ -0,0 +1,116 @@
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool, NullPool
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from threading import Lock
+import time
+
+class PoolTelemetry:
+    """Counters collected by InstrumentedQueuePool, shared across pool recreation"""
+    def __init__(self):
+        self._lock = Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.timeouts = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def record_checkout(self, wait_seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def record_timeout(self, wait_seconds: float):
+        with self._lock:
+            self.timeouts += 1
+            self.total_wait_seconds += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def record_checkin(self):
+        with self._lock:
+            self.checkins += 1
+
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            avg_wait = (self.total_wait_seconds / attempts) if attempts else 0.0
+
+            return {
+                'checkouts': self.checkouts,
+                'checkins': self.checkins,
+                'connects': self.connects,
+                'timeouts': self.timeouts,
+                'avg_wait_ms': round(avg_wait * 1000, 3),
+                'max_wait_ms': round(self.max_wait_seconds * 1000, 3)
+            }
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that measures how long callers wait for a connection"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.telemetry = PoolTelemetry()
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.telemetry.record_timeout(time.perf_counter() - started_at)
+            raise
+
+        self.telemetry.record_checkout(time.perf_counter() - started_at)
+        return connection
+
+    def _do_return_conn(self, record):
+        self.telemetry.record_checkin()
+        super()._do_return_conn(record)
+
+    def _create_connection(self):
+        self.telemetry.record_connect()
+        return super()._create_connection()
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool, keep the counters running
+        pool = super().recreate()
+        pool.telemetry = self.telemetry
+        return pool
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """asyncio flavour of InstrumentedQueuePool, used by the asyncpg engine"""
+    pass
+
+def pool_status(engine) -> dict:
+    pool = engine.pool
+    status = {
+        'pool_class': pool.__class__.__name__,
+        'size': 0,
+        'max_overflow': 0,
+        'timeout_seconds': None,
+        'checked_out': 0,
+        'idle': 0,
+        'overflow': 0
+    }
+
+    if isinstance(pool, NullPool):
+        return status
+
+    if isinstance(pool, QueuePool):
+        status.update({
+            'size': pool.size(),
+            'max_overflow': pool._max_overflow,
+            'timeout_seconds': pool.timeout(),
+            'checked_out': pool.checkedout(),
+            'idle': pool.checkedin(),
+            # QueuePool.overflow() starts at -pool_size, only the positive part is real overflow
+            'overflow': max(pool.overflow(), 0)
+        })
+
+    telemetry = getattr(pool, 'telemetry', None)
+    if telemetry is not None:
+        status.update(telemetry.snapshot())
+
+    return status
@@ -0,0 +1,39 @@
+from src.document_numbers.sequences import ( DocumentSequence, DocumentFormat )
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from collections import deque
+from config import setting
+import threading
+
+class SequenceBlocks:
+    """Takes block_size numbers from a sequence in one round trip and hands them out from memory.
+    Numbers are then only ordered within a process, and the rest of a block is skipped on restart."""
+    def __init__(self, block_size: int = 1):
+        self.block_size = block_size
+        self.pools = {}
+        self.lock = threading.Lock()
+
+    def next(self, db: Session, sequence: DocumentSequence) -> int:
+        if self.block_size <= 1:
+            return db.execute(text("SELECT nextval(:name)"), { 'name': sequence.name }).scalar()
+
+        with self.lock:
+            pool = self.pools.get(sequence.name)
+            if not pool:
+                pool = deque(db.execute(
+                    text("SELECT nextval(:name) FROM generate_series(1, :count)"),
+                    { 'name': sequence.name, 'count': self.block_size }
+                ).scalars())
+                self.pools[sequence.name] = pool
+            return pool.popleft()
+
+# Shared by every session of the process
+document_number_blocks = SequenceBlocks(setting.DOCUMENT_NUMBER_BLOCK_SIZE)
+
+class NumberingService:
+    def __init__(self, db: Session, blocks: SequenceBlocks = None):
+        self.db = db
+        self.blocks = blocks or document_number_blocks
+
+    def next_number(self, document_format: DocumentFormat) -> str:
+        return document_format.format(self.blocks.next(self.db, document_format.sequence))
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+from sqlalchemy import DDL, event, text
+from sqlalchemy.orm import Session
+from typing import Tuple
+
+# Document numbers come from one Postgres sequence per document type instead of reading and locking
+# the last row, so concurrent transactions never wait on each other for a number. Sequences are not
+# rolled back: a failed transaction leaves a gap in the numbering.
+
+@dataclass(frozen=True)
+class DocumentSequence:
+    name: str
+    table: str
+    column: str
+    # Every format numbered from this sequence, for continuing after existing documents
+    prefixes: Tuple[str, ...]
+
+@dataclass(frozen=True)
+class DocumentFormat:
+    sequence: DocumentSequence
+    prefix: str
+    width: int
+
+    def format(self, number: int) -> str:
+        return f"{self.prefix}{number:0{self.width}d}"
+
+PURCHASE_INVOICE_NO_SEQUENCE = DocumentSequence('purchase_invoice_no_seq', 'purchase_invoices', 'purchase_invoice_no', ('BUY-',))
+INBOUND_DELIVERY_NO_SEQUENCE = DocumentSequence('inbound_delivery_no_seq', 'inbound_deliveries', 'inbound_delivery_no', ('IBD-',))
+SALES_INVOICE_NO_SEQUENCE = DocumentSequence('sales_invoice_no_seq', 'sales_invoices', 'sales_invoice_no', ('PS-CUAN-', 'HSF-SALES-'))
+SALES_DELIVERY_NO_SEQUENCE = DocumentSequence('sales_delivery_no_seq', 'sales_deliveries', 'sales_delivery_no', ('OUTBOUND-DELIVERY-',))
+
+DOCUMENT_SEQUENCES = [
+    PURCHASE_INVOICE_NO_SEQUENCE,
+    INBOUND_DELIVERY_NO_SEQUENCE,
+    SALES_INVOICE_NO_SEQUENCE,
+    SALES_DELIVERY_NO_SEQUENCE
+]
+
+PURCHASE_INVOICE_NO = DocumentFormat(PURCHASE_INVOICE_NO_SEQUENCE, 'BUY-', 7)
+INBOUND_DELIVERY_NO = DocumentFormat(INBOUND_DELIVERY_NO_SEQUENCE, 'IBD-', 5)
+# Invoices built from a quotation and invoices created by the bank transfer/virtual account payments
+SALES_INVOICE_NO = DocumentFormat(SALES_INVOICE_NO_SEQUENCE, 'PS-CUAN-', 8)
+SALES_PAYMENT_INVOICE_NO = DocumentFormat(SALES_INVOICE_NO_SEQUENCE, 'HSF-SALES-', 5)
+SALES_DELIVERY_NO = DocumentFormat(SALES_DELIVERY_NO_SEQUENCE, 'OUTBOUND-DELIVERY-', 5)
+
+def create_sequence_sql(sequence: DocumentSequence) -> str:
+    return f"CREATE SEQUENCE IF NOT EXISTS {sequence.name} AS bigint"
+
+def sync_sequence_sql(sequence: DocumentSequence) -> str:
+    """Moves the sequence right after the highest number already used in the table"""
+    pattern = f"^(?:{'|'.join(sequence.prefixes)})(\\d+)$"
+    return f"""
+SELECT setval('{sequence.name}', GREATEST(MAX(number), 1), MAX(number) IS NOT NULL)
+FROM (SELECT substring({sequence.column} FROM '{pattern}')::bigint AS number FROM {sequence.table}) numbers
+"""
+
+def sync_document_sequences(db: Session):
+    """For writers that number documents themselves, e.g. the bulk data generator"""
+    for sequence in DOCUMENT_SEQUENCES:
+        db.execute(text(sync_sequence_sql(sequence)))
+
+def register_document_sequences(metadata):
+    for sequence in DOCUMENT_SEQUENCES:
+        for statement in [create_sequence_sql(sequence), sync_sequence_sql(sequence)]:
+            event.listen(metadata, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
@@ -1,7 +1,11 @@
 from dataclasses import dataclass
+from typing import Optional
 
 @dataclass
 class GeneratePaymentLoadCommand:
     num_requests: int = 10000
     user_id: int = 1
-    account_id: int = 1
\ No newline at end of file
+    account_id: int = 1
+    concurrency: int = 10
+    target_rps: Optional[float] = None
+    ramp_up_seconds: float = 0
@@ -0,0 +1,8 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+@dataclass
+class ProcessPaymentBatchCommand:
+    """Command to process many payments at once, items are raw PaymentRequestSchema payloads"""
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    all_or_nothing: bool = False
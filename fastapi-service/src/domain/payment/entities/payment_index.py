@@ -10,4 +10,6 @@ from typing import List
 class PaymentIndex:
     item_per_page: int
     page: str
-    report_body: List[PaymentObjectIndex]
\ No newline at end of file
+    report_body: List[PaymentObjectIndex]
+    has_next_page: bool = False
+    next_cursor: Optional[str] = None
\ No newline at end of file
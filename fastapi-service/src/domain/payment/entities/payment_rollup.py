@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import List
+
+@dataclass
+class PaymentRollup:
+    day: date
+    currency: str
+    payment_method: str
+    payment_count: int
+    amount: Decimal
+
+@dataclass
+class PaymentRollupIndex:
+    report_body: List[PaymentRollup]
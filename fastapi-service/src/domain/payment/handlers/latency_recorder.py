@@ -0,0 +1,57 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Any, List
+import math
+import time
+
+# Upper bounds (ms) of the histogram buckets, the last bucket catches everything slower
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+class LatencyRecorder:
+    """Collects latency samples per phase (validate_user, db_insert, journal, total)
+    and summarizes them as percentiles and a bucketed histogram"""
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    @contextmanager
+    def measure(self, phase: str):
+        started_at = self.clock()
+        try:
+            yield
+        finally:
+            self.record(phase, self.clock() - started_at)
+
+    def record(self, phase: str, seconds: float):
+        self.samples[phase].append(seconds * 1000)
+
+    def summary(self) -> Dict[str, Any]:
+        return { phase: self.phase_summary(samples) for phase, samples in self.samples.items() }
+
+    def phase_summary(self, samples: List[float]) -> Dict[str, Any]:
+        ordered = sorted(samples)
+        return {
+            "count": len(ordered),
+            "mean_ms": round(sum(ordered) / len(ordered), 2),
+            "p50_ms": round(percentile(ordered, 50), 2),
+            "p95_ms": round(percentile(ordered, 95), 2),
+            "p99_ms": round(percentile(ordered, 99), 2),
+            "max_ms": round(ordered[-1], 2),
+            "histogram": histogram(ordered)
+        }
+
+def percentile(ordered: List[float], rank: float) -> float:
+    """Nearest-rank percentile of already sorted samples"""
+    index = max(math.ceil(rank / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
+
+def histogram(ordered: List[float]) -> Dict[str, int]:
+    counts = {}
+    position = 0
+    for bound in HISTOGRAM_BUCKETS_MS:
+        start = position
+        while position < len(ordered) and ordered[position] <= bound:
+            position += 1
+        counts[f"<={bound}"] = position - start
+    counts[f">{HISTOGRAM_BUCKETS_MS[-1]}"] = len(ordered) - position
+    return counts
@@ -0,0 +1,97 @@
+from typing import Any, Dict, List
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ..commands.process_payment_batch_command import ProcessPaymentBatchCommand
+from .payment_command_handler import PaymentCommandHandler
+from src.api.schemas.payment_schemas import PaymentRequestSchema
+from src.domain.payment.value_objects.currency import CurrencyEnum
+from src.domain.payment.value_objects.payment_method import PaymentMethod
+from src.infrastructure.http.rails_client import RailsClient
+from src.infrastructure.http.user_validation_cache import UserValidationCache
+from src.infrastructure.persistence.models.account import Account
+from src.infrastructure.persistence.models.payment import Payment
+import logging
+
+class PaymentBatchCommandHandler:
+    """Validates a whole batch in one pass (schema, accounts in one query, each distinct user once)
+    and inserts the valid payments with their outbox events in a single transaction"""
+    def __init__(self, rails_client: RailsClient = None, user_cache: UserValidationCache = None):
+        self.payment_handler = PaymentCommandHandler(rails_client, user_cache)
+
+    async def handle_process_payment_batch(
+        self,
+        command: ProcessPaymentBatchCommand,
+        token: str,
+        db: Session
+    ) -> Dict[str, Any]:
+        results = [{ "index": index, "status": "failed", "payment_id": None, "errors": [] } for index in range(len(command.items))]
+        requests = self.parse(command.items, results)
+
+        known_accounts = set(db.scalars(
+            select(Account.id).where(Account.id.in_({ request.account_id for request in requests.values() }))
+        ))
+        missing_users = await self.payment_handler.validate_users({ request.user_id for request in requests.values() }, token)
+
+        payments = {}
+        for index, request in requests.items():
+            errors = results[index]["errors"]
+            if request.account_id not in known_accounts:
+                errors.append(f"account_id: Account {request.account_id} not found")
+            if request.user_id in missing_users:
+                errors.append(f"user_id: User {request.user_id} not found")
+            if not errors:
+                payments[index] = self.payment(request)
+
+        rejected = len(command.items) - len(payments)
+        if command.all_or_nothing and rejected:
+            payments = {}
+        if payments:
+            self.insert(list(payments.values()), db)
+
+        for index, payment in payments.items():
+            results[index].update(status="created", payment_id=payment.id)
+        for result in results:
+            if result["status"] == "failed" and not result["errors"]:
+                result["errors"].append("Not created, other items of the batch failed")
+
+        return {
+            "total": len(command.items),
+            "created": len(payments),
+            "failed": len(command.items) - len(payments),
+            "results": results
+        }
+
+    def parse(self, items: List[Dict[str, Any]], results: List[Dict[str, Any]]) -> Dict[int, PaymentRequestSchema]:
+        requests = {}
+        for index, item in enumerate(items):
+            try:
+                requests[index] = PaymentRequestSchema.model_validate(item)
+            except ValidationError as e:
+                results[index]["errors"].extend(
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+                )
+        return requests
+
+    def payment(self, request: PaymentRequestSchema) -> Payment:
+        return Payment(
+            user_id=request.user_id,
+            debit_account_id=request.account_id,
+            amount=request.amount,
+            currency=CurrencyEnum.from_value(request.currency).value,
+            payment_method=PaymentMethod.from_value(request.payment_method).value,
+            account_id=request.account_id
+        )
+
+    def insert(self, payments: List[Payment], db: Session):
+        """One flush per table: SQLAlchemy sends the rows as multi-row INSERT .. RETURNING batches"""
+        try:
+            db.add_all(payments)
+            db.flush()
+            db.add_all([event for payment in payments for event in self.payment_handler._outbox_events(payment)])
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logging.error(f"Payment batch failed: {e}")
+            raise HTTPException(status_code=500, detail=f"Payment batch failed: {str(e)}")
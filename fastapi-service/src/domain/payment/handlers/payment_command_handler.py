@@ -1,4 +1,6 @@
 from datetime import datetime
+from typing import Iterable, List, Set
+import asyncio
 from fastapi import BackgroundTasks, Depends, HTTPException, Depends
 import logging
 import httpx
@@ -9,19 +11,32 @@ from src.domain.payment.value_objects.currency import CurrencyEnum
 from src.domain.payment.value_objects.payment_method import PaymentMethod
 from src.api.session_db import AsyncDbSession
 from src.infrastructure.persistence.models.payment import Payment
+from src.infrastructure.persistence.models.outbox_event import ( OutboxEvent, JOURNAL_ENTRY_REQUESTED, PAYMENT_CREATED )
 from sqlalchemy.orm import Session
+from contextlib import nullcontext
+from src.infrastructure.http.rails_client import ( RailsClient, CircuitOpenError )
+from src.infrastructure.http.user_validation_cache import UserValidationCache
+from config import setting
+
+USER_VALIDATION_CONCURRENCY = 10
 
 class PaymentCommandHandler:
-    def __init__(self):
-        pass
+    def __init__(self, rails_client: RailsClient = None, user_cache: UserValidationCache = None):
+        self.rails_client = rails_client
+        self.user_cache = user_cache
 
     async def handle_process_payment(
         self,
         command: ProcessPaymentCommand,
         token: str,
-        db: Session
+        db: Session,
+        recorder=None
     ) -> PaymentTransaction:
-        await self._validate_user(command.user_id, token)
+        """`recorder` (a LatencyRecorder) times the user validation and DB insert phases"""
+        measure = recorder.measure if recorder else lambda phase: nullcontext()
+
+        with measure("validate_user"):
+            await self._validate_user(command.user_id, token)
     
         try:
             payment = PaymentTransaction(
@@ -49,72 +64,98 @@ class PaymentCommandHandler:
                 account_id=payment.debit_account_id
             )
 
-            db.add(payment_model)
-            db.commit()
-            
-            await self._create_sales_journal(payment_model, token)
+            # The journal entry and the payment event are delivered by the OutboxDispatcher,
+            # so they commit or roll back together with the payment
+            with measure("db_insert"):
+                db.add(payment_model)
+                db.flush()
+                db.add_all(self._outbox_events(payment_model))
+                db.commit()
 
             return payment_model
-        except HTTPException as e:
-            # Cleanup
-            try:
-                db.delete(payment_model)
-                db.commit()
-            except Exception as cleanup_error:
-                logging.error(f"Cleanup failed: {cleanup_error}")
-            
-            raise HTTPException(
-                status_code=424,
-                detail=f"Payment created but journal failed: {e.detail}"
-            )
         except Exception as e:
-            try:
-                db.delete(payment_model)
-                db.commit()
-            except Exception as cleanup_error:
-                logging.error(f"Cleanup failed: {cleanup_error}")
-            
+            db.rollback()
+            logging.error(f"Payment processing failed: {e}")
+
             raise HTTPException(
                 status_code=500,
                 detail=f"Payment processing failed: {str(e)}"
             )
-    
-    async def _validate_user(self, user_id: int, token: str):
-        """Validate user exists"""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"http://rails:3000/rails/api/users/{user_id}",
-                headers={
-                    "Authorization": f"Bearer {token}"
+
+    async def validate_users(self, user_ids: Iterable[int], token: str, *, concurrency: int = USER_VALIDATION_CONCURRENCY) -> Set[int]:
+        """Returns the ids Rails does not know, other failures (e.g. 503) propagate"""
+        semaphore = asyncio.Semaphore(concurrency)
+        missing = set()
+
+        async def validate(user_id: int):
+            async with semaphore:
+                try:
+                    await self._validate_user(user_id, token)
+                except HTTPException as e:
+                    if e.status_code != 404:
+                        raise
+                    missing.add(user_id)
+
+        await asyncio.gather(*[validate(user_id) for user_id in set(user_ids)])
+        return missing
+
+    def _outbox_events(self, payment: Payment) -> List[OutboxEvent]:
+        journal_entry = OutboxEvent(
+            event_type=JOURNAL_ENTRY_REQUESTED,
+            aggregate_type="Payment",
+            aggregate_id=payment.id,
+            payload={
+                "user_id": payment.user_id,
+                "journal_entry": {
+                    "reference_id": payment.id,
+                    "reference_type": "Payment",
+                    "reversed_by_id": None
                 }
-            )
+            }
+        )
+        payment_created = OutboxEvent(
+            event_type=PAYMENT_CREATED,
+            aggregate_type="Payment",
+            aggregate_id=payment.id,
+            payload={
+                "payment_id": payment.id,
+                "user_id": payment.user_id,
+                "debit_account_id": payment.debit_account_id,
+                "amount": str(payment.amount),
+                "currency": CurrencyEnum(payment.currency).name,
+                "payment_method": PaymentMethod(payment.payment_method).name
+            }
+        )
+
+        return [journal_entry, payment_created]
 
-            if response.status_code != 200:
-                raise HTTPException(status_code=404, detail="User not found")
+    async def _validate_user(self, user_id: int, token: str):
+        """Validate user exists, remembered answers skip the Rails round trip"""
+        known = self.user_cache.get(user_id, token) if self.user_cache else None
+        if known is True:
+            return
+        if known is False:
+            raise HTTPException(status_code=404, detail="User not found")
 
-    async def _create_sales_journal(self, payment: PaymentTransaction, token: str):
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.post(
-                    f"http://rails:3000/rails/api/journal_entries",
-                    json={
-                        "journal_entry": {
-                            "reference_id": payment.id,
-                            "reference_type": "Payment",
-                            "reversed_by_id": None
-                        }
-                    },
-                    headers={
-                        "Authorization": f"Bearer {token}"
-                    }
-                )
-                response.raise_for_status()
-        except httpx.ConnectError:
-            logging.error(f"Failed to connect to rails:3000 for sales journal.")
-            raise HTTPException(status_code=503, detail="Sales journal service is unavailable")
-        except httpx.HTTPStatusError as e:
-            logging.error(f"HTTP error for sales journal: {e.response.text}")
-            raise HTTPException(status_code=500, detail="Failed to create sales journal")
-        except Exception as e:
-            logging.error(f"Unexpected error creating sales journal: {e}")
-            raise HTTPException(status_code=500, detail="Internal server error in payment handling")
\ No newline at end of file
+            async with self._rails() as rails:
+                response = await rails.get(f"/rails/api/users/{user_id}", token)
+        except CircuitOpenError:
+            raise HTTPException(status_code=503, detail="User service is unavailable")
+        except httpx.TransportError:
+            logging.error(f"Failed to reach rails for user validation.")
+            raise HTTPException(status_code=503, detail="User service is unavailable")
+
+        # Only definite answers are remembered, auth errors and outages are asked again
+        if self.user_cache and response.status_code in (200, 404):
+            self.user_cache.set(user_id, token, response.status_code == 200)
+
+        if response.status_code != 200:
+            raise HTTPException(status_code=404, detail="User not found")
+
+    def _rails(self):
+        """The shared client is owned by the app lifespan and stays open, without one a
+        short-lived client is opened for the call"""
+        if self.rails_client is not None:
+            return nullcontext(self.rails_client)
+        return RailsClient(setting.RAILS_BASE_URL)
@@ -1,42 +1,61 @@
 import asyncio
+import itertools
 import logging
+import math
 import time
-from typing import Dict, Any
+from collections import deque
+from typing import Dict, Any, Callable, Optional
 from decimal import Decimal
 from ..commands.generate_payment_load_command import GeneratePaymentLoadCommand
 from ..commands.process_payment_command import ProcessPaymentCommand
 from .payment_command_handler import PaymentCommandHandler
+from .latency_recorder import LatencyRecorder
+from src.infrastructure.http.rails_client import RailsClient
+from src.infrastructure.http.user_validation_cache import UserValidationCache
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+PROGRESS_LOG_EVERY = 1000
+# Progress is reported every PROGRESS_BATCH_SIZE payments or PROGRESS_INTERVAL_SECONDS, whichever comes first
+PROGRESS_BATCH_SIZE = 100
+PROGRESS_INTERVAL_SECONDS = 1.0
+MAX_KEPT_ERRORS = 100
+
 class PaymentLoadTestHandler:
-    def __init__(self):
-        self.payment_handler = PaymentCommandHandler()
+    def __init__(self, rails_client: RailsClient = None, user_cache: UserValidationCache = None):
+        self.payment_handler = PaymentCommandHandler(rails_client, user_cache)
 
     async def handle_generate_load(
         self,
         command: GeneratePaymentLoadCommand,
         token: str,
-        db: Session
+        db: Session,
+        progress: Callable[[int, int], bool] = None
     ) -> Dict[str, Any]:
         """
-        Execute payment load test asynchronously
+        Execute payment load test with `concurrency` workers, optionally paced to
+        `target_rps` requests per second after a linear ramp-up
 
         Args:
             command: Load test configuration
             token: Authentication token
             db: Database session
+            progress: Called in batches with (successful, failed), returns True to cancel the run
 
         Returns:
-            Dictionary with execution statistics
+            Dictionary with execution statistics and per phase latency percentiles
         """
-        logger.info(f"Starting payment load test: {command.num_requests} requests")
+        logger.info(
+            f"Starting payment load test: {command.num_requests} requests, "
+            f"concurrency {command.concurrency}, target rps {command.target_rps or 'unbounded'}"
+        )
 
-        start_time = time.time()
-        success_count = 0
-        failure_count = 0
-        errors = []
+        recorder = LatencyRecorder()
+        errors = deque(maxlen=MAX_KEPT_ERRORS)
+        counts = { "successful": 0, "failed": 0 }
+        state = { "cancelled": False, "reported": 0, "reported_at": time.perf_counter() }
+        indexes = itertools.count()
 
         payment_command = ProcessPaymentCommand(
             user_id=command.user_id,
@@ -47,42 +66,77 @@ class PaymentLoadTestHandler:
             description="Load test payment"
         )
 
-        # Execute requests sequentially (async but not parallel)
-        # For true parallel execution, we could use asyncio.gather with batching
-        for i in range(command.num_requests):
-            try:
-                await self.payment_handler.handle_process_payment(
-                    payment_command,
-                    token,
-                    db
-                )
-
-                success_count += 1
-                if (i + 1) % 1000 == 0:
-                    logger.info(f"Progress: {i + 1}/{command.num_requests} requests completed")
-            except Exception as e:
-                failure_count += 1
-                error_msg = f"Request {i + 1} failed: {str(e)}"
-                errors.append(error_msg)
-                logger.error(error_msg)
-
-                if len(errors) > 100:
-                    errors.pop(0)
-
-        end_time = time.time()
-        total_time = end_time - start_time
-        avg_time_per_request = total_time / command.num_requests if command.num_requests > 0 else 0
+        start_time = time.perf_counter()
+
+        # The session is shared: every DB call in the payment handler is synchronous,
+        # so workers only interleave at the HTTP awaits and never inside a flush
+        async def worker():
+            while not state["cancelled"] and (i := next(indexes)) < command.num_requests:
+                delay = start_time + start_offset(i, command.target_rps, command.ramp_up_seconds) - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+                try:
+                    with recorder.measure("total"):
+                        await self.payment_handler.handle_process_payment(
+                            payment_command,
+                            token,
+                            db,
+                            recorder=recorder
+                        )
+
+                    counts["successful"] += 1
+                except Exception as e:
+                    counts["failed"] += 1
+                    error_msg = f"Request {i + 1} failed: {str(e)}"
+                    errors.append(error_msg)
+                    logger.error(error_msg)
+
+                done = counts["successful"] + counts["failed"]
+                if done % PROGRESS_LOG_EVERY == 0:
+                    logger.info(f"Progress: {done}/{command.num_requests} requests completed")
+                if progress and (
+                    done - state["reported"] >= PROGRESS_BATCH_SIZE
+                    or time.perf_counter() - state["reported_at"] >= PROGRESS_INTERVAL_SECONDS
+                ):
+                    state.update(reported=done, reported_at=time.perf_counter())
+                    if progress(counts["successful"], counts["failed"]):
+                        logger.info(f"Load test cancelled after {done}/{command.num_requests} requests")
+                        state["cancelled"] = True
+
+        workers = min(command.concurrency, command.num_requests)
+        await asyncio.gather(*[worker() for _ in range(workers)])
+
+        total_time = time.perf_counter() - start_time
+        completed = counts["successful"] + counts["failed"]
+        avg_time_per_request = total_time / completed if completed > 0 else 0
 
         result = {
             "total_requests": command.num_requests,
-            "successful": success_count,
-            "failed": failure_count,
+            "successful": counts["successful"],
+            "failed": counts["failed"],
+            "cancelled": state["cancelled"],
+            "concurrency": workers,
+            "target_rps": command.target_rps,
             "total_time_seconds": round(total_time, 2),
             "avg_time_per_request_ms": round(avg_time_per_request * 1000, 2),
-            "requests_per_second": round(command.num_requests / total_time, 2) if total_time > 0 else 0,
-            "recent_errors": errors[-10:] if errors else []
+            "requests_per_second": round(completed / total_time, 2) if total_time > 0 else 0,
+            "latency_ms": recorder.summary(),
+            "recent_errors": list(errors)[-10:]
         }
 
         logger.info(f"Load test completed: {result}")
-        print(f"Load test completed: {result}")
         return result
+
+def start_offset(index: int, target_rps: Optional[float], ramp_up_seconds: float) -> float:
+    """Seconds after the start at which request `index` may be sent. During the ramp-up
+    the rate grows linearly from zero to target_rps, so the first ramp_up * rps / 2
+    requests are spread over the ramp-up window."""
+    if not target_rps:
+        return 0.0
+
+    ramp_up_requests = target_rps * ramp_up_seconds / 2
+    if index < ramp_up_requests:
+        return math.sqrt(2 * index * ramp_up_seconds / target_rps)
+
+    return ramp_up_seconds + (index - ramp_up_requests) / target_rps
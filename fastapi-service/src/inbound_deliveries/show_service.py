@@ -3,7 +3,7 @@ from src.models import ( InboundDelivery )
 from sqlalchemy.orm import joinedload, Session
 from src.schemas import ( InboundDeliveryStatusEnum)
 from decimal import Decimal
-from src.api.s3_dependencies import ( bucket_name, s3_client )
+from src.api.s3_dependencies import ( presigned_url )
 from datetime import datetime, timedelta
 from dateutil.parser import parse as datetime_parse
 
@@ -42,8 +42,4 @@ class ShowService:
         return inbound_delivery
     
     def create_presigned_url(self, file_s3_key: str):
-        return s3_client().generate_presigned_url(
-            'get_object',
-            Params={'Bucket': bucket_name(), 'Key': file_s3_key },
-            ExpiresIn=3600
-        )
\ No newline at end of file
+        return presigned_url(file_s3_key)
\ No newline at end of file
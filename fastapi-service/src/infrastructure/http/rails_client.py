@@ -0,0 +1,123 @@
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import logging
+import random
+import time
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# One pool per process: payments reuse keep-alive connections to Rails instead of two new sockets each
+RAILS_HTTP_TIMEOUT = httpx.Timeout(5.0, connect=2.0, pool=2.0)
+RAILS_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+MAX_RETRIES = 2
+RETRY_BACKOFF_SECONDS = 0.1
+RETRYABLE_STATUS_CODES = (502, 503, 504)
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT_SECONDS = 30.0
+
+class CircuitOpenError(Exception):
+    pass
+
+class CircuitBreaker:
+    """Opens after failure_threshold consecutive failures and fails fast for reset_timeout seconds,
+    then lets a single trial call through (half open) to decide whether to close again"""
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT_SECONDS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_call(self):
+        state = self.state
+        if state == "open" or (state == "half_open" and self.trial_in_flight):
+            raise CircuitOpenError("Rails is unavailable, failing fast until the circuit closes")
+        if state == "half_open":
+            self.trial_in_flight = True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning(f"Rails circuit opened after {self.failures} consecutive failures")
+            self.opened_at = self.clock()
+
+class RailsClient:
+    """Calls the Rails API over a shared, keep-alive connection pool. Idempotent calls are retried
+    with jittered exponential backoff; every call goes through the circuit breaker."""
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        client: httpx.AsyncClient = None,
+        breaker: CircuitBreaker = None,
+        max_retries: int = MAX_RETRIES,
+        backoff: float = RETRY_BACKOFF_SECONDS,
+        sleep: Callable[[float], Any] = asyncio.sleep
+    ):
+        self.client = client or httpx.AsyncClient(base_url=base_url, timeout=RAILS_HTTP_TIMEOUT, limits=RAILS_HTTP_LIMITS)
+        self.breaker = breaker or CircuitBreaker()
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.sleep = sleep
+
+    async def get(self, path: str, token: str) -> httpx.Response:
+        return await self.request("GET", path, token, idempotent=True)
+
+    async def post(self, path: str, token: str, json: Dict[str, Any]) -> httpx.Response:
+        return await self.request("POST", path, token, json=json, idempotent=False)
+
+    async def request(self, method: str, path: str, token: str, *, idempotent: bool, **kwargs) -> httpx.Response:
+        headers = { "Authorization": f"Bearer {token}" }
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            try:
+                response = await self.client.request(method, path, headers=headers, **kwargs)
+            except httpx.TransportError as e:
+                self.breaker.record_failure()
+                # A POST that never connected never reached Rails, so it is as safe to repeat as a GET
+                retryable = idempotent or isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+                if not retryable or attempt >= self.max_retries:
+                    raise
+            else:
+                if response.status_code < 500:
+                    self.breaker.record_success()
+                    return response
+                self.breaker.record_failure()
+                if not idempotent or response.status_code not in RETRYABLE_STATUS_CODES or attempt >= self.max_retries:
+                    return response
+
+            await self.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+            attempt += 1
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
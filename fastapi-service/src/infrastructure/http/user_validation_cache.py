@@ -0,0 +1,78 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Set, Tuple
+import hashlib
+import time
+
+USER_VALIDATION_TTL_SECONDS = 120
+USER_NOT_FOUND_TTL_SECONDS = 30
+MAX_CACHED_USER_VALIDATIONS = 10000
+
+class UserValidationCache:
+    """Per process memory of Rails user lookups, keyed by user and token: Rails checks the token
+    on every lookup, so a hit only vouches for a pair it has already accepted. Existing users are
+    kept for ttl_seconds, 404s for the shorter negative_ttl_seconds, least recently used entries
+    go first once max_entries is reached."""
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = USER_VALIDATION_TTL_SECONDS,
+        negative_ttl_seconds: float = USER_NOT_FOUND_TTL_SECONDS,
+        max_entries: int = MAX_CACHED_USER_VALIDATIONS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self.entries: "OrderedDict[Tuple[int, str], Tuple[bool, float]]" = OrderedDict()
+        self.keys_by_user: Dict[int, Set[Tuple[int, str]]] = {}
+
+    @staticmethod
+    def key(user_id: int, token: str) -> Tuple[int, str]:
+        # Only a digest of the token is kept in memory
+        return (user_id, hashlib.sha256(token.encode()).hexdigest())
+
+    def get(self, user_id: int, token: str) -> Optional[bool]:
+        """True for a known user, False for a remembered 404, None when Rails has to be asked"""
+        key = self.key(user_id, token)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        exists, expires_at = entry
+        if self.clock() >= expires_at:
+            self.discard(key)
+            return None
+
+        self.entries.move_to_end(key)
+        return exists
+
+    def set(self, user_id: int, token: str, exists: bool):
+        key = self.key(user_id, token)
+        ttl = self.ttl_seconds if exists else self.negative_ttl_seconds
+        self.entries[key] = (exists, self.clock() + ttl)
+        self.entries.move_to_end(key)
+        self.keys_by_user.setdefault(user_id, set()).add(key)
+
+        while len(self.entries) > self.max_entries:
+            oldest, _ = next(iter(self.entries.items()))
+            self.discard(oldest)
+
+    def invalidate(self, user_id: int) -> int:
+        """Forgets every lookup of the user, returns how many entries were dropped"""
+        keys = self.keys_by_user.pop(user_id, set())
+        for key in keys:
+            self.entries.pop(key, None)
+        return len(keys)
+
+    def clear(self):
+        self.entries.clear()
+        self.keys_by_user.clear()
+
+    def discard(self, key: Tuple[int, str]):
+        self.entries.pop(key, None)
+        user_keys = self.keys_by_user.get(key[0])
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self.keys_by_user[key[0]]
@@ -0,0 +1,161 @@
+from datetime import timedelta
+from typing import Callable, Dict, List
+import asyncio
+import logging
+import random
+from sqlalchemy import select, update, func
+from sqlalchemy.orm import Session
+from src.infrastructure.http.rails_client import RailsClient
+from src.infrastructure.messaging.payment_event_publisher import PaymentEventPublisher
+from src.infrastructure.persistence.models.outbox_event import ( OutboxEvent, JOURNAL_ENTRY_REQUESTED, PAYMENT_CREATED )
+from utils.auth import create_access_token
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_POLL_SECONDS = 1
+OUTBOX_BATCH_SIZE = 100
+# A full batch is followed straight away by the next one, up to this many per run
+OUTBOX_MAX_BATCHES_PER_RUN = 10
+OUTBOX_DELIVERY_CONCURRENCY = 10
+# Claimed events come back to the queue after this long if the worker dies while delivering them
+OUTBOX_LEASE_SECONDS = 60
+OUTBOX_MAX_ATTEMPTS = 10
+OUTBOX_RETRY_BACKOFF_SECONDS = 2
+OUTBOX_MAX_RETRY_DELAY_SECONDS = 600
+JOURNAL_TOKEN_MINUTES = 5
+
+class OutboxDispatcher:
+    """Delivers pending outbox events in batches: journal entries to Rails and payment events to
+    the publisher. Delivery is at least once, Rails should treat reference_id as idempotency key.
+    Failed events are retried with jittered exponential backoff and parked as `failed` after
+    max_attempts."""
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        rails_client: RailsClient,
+        publisher: PaymentEventPublisher = None,
+        *,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+        concurrency: int = OUTBOX_DELIVERY_CONCURRENCY
+    ):
+        self.session_factory = session_factory
+        self.rails_client = rails_client
+        self.publisher = publisher or PaymentEventPublisher()
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+    async def dispatch(self, max_batches: int = OUTBOX_MAX_BATCHES_PER_RUN) -> int:
+        delivered = 0
+        for _ in range(max_batches):
+            claimed, batch_delivered = await self.dispatch_batch()
+            delivered += batch_delivered
+            if claimed < self.batch_size:
+                break
+        return delivered
+
+    async def dispatch_batch(self):
+        """Returns how many events were claimed and how many of them were delivered"""
+        events = self.claim()
+        if not events:
+            return 0, 0
+
+        errors = await self.deliver(events)
+        self.settle(events, errors)
+        return len(events), len(events) - len(errors)
+
+    def claim(self) -> List:
+        """Leases the next due events. SKIP LOCKED keeps concurrent dispatchers (one per worker)
+        off each other's rows, the lease keeps them off rows being delivered after the commit."""
+        due = (
+            select(OutboxEvent.id)
+                .where(OutboxEvent.status == "pending", OutboxEvent.available_at <= func.now())
+                .order_by(OutboxEvent.available_at, OutboxEvent.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+        )
+
+        with self.session_factory() as session:
+            events = session.execute(
+                update(OutboxEvent)
+                    .where(OutboxEvent.id.in_(due.scalar_subquery()))
+                    .values(
+                        attempts=OutboxEvent.attempts + 1,
+                        available_at=func.now() + timedelta(seconds=OUTBOX_LEASE_SECONDS)
+                    )
+                    .returning(OutboxEvent.id, OutboxEvent.event_type, OutboxEvent.payload, OutboxEvent.attempts)
+                    .execution_options(synchronize_session=False)
+            ).all()
+            session.commit()
+
+        return sorted(events, key=lambda event: event.id)
+
+    async def deliver(self, events) -> Dict[int, str]:
+        """Returns the error of every event that was not delivered, keyed by event id"""
+        errors = {}
+
+        payment_events = [event for event in events if event.event_type == PAYMENT_CREATED]
+        if payment_events:
+            try:
+                await self.publisher.publish_payment_events([event.payload for event in payment_events])
+            except Exception as e:
+                errors.update({ event.id: str(e) for event in payment_events })
+
+        async def deliver_journal_entry(event):
+            async with self.semaphore:
+                try:
+                    await self.deliver_journal_entry(event.payload)
+                except Exception as e:
+                    errors[event.id] = str(e) or e.__class__.__name__
+
+        unknown = [event for event in events if event.event_type not in (PAYMENT_CREATED, JOURNAL_ENTRY_REQUESTED)]
+        errors.update({ event.id: f"Unknown event type {event.event_type}" for event in unknown })
+
+        await asyncio.gather(*[
+            deliver_journal_entry(event) for event in events if event.event_type == JOURNAL_ENTRY_REQUESTED
+        ])
+        return errors
+
+    async def deliver_journal_entry(self, payload: Dict):
+        token = create_access_token(payload["user_id"], JOURNAL_TOKEN_MINUTES)
+        response = await self.rails_client.post(
+            "/rails/api/journal_entries",
+            token,
+            json={ "journal_entry": payload["journal_entry"] }
+        )
+        response.raise_for_status()
+
+    def settle(self, events, errors: Dict[int, str]):
+        delivered_ids = [event.id for event in events if event.id not in errors]
+
+        with self.session_factory() as session:
+            if delivered_ids:
+                session.execute(
+                    update(OutboxEvent)
+                        .where(OutboxEvent.id.in_(delivered_ids))
+                        .values(status="delivered", delivered_at=func.now(), last_error=None)
+                        .execution_options(synchronize_session=False)
+                )
+
+            for event in events:
+                if event.id not in errors:
+                    continue
+                logger.warning(f"Outbox event {event.id} ({event.event_type}) attempt {event.attempts} failed: {errors[event.id]}")
+                values = { 'last_error': errors[event.id] }
+                if event.attempts >= self.max_attempts:
+                    values['status'] = "failed"
+                else:
+                    values['available_at'] = func.now() + timedelta(seconds=retry_delay(event.attempts))
+                session.execute(
+                    update(OutboxEvent)
+                        .where(OutboxEvent.id == event.id)
+                        .values(**values)
+                        .execution_options(synchronize_session=False)
+                )
+
+            session.commit()
+
+def retry_delay(attempts: int) -> float:
+    ceiling = min(OUTBOX_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1), OUTBOX_MAX_RETRY_DELAY_SECONDS)
+    return random.uniform(ceiling / 2, ceiling)
@@ -1,7 +1,12 @@
-from typing import Dict
+from typing import Dict, List
 
 class PaymentEventPublisher:
     async def publish_payment_event(self, payment_data: Dict):
         """Publish payment event to message broker (Kafka)"""
         # TODO: Implement actual Kafka publishing
-        pass
\ No newline at end of file
+        pass
+
+    async def publish_payment_events(self, payments_data: List[Dict]):
+        """Publish a batch of payment events, one broker round trip once publishing is real"""
+        for payment_data in payments_data:
+            await self.publish_payment_event(payment_data)
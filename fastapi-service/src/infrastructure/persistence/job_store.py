@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from src.infrastructure.persistence.models.job import Job
+
+MAX_CACHED_JOBS = 1000
+ACTIVE_STATUSES = ("started", "running")
+
+class JobCache:
+    """Per process LRU of finished job snapshots. Finished jobs never change again, so they are
+    safe to serve from memory; active jobs are always read from the jobs table."""
+    def __init__(self, max_entries: int = MAX_CACHED_JOBS):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        snapshot = self.entries.get(job_id)
+        if snapshot is not None:
+            self.entries.move_to_end(job_id)
+        return snapshot
+
+    def set(self, job_id: str, snapshot: Dict[str, Any]):
+        self.entries[job_id] = snapshot
+        self.entries.move_to_end(job_id)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+class JobStore:
+    """Reads and writes the jobs table, each call in its own short session so a long running
+    background job never holds a request scoped session"""
+    def __init__(self, session_factory: Callable[[], Session], cache: JobCache):
+        self.session_factory = session_factory
+        self.cache = cache
+
+    def create(self, job_id: str, job_type: str, total: int):
+        with self.session_factory() as session:
+            session.add(Job(id=job_id, job_type=job_type, status="started", total=total))
+            session.commit()
+
+    def start(self, job_id: str):
+        self.update(job_id, status="running", started_at=datetime.now())
+
+    def report_progress(self, job_id: str, successful: int, failed: int) -> bool:
+        """Stores the counters and returns whether cancellation was requested meanwhile"""
+        with self.session_factory() as session:
+            cancel_requested = session.execute(
+                update(Job)
+                    .where(Job.id == job_id)
+                    .values(successful=successful, failed=failed, updated_at=datetime.now())
+                    .returning(Job.cancel_requested)
+            ).scalar()
+            session.commit()
+
+        return bool(cancel_requested)
+
+    def finish(self, job_id: str, status: str, *, result: Dict[str, Any] = None, error: str = None):
+        values = { 'status': status, 'completed_at': datetime.now(), 'result': result, 'error': error }
+        if result is not None:
+            values.update(successful=result["successful"], failed=result["failed"])
+        self.update(job_id, **values)
+
+    def request_cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Flags an active job for cancellation, the worker running it stops at its next progress report"""
+        with self.session_factory() as session:
+            session.execute(
+                update(Job)
+                    .where(Job.id == job_id, Job.status.in_(ACTIVE_STATUSES))
+                    .values(cancel_requested=True, updated_at=datetime.now())
+            )
+            session.commit()
+
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        cached = self.cache.get(job_id)
+        if cached is not None:
+            return cached
+
+        with self.session_factory() as session:
+            job = session.get(Job, job_id)
+            if job is None:
+                return None
+            snapshot = self.snapshot(job)
+
+        if snapshot["status"] not in ACTIVE_STATUSES:
+            self.cache.set(job_id, snapshot)
+        return snapshot
+
+    def update(self, job_id: str, **values):
+        with self.session_factory() as session:
+            session.execute(update(Job).where(Job.id == job_id).values(updated_at=datetime.now(), **values))
+            session.commit()
+
+    def snapshot(self, job: Job) -> Dict[str, Any]:
+        return {
+            "job_id": job.id,
+            "status": job.status,
+            "total": job.total,
+            "successful": job.successful,
+            "failed": job.failed,
+            "cancel_requested": job.cancel_requested,
+            "result": job.result,
+            "error": job.error,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "completed_at": job.completed_at.isoformat() if job.completed_at else None
+        }
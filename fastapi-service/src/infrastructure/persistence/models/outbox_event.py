@@ -0,0 +1,29 @@
+from src.database import Base
+from sqlalchemy import ( DateTime, Column, Integer, BigInteger, String, Text, func, Index, text )
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+JOURNAL_ENTRY_REQUESTED = "journal_entry.requested"
+PAYMENT_CREATED = "payment.created"
+
+class OutboxEvent(Base):
+    """Side effects of a write, stored in the same transaction and delivered later by the OutboxDispatcher"""
+    __tablename__ = "outbox_events"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    event_type: Mapped[str] = mapped_column(String, nullable=False)
+    aggregate_type: Mapped[str] = mapped_column(String, nullable=False)
+    aggregate_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    payload = Column(JSONB, nullable=False)
+    status: Mapped[str] = mapped_column(String, nullable=False, server_default="pending")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    last_error = Column(Text, nullable=True)
+    available_at = Column(DateTime, server_default=func.now(), nullable=False)
+    delivered_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # The dispatcher only ever looks for pending events that are due
+        Index('ix_outbox_events_pending', 'available_at', 'id', postgresql_where=text("status = 'pending'")),
+        Index('ix_outbox_events_aggregate', 'aggregate_type', 'aggregate_id'),
+    )
@@ -1,5 +1,5 @@
 from src.database import Base
-from sqlalchemy import ( DateTime, Column, Integer, Numeric, Boolean, String, func, ForeignKey )
+from sqlalchemy import ( DateTime, Column, Integer, Numeric, Boolean, String, func, ForeignKey, Index )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from decimal import Decimal
 
@@ -32,4 +32,8 @@ class Payment(Base):
         "Account",
         foreign_keys=[debit_account_id],
         back_populates="payments"
-    )
\ No newline at end of file
+    )
+
+    __table_args__ = (
+        Index('ix_payments_created_at', 'created_at'),
+    )
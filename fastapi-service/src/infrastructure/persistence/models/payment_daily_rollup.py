@@ -0,0 +1,16 @@
+from src.database import Base
+from sqlalchemy import ( Date, Integer, BigInteger, Numeric )
+from sqlalchemy.orm import Mapped, mapped_column
+from decimal import Decimal
+from datetime import date
+
+class PaymentDailyRollup(Base):
+    """Payment count and amount per day, currency and payment method.
+    Maintained by triggers on payments, see payment_rollup_triggers.py"""
+    __tablename__ = "payment_daily_rollups"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    currency: Mapped[int] = mapped_column(Integer, primary_key=True)
+    payment_method: Mapped[int] = mapped_column(Integer, primary_key=True)
+    payment_count: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+    amount: Mapped[Decimal] = mapped_column(Numeric(26, 6), nullable=False, server_default="0")
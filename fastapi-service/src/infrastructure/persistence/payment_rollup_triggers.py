@@ -0,0 +1,82 @@
+from sqlalchemy import DDL, event
+
+# payment_daily_rollups keeps payment count and amount per day x currency x payment method.
+# Statement-level triggers on payments apply the inserted/deleted rows as deltas, so a batch insert
+# touches each rollup row once and reads never aggregate raw payments. Rows are upserted in key order
+# so concurrent payment transactions lock shared rollup rows in the same order.
+
+APPLY_CHANGES_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION apply_payment_rollup_changes(days date[], currencies integer[], payment_methods integer[], amounts numeric[], direction integer) RETURNS void AS $$
+BEGIN
+    INSERT INTO payment_daily_rollups AS rollup (day, currency, payment_method, payment_count, amount)
+    SELECT change.day, change.currency, change.payment_method, direction * COUNT(*), direction * COALESCE(SUM(change.amount), 0)
+    FROM unnest(days, currencies, payment_methods, amounts) AS change(day, currency, payment_method, amount)
+    GROUP BY change.day, change.currency, change.payment_method
+    ORDER BY change.day, change.currency, change.payment_method
+    ON CONFLICT (day, currency, payment_method) DO UPDATE SET
+        payment_count = rollup.payment_count + EXCLUDED.payment_count,
+        amount = rollup.amount + EXCLUDED.amount;
+
+    IF direction < 0 THEN
+        DELETE FROM payment_daily_rollups
+        WHERE payment_count = 0
+          AND (day, currency, payment_method) IN (
+              SELECT * FROM unnest(days, currencies, payment_methods)
+          );
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGER_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION payments_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_payment_rollup_changes(changes.days, changes.currencies, changes.payment_methods, changes.amounts, -1)
+        FROM (
+            SELECT array_agg(created_at::date) AS days, array_agg(currency) AS currencies,
+                   array_agg(payment_method) AS payment_methods, array_agg(amount) AS amounts
+            FROM old_payments
+        ) changes;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_payment_rollup_changes(changes.days, changes.currencies, changes.payment_methods, changes.amounts, 1)
+        FROM (
+            SELECT array_agg(created_at::date) AS days, array_agg(currency) AS currencies,
+                   array_agg(payment_method) AS payment_methods, array_agg(amount) AS amounts
+            FROM new_payments
+        ) changes;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGERS_SQL = [
+    "DROP TRIGGER IF EXISTS payments_inserted ON payments",
+    "CREATE TRIGGER payments_inserted AFTER INSERT ON payments "
+    "REFERENCING NEW TABLE AS new_payments "
+    "FOR EACH STATEMENT EXECUTE FUNCTION payments_changed()",
+    "DROP TRIGGER IF EXISTS payments_updated ON payments",
+    "CREATE TRIGGER payments_updated AFTER UPDATE ON payments "
+    "REFERENCING OLD TABLE AS old_payments NEW TABLE AS new_payments "
+    "FOR EACH STATEMENT EXECUTE FUNCTION payments_changed()",
+    "DROP TRIGGER IF EXISTS payments_deleted ON payments",
+    "CREATE TRIGGER payments_deleted AFTER DELETE ON payments "
+    "REFERENCING OLD TABLE AS old_payments "
+    "FOR EACH STATEMENT EXECUTE FUNCTION payments_changed()"
+]
+
+# Fills the table once when it is created next to existing payments
+BACKFILL_SQL = """
+SELECT apply_payment_rollup_changes(array_agg(created_at::date), array_agg(currency), array_agg(payment_method), array_agg(amount), 1)
+FROM payments
+WHERE NOT EXISTS (SELECT 1 FROM payment_daily_rollups)
+"""
+
+def register_payment_rollup_triggers(metadata):
+    statements = [APPLY_CHANGES_FUNCTION_SQL, TRIGGER_FUNCTION_SQL] + TRIGGERS_SQL + [BACKFILL_SQL]
+    for statement in statements:
+        event.listen(metadata, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
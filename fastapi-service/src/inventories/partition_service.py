@@ -0,0 +1,46 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from datetime import date, datetime
+from typing import List
+
+UPCOMING_MONTHS = 3
+
+class PartitionService:
+    """Maintains the monthly inventories partitions, see partitions.py"""
+    def __init__(self, db: Session):
+        self.db = db
+
+    def call(self, from_date: date, to_date: date) -> int:
+        """Creates the missing monthly partitions between both dates, returns how many were created"""
+        return self.db.execute(
+            text("SELECT ensure_inventory_partitions(:from_date, :to_date)"),
+            { 'from_date': from_date, 'to_date': to_date }
+        ).scalar()
+
+    def ensure_upcoming(self) -> int:
+        today = date.today()
+        month = today.month - 1 + UPCOMING_MONTHS
+        return self.call(today, date(today.year + month // 12, month % 12 + 1, 1))
+
+    def partitions(self) -> List[str]:
+        return self.db.execute(text("""
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = to_regclass('inventories')
+            ORDER BY child.relname
+        """)).scalars().all()
+
+    def detach_before(self, month: date) -> List[str]:
+        """Detaches the monthly partitions older than month. They stay as plain tables with the same
+        name, ready to be archived, moved to cheaper storage or attached again."""
+        detached = []
+        for partition_name in self.partitions():
+            try:
+                partition_month = datetime.strptime(partition_name, 'inventories_%Y_%m').date()
+            except ValueError:
+                continue
+            if partition_month < month.replace(day=1):
+                self.db.execute(text(f'ALTER TABLE inventories DETACH PARTITION "{partition_name}"'))
+                detached.append(partition_name)
+
+        return detached
@@ -0,0 +1,56 @@
+from sqlalchemy import DDL, event
+
+# inventories is range partitioned by stock_date, one partition per month named inventories_YYYY_MM.
+# Rows for months without a partition land in inventories_default; creating the month later moves them
+# out of the default partition before attaching, so partitions can always be added after the fact.
+
+ENSURE_PARTITIONS_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION ensure_inventory_partitions(from_date date, to_date date) RETURNS integer AS $$
+DECLARE
+    month_start date := date_trunc('month', from_date)::date;
+    month_end date;
+    partition_name text;
+    created_count integer := 0;
+BEGIN
+    -- App workers starting together would otherwise race on the same month
+    PERFORM pg_advisory_xact_lock(hashtext('ensure_inventory_partitions'));
+
+    WHILE month_start <= to_date LOOP
+        month_end := (month_start + interval '1 month')::date;
+        partition_name := 'inventories_' || to_char(month_start, 'YYYY_MM');
+
+        IF to_regclass(partition_name) IS NULL THEN
+            EXECUTE 'CREATE TABLE ' || quote_ident(partition_name)
+                || ' (LIKE inventories INCLUDING DEFAULTS INCLUDING CONSTRAINTS)';
+            EXECUTE 'WITH moved AS (DELETE FROM inventories_default'
+                || ' WHERE stock_date >= ' || quote_literal(month_start) || ' AND stock_date < ' || quote_literal(month_end)
+                || ' RETURNING *) INSERT INTO ' || quote_ident(partition_name) || ' SELECT * FROM moved';
+            EXECUTE 'ALTER TABLE inventories ATTACH PARTITION ' || quote_ident(partition_name)
+                || ' FOR VALUES FROM (' || quote_literal(month_start) || ') TO (' || quote_literal(month_end) || ')';
+            created_count := created_count + 1;
+        END IF;
+
+        month_start := month_end;
+    END LOOP;
+
+    RETURN created_count;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Skipped while inventories is still the unpartitioned table the migration converts
+PARTITIONS_SQL = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_class WHERE oid = to_regclass('inventories') AND relkind = 'p') THEN
+        CREATE TABLE IF NOT EXISTS inventories_default PARTITION OF inventories DEFAULT;
+        PERFORM ensure_inventory_partitions(current_date, (current_date + interval '3 months')::date);
+    END IF;
+END;
+$$
+"""
+
+def register_inventory_partitions(metadata):
+    statements = [ENSURE_PARTITIONS_FUNCTION_SQL, PARTITIONS_SQL]
+    for statement in statements:
+        event.listen(metadata, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
@@ -0,0 +1,36 @@
+from src.models import ( Inventory, INVENTORY_RESOURCE_MODELS, INVENTORY_RESOURCE_LINE_MODELS )
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from collections import defaultdict
+from typing import List
+
+class InventoryResourceLoaderService:
+    """Resolves resource and resource_line of many inventories with one query per resource type,
+    instead of the two session.get calls per row the Inventory properties would issue."""
+    def __init__(self, db: Session):
+        self.db = db
+
+    def call(self, inventories: List[Inventory]) -> List[Inventory]:
+        resources = self.load(inventories, 'resource_type', 'resource_id', INVENTORY_RESOURCE_MODELS)
+        resource_lines = self.load(inventories, 'resource_line_type', 'resource_line_id', INVENTORY_RESOURCE_LINE_MODELS)
+
+        for inventory in inventories:
+            inventory._preloaded_resource = resources.get((inventory.resource_type, inventory.resource_id))
+            inventory._preloaded_resource_line = resource_lines.get((inventory.resource_line_type, inventory.resource_line_id))
+
+        return inventories
+
+    def load(self, inventories, type_attribute, id_attribute, models) -> dict:
+        ids_by_type = defaultdict(set)
+        for inventory in inventories:
+            resource_type = getattr(inventory, type_attribute)
+            if resource_type in models:
+                ids_by_type[resource_type].add(getattr(inventory, id_attribute))
+
+        loaded = {}
+        for resource_type, ids in ids_by_type.items():
+            model = models[resource_type]
+            for resource in self.db.scalars(select(model).where(model.id.in_(ids))):
+                loaded[(resource_type, resource.id)] = resource
+
+        return loaded
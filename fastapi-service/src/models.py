@@ -22,6 +22,14 @@ from datetime import datetime, date
 # Import DDD models to register them with SQLAlchemy
 from src.infrastructure.persistence.models.account import Account
 from src.infrastructure.persistence.models.payment import Payment
+from src.infrastructure.persistence.models.job import Job
+from src.infrastructure.persistence.models.outbox_event import OutboxEvent
+from src.infrastructure.persistence.models.payment_daily_rollup import PaymentDailyRollup
+from src.infrastructure.persistence.payment_rollup_triggers import register_payment_rollup_triggers
+from src.computer_components.effective_price_triggers import register_effective_price_triggers
+from src.computer_components.rating_summary_triggers import register_rating_summary_triggers
+from src.inventories.partitions import register_inventory_partitions
+from src.document_numbers.sequences import register_document_sequences
 
 class User(Base):
     __tablename__ = "users"
@@ -80,6 +88,37 @@ class ComputerComponentReview(Base):
         "ComputerComponent", back_populates="computer_component_reviews"
     )
 
+class ComputerComponentRatingSummary(Base):
+    __tablename__ = "computer_component_rating_summaries"
+
+    # Maintained by triggers on computer_component_reviews, see rating_summary_triggers.py
+    component_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey('computer_components.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+    review_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    rating_sum: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    rating_1_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    rating_2_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    rating_3_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    rating_4_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    rating_5_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+
+    @property
+    def avg_rating(self) -> float:
+        return (self.rating_sum / self.review_count) if self.review_count else 0.0
+
+    @property
+    def rating_histogram(self) -> dict:
+        return {
+            1: self.rating_1_count,
+            2: self.rating_2_count,
+            3: self.rating_3_count,
+            4: self.rating_4_count,
+            5: self.rating_5_count
+        }
+
 class ComputerComponentSellPriceSetting(Base):
     __tablename__ = "computer_component_sell_price_settings"
 
@@ -101,6 +140,22 @@ class ComputerComponentSellPriceSetting(Base):
         "ComputerComponent", back_populates="computer_component_sell_price_settings"
     )
 
+class ComputerComponentEffectivePrice(Base):
+    __tablename__ = "computer_component_effective_prices"
+
+    # Maintained by triggers on computer_component_sell_price_settings, see effective_price_triggers.py
+    component_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey('computer_components.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+    day_type: Mapped[int] = mapped_column(Integer, primary_key=True)  # 1-7 (Mon-Sun)
+    price_per_unit: Mapped[Decimal] = mapped_column(Numeric(20, 6), nullable=False)
+
+    __table_args__ = (
+        Index('ix_effective_prices_day_type_price', 'day_type', 'price_per_unit', 'component_id'),
+    )
+
 class ComputerComponentCategory(Base):
     __tablename__ = "computer_component_categories"
 
@@ -180,6 +235,10 @@ class PurchaseInvoice(Base):
         cascade="all, delete-orphan"
     )
 
+    __table_args__ = (
+        Index('ix_purchase_invoices_deleted_invoice_date', 'deleted', 'invoice_date'),
+    )
+
 class PurchaseInvoiceLine(Base):
     __tablename__ = "purchase_invoice_lines"
 
@@ -226,6 +285,10 @@ class PurchaseInvoiceLine(Base):
         back_populates="purchase_invoice_lines"
     )
 
+    __table_args__ = (
+        Index('ix_purchase_invoice_lines_purchase_invoice_id', 'purchase_invoice_id'),
+    )
+
 class InboundDelivery(Base):
     __tablename__ = "inbound_deliveries"
 
@@ -324,6 +387,10 @@ class InboundDeliveryLine(Base):
         back_populates="inbound_delivery_lines"
     )
 
+    __table_args__ = (
+        Index('ix_inbound_delivery_lines_purchase_invoice_line_id', 'purchase_invoice_line_id'),
+    )
+
 class InboundDeliveryAttachment(Base):
     __tablename__ = "inbound_delivery_attachments"
 
@@ -356,14 +423,15 @@ class InboundDeliveryAttachment(Base):
 class Inventory(Base):
     __tablename__ = "inventories"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # Partitioned by stock_date, which therefore is part of the primary key, see partitions.py
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     in_stock: Mapped[Decimal] = mapped_column(
         Numeric(20, 6), nullable=True
     )
     out_stock: Mapped[Decimal] = mapped_column(
         Numeric(20, 6), nullable=True
     )
-    stock_date: Mapped[date] = mapped_column(Date, nullable=False)
+    stock_date: Mapped[date] = mapped_column(Date, primary_key=True, nullable=False)
     component_id: Mapped[int] = mapped_column(
         ForeignKey("computer_components.id"),
         nullable=False
@@ -388,34 +456,42 @@ class Inventory(Base):
 
     __table_args__ = (
         Index('ix_resource_type_id', 'resource_type', 'resource_id'),
+        Index('ix_inventories_component_id_stock_date', 'component_id', 'stock_date'),
+        { 'postgresql_partition_by': 'RANGE (stock_date)' },
     )
 
     @property
     def resource(self):
-        if self.resource_type == 'InboundDelivery':
-            return object_session(self).get(InboundDelivery, self.resource_id)
-        return None
+        # InventoryResourceLoaderService fills these in bulk, single rows fall back to one lookup each
+        if hasattr(self, '_preloaded_resource'):
+            return self._preloaded_resource
+
+        model = INVENTORY_RESOURCE_MODELS.get(self.resource_type)
+        return object_session(self).get(model, self.resource_id) if model else None
     
     @property
     def transaction_no(self):
+        resource = self.resource
         if self.resource_type == 'InboundDelivery':
-            return object_session(self).get(InboundDelivery, self.resource_id).inbound_delivery_no
+            return resource.inbound_delivery_no
         elif self.resource_type == 'SalesDelivery':
-            return object_session(self).get(SalesDelivery, self.resource_id).sales_delivery_no
+            return resource.sales_delivery_no
         
         return None
     
     @property
     def received_by(self):
         if self.resource_type == 'InboundDelivery':
-            return object_session(self).get(InboundDelivery, self.resource_id).received_by
+            return self.resource.received_by
         return ""
 
     @property
     def resource_line(self):
-        if self.resource_line_type == 'InboundDeliveryLine':
-            return object_session(self).get(InboundDeliveryLine, self.resource_line_id)
-        return None
+        if hasattr(self, '_preloaded_resource_line'):
+            return self._preloaded_resource_line
+
+        model = INVENTORY_RESOURCE_LINE_MODELS.get(self.resource_line_type)
+        return object_session(self).get(model, self.resource_line_id) if model else None
 
 class CartLine(Base):
     __tablename__ = "cart_lines"
@@ -566,6 +642,12 @@ class SalesInvoice(Base):
     )
     sales_delivery: Mapped["SalesDelivery"] = relationship(back_populates="sales_invoice")
 
+    __table_args__ = (
+        Index('ix_sales_invoices_customer_id_status', 'customer_id', 'status'),
+        # The sales delivery scheduler only ever looks for the few invoices still pending
+        Index('ix_sales_invoices_pending', 'id', postgresql_where=text('status = 0')),
+    )
+
 class SalesInvoiceLine(Base):
     __tablename__ = "sales_invoice_lines"
 
@@ -598,6 +680,10 @@ class SalesInvoiceLine(Base):
         back_populates="sales_invoice_lines"
     )
 
+    __table_args__ = (
+        Index('ix_sales_invoice_lines_sales_invoice_id', 'sales_invoice_id'),
+    )
+
 class SalesDelivery(Base):
     __tablename__ = "sales_deliveries"
 
@@ -643,3 +729,19 @@ class SalesDeliveryLine(Base):
     sales_delivery: Mapped["SalesDelivery"] = relationship(
         back_populates="sales_delivery_lines"
     )
+
+INVENTORY_RESOURCE_MODELS = {
+    'InboundDelivery': InboundDelivery,
+    'SalesDelivery': SalesDelivery
+}
+
+INVENTORY_RESOURCE_LINE_MODELS = {
+    'InboundDeliveryLine': InboundDeliveryLine,
+    'SalesDeliveryLine': SalesDeliveryLine
+}
+
+register_effective_price_triggers(Base.metadata)
+register_rating_summary_triggers(Base.metadata)
+register_payment_rollup_triggers(Base.metadata)
+register_inventory_partitions(Base.metadata)
+register_document_sequences(Base.metadata)
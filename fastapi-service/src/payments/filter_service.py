@@ -1,5 +1,5 @@
 from src.infrastructure.persistence.models.payment import Payment
-from sqlalchemy import desc
+from src.report.paging_service import ( PagingService, KeysetPage )
 from sqlalchemy.orm import Session
 
 class FilterService:
@@ -8,21 +8,24 @@ class FilterService:
         *,
         db: Session,
         page,
-        item_per_page
+        item_per_page,
+        cursor=None
     ):
         self.db = db
         self.page = int(page or 1)
         self.item_per_page = item_per_page or 50
-        self.offset = (self.page - 1) * self.item_per_page
+        self.cursor = cursor or None
 
-    def call(self):
-        data = (
-            self.db
-                .query(Payment)
-                .order_by(desc(Payment.id))
-                .offset(self.offset)
-                .limit(self.item_per_page)
-                .all()
+    def call(self) -> KeysetPage:
+        """Newest first. With a cursor the page continues after the last id seen, which stays
+        an index range scan however deep the client pages"""
+        paging_service = PagingService(self.db)
+        return paging_service.paginate(
+            self.db.query(Payment),
+            keys=[Payment.id],
+            cursor_values=lambda payment: [payment.id],
+            page=self.page,
+            item_per_page=self.item_per_page,
+            cursor=self.cursor,
+            descending=True
         )
-
-        return data
\ No newline at end of file
@@ -0,0 +1,50 @@
+from src.infrastructure.persistence.models.payment_daily_rollup import PaymentDailyRollup
+from src.domain.payment.value_objects.currency import CurrencyEnum
+from src.domain.payment.value_objects.payment_method import PaymentMethod
+from sqlalchemy.orm import Session
+
+class RollupService:
+    """Reads the trigger maintained payment_daily_rollups, never the payments themselves"""
+    def __init__(
+        self,
+        *,
+        db: Session,
+        start_date=None,
+        end_date=None,
+        currency=None,
+        payment_method=None
+    ):
+        self.db = db
+        self.start_date = start_date
+        self.end_date = end_date
+        self.currency = CurrencyEnum.from_value(currency) if currency is not None else None
+        self.payment_method = PaymentMethod.from_value(payment_method) if payment_method is not None else None
+
+    def call(self) -> list:
+        query = self.db.query(PaymentDailyRollup)
+
+        if self.start_date:
+            query = query.filter(PaymentDailyRollup.day >= self.start_date)
+        if self.end_date:
+            query = query.filter(PaymentDailyRollup.day <= self.end_date)
+        if self.currency is not None:
+            query = query.filter(PaymentDailyRollup.currency == self.currency.value)
+        if self.payment_method is not None:
+            query = query.filter(PaymentDailyRollup.payment_method == self.payment_method.value)
+
+        rollups = query.order_by(
+            PaymentDailyRollup.day.desc(),
+            PaymentDailyRollup.currency,
+            PaymentDailyRollup.payment_method
+        ).all()
+
+        return [
+            {
+                'day': rollup.day,
+                'currency': CurrencyEnum(rollup.currency).name,
+                'payment_method': PaymentMethod(rollup.payment_method).name,
+                'payment_count': rollup.payment_count,
+                'amount': rollup.amount
+            }
+            for rollup in rollups
+        ]
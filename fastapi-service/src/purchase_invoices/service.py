@@ -1,8 +1,9 @@
 from src.models import ( PurchaseInvoice, InboundDelivery )
 from sqlalchemy.orm import joinedload, Session
 from sqlalchemy import ( event, desc, text )
-import re
 from src.schemas import ( PurchaseInvoiceStatusEnum )
+from src.document_numbers.numbering_service import NumberingService
+from src.document_numbers.sequences import PURCHASE_INVOICE_NO
 
 class Service:
     def __init__(self, db: Session):
@@ -12,24 +13,7 @@ class Service:
         if invoice.purchase_invoice_no is not None:
             return invoice
         
-        last_no = self.db.execute(text(
-                "SELECT purchase_invoice_no " \
-                "FROM purchase_invoices " \
-                "ORDER BY id DESC LIMIT 1 " \
-                "FOR UPDATE"
-            )).first()
-        
-        if last_no and last_no[0]:
-            match = re.search(r"BUY-(\d+)", last_no[0])
-            if match:
-                last_number = int(match.group(1))
-                next_number = last_number + 1
-            else:
-                next_number = 1
-        else:
-            next_number = 1
-
-        invoice.purchase_invoice_no = f"BUY-{next_number:07d}"
+        invoice.purchase_invoice_no = NumberingService(self.db).next_number(PURCHASE_INVOICE_NO)
         return invoice
     
     def calculate_sum_total_line_amounts(self, invoice: PurchaseInvoice):
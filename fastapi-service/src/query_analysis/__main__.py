@@ -0,0 +1,34 @@
+"""Times the purchase invoice report query strategies against the configured database.
+
+    python -m src.query_analysis --data-counts 100000 500000 1000000 --runs 5
+"""
+from src.database import SessionLocal
+from src.query_analysis.benchmark_service import ( BenchmarkService, DEFAULT_DATA_COUNTS )
+import argparse
+import json
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the purchase invoice report query strategies")
+    parser.add_argument('--data-counts', type=int, nargs='+', default=DEFAULT_DATA_COUNTS)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--item-per-page', type=int, default=5)
+    parser.add_argument('--reset', action='store_true', help="drop and reseed the benchmark schema first")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        benchmark_service = BenchmarkService(db, runs=args.runs, item_per_page=args.item_per_page, reset=args.reset)
+        for data_point in benchmark_service.call(args.data_counts):
+            print(f"{data_point['data_count']:>9} invoices")
+            for strategy in data_point['strategies']:
+                print(
+                    f"  {strategy['name']:<22} median {strategy['median_seconds'] * 1000:>10.2f} ms  "
+                    f"rows {strategy['row_count']:>3}  plan {strategy['plan']['node_type']} "
+                    f"({', '.join(strategy['plan']['node_types'])})"
+                )
+            print(json.dumps(data_point, default=str))
+    finally:
+        db.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from src.query_analysis.seed_service import ( SeedService, BENCHMARK_SCHEMA )
+from typing import List
+import statistics
+import time
+
+DEFAULT_DATA_COUNTS = [100000, 200000, 300000, 400000, 500000, 600000, 700000, 800000, 900000, 1000000]
+
+INVOICE_COLUMNS = (
+    "pi.id, pi.purchase_invoice_no, pi.invoice_date, pi.supplier_name, pi.status, "
+    "pi.sum_total_line_amounts, pi.created_at"
+)
+
+class BenchmarkCase:
+    """One report page in the middle of the data set, as seen by every strategy"""
+    def __init__(self, *, schema, offset, item_per_page, cursor_created_at, cursor_id):
+        self.invoices_table = f"{schema}.purchase_invoices"
+        self.lines_table = f"{schema}.purchase_invoice_lines"
+        self.offset = offset
+        self.limit = item_per_page + 1
+        self.cursor_created_at = cursor_created_at
+        self.cursor_id = cursor_id
+
+class IdPrefetchOffsetStrategy:
+    """The original report query: every matching id pulled into Python, re-queried with IN and OFFSET"""
+    name = 'id_prefetch_offset'
+
+    def ids_sql(self, case):
+        return (
+            f"SELECT DISTINCT pi.id FROM {case.invoices_table} pi "
+            f"JOIN {case.lines_table} pil ON pil.purchase_invoice_id = pi.id "
+            "WHERE pi.deleted = FALSE"
+        )
+
+    def execute(self, db: Session, case: BenchmarkCase):
+        invoice_ids = db.execute(text(self.ids_sql(case))).scalars().all()
+        return db.execute(text(
+            f"SELECT {INVOICE_COLUMNS} FROM {case.invoices_table} pi "
+            "WHERE pi.id = ANY(:invoice_ids) "
+            "ORDER BY pi.created_at DESC, pi.id DESC OFFSET :offset LIMIT :limit"
+        ), { 'invoice_ids': invoice_ids, 'offset': case.offset, 'limit': case.limit }).all()
+
+    def explain_statement(self, case):
+        return self.ids_sql(case), {}
+
+class SingleQueryOffsetStrategy:
+    """One filtered query with EXISTS for the line filters, paginated with OFFSET"""
+    name = 'single_query_offset'
+
+    def sql(self, case):
+        return (
+            f"SELECT {INVOICE_COLUMNS} FROM {case.invoices_table} pi "
+            "WHERE pi.deleted = FALSE "
+            f"AND EXISTS (SELECT 1 FROM {case.lines_table} pil WHERE pil.purchase_invoice_id = pi.id) "
+            "ORDER BY pi.created_at DESC, pi.id DESC OFFSET :offset LIMIT :limit"
+        )
+
+    def params(self, case):
+        return { 'offset': case.offset, 'limit': case.limit }
+
+    def execute(self, db: Session, case: BenchmarkCase):
+        return db.execute(text(self.sql(case)), self.params(case)).all()
+
+    def explain_statement(self, case):
+        return self.sql(case), self.params(case)
+
+class KeysetStrategy:
+    """The same query continuing after a (created_at, id) cursor, as PagingService.paginate does"""
+    name = 'keyset'
+
+    def sql(self, case):
+        return (
+            f"SELECT {INVOICE_COLUMNS} FROM {case.invoices_table} pi "
+            "WHERE pi.deleted = FALSE "
+            f"AND EXISTS (SELECT 1 FROM {case.lines_table} pil WHERE pil.purchase_invoice_id = pi.id) "
+            "AND (pi.created_at, pi.id) < (:cursor_created_at, :cursor_id) "
+            "ORDER BY pi.created_at DESC, pi.id DESC LIMIT :limit"
+        )
+
+    def params(self, case):
+        return {
+            'cursor_created_at': case.cursor_created_at,
+            'cursor_id': case.cursor_id,
+            'limit': case.limit
+        }
+
+    def execute(self, db: Session, case: BenchmarkCase):
+        return db.execute(text(self.sql(case)), self.params(case)).all()
+
+    def explain_statement(self, case):
+        return self.sql(case), self.params(case)
+
+# Order matters: the first three fill query_time1..3 of the response
+STRATEGIES = [IdPrefetchOffsetStrategy(), SingleQueryOffsetStrategy(), KeysetStrategy()]
+
+class BenchmarkService:
+    def __init__(self, db: Session, *, runs: int = 3, item_per_page: int = 5, schema: str = BENCHMARK_SCHEMA, reset: bool = False):
+        self.db = db
+        self.runs = runs
+        self.item_per_page = item_per_page
+        self.schema = schema
+        self.reset = reset
+
+    def call(self, data_counts: List[int]) -> List[dict]:
+        seed_service = SeedService(self.db, schema=self.schema)
+        result = []
+
+        for index, data_count in enumerate(sorted(data_counts)):
+            seed_service.call(data_count, reset=(self.reset and index == 0))
+            case = self.build_case(data_count)
+            measurements = [self.measure(strategy, case) for strategy in STRATEGIES]
+
+            result.append({
+                'data_count': data_count,
+                'query_time1': measurements[0]['median_seconds'],
+                'query_time2': measurements[1]['median_seconds'],
+                'query_time3': measurements[2]['median_seconds'],
+                'strategies': measurements
+            })
+
+        return result
+
+    def build_case(self, data_count: int) -> BenchmarkCase:
+        # Middle of the report: deep enough for OFFSET to hurt, the cursor row is the one just before the page
+        offset = (data_count // 2 // self.item_per_page) * self.item_per_page
+        cursor_row = self.db.execute(text(
+            f"SELECT pi.created_at, pi.id FROM {self.schema}.purchase_invoices pi "
+            "WHERE pi.deleted = FALSE "
+            f"AND EXISTS (SELECT 1 FROM {self.schema}.purchase_invoice_lines pil WHERE pil.purchase_invoice_id = pi.id) "
+            "ORDER BY pi.created_at DESC, pi.id DESC OFFSET :offset LIMIT 1"
+        ), { 'offset': max(offset - 1, 0) }).first()
+
+        return BenchmarkCase(
+            schema=self.schema,
+            offset=offset,
+            item_per_page=self.item_per_page,
+            cursor_created_at=cursor_row.created_at if cursor_row else None,
+            cursor_id=cursor_row.id if cursor_row else None
+        )
+
+    def measure(self, strategy, case: BenchmarkCase) -> dict:
+        timings = []
+        row_count = 0
+        for _ in range(self.runs):
+            started_at = time.perf_counter()
+            rows = strategy.execute(self.db, case)
+            timings.append(time.perf_counter() - started_at)
+            row_count = len(rows)
+
+        return {
+            'name': strategy.name,
+            'median_seconds': round(statistics.median(timings), 6),
+            'min_seconds': round(min(timings), 6),
+            'max_seconds': round(max(timings), 6),
+            'row_count': row_count,
+            'plan': self.plan_summary(*strategy.explain_statement(case))
+        }
+
+    def plan_summary(self, sql, params) -> dict:
+        explained = self.db.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params).scalar()
+        plan = explained[0]['Plan']
+
+        return {
+            'node_type': plan['Node Type'],
+            'total_cost': plan['Total Cost'],
+            'plan_rows': plan['Plan Rows'],
+            'actual_rows': plan['Actual Rows'],
+            'execution_time_ms': explained[0]['Execution Time'],
+            'shared_hit_blocks': plan.get('Shared Hit Blocks', 0),
+            'shared_read_blocks': plan.get('Shared Read Blocks', 0),
+            'node_types': sorted(self.node_types(plan))
+        }
+
+    def node_types(self, plan) -> set:
+        node_types = { plan['Node Type'] }
+        for child in plan.get('Plans', []):
+            node_types |= self.node_types(child)
+        return node_types
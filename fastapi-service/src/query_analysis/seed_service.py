@@ -0,0 +1,88 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+
+# Benchmark rows live in their own schema, copied from the real tables (indexes included),
+# so seeding a million invoices never touches live data or its id sequences.
+BENCHMARK_SCHEMA = 'query_benchmark'
+LINES_PER_INVOICE = 3
+
+class SeedService:
+    def __init__(self, db: Session, *, schema: str = BENCHMARK_SCHEMA):
+        self.db = db
+        self.schema = schema
+
+    @property
+    def invoices_table(self) -> str:
+        return f"{self.schema}.purchase_invoices"
+
+    @property
+    def lines_table(self) -> str:
+        return f"{self.schema}.purchase_invoice_lines"
+
+    def call(self, data_count: int, *, reset: bool = False) -> int:
+        """Grows or shrinks the benchmark tables to exactly data_count invoices, reusing what is there"""
+        if reset:
+            self.db.execute(text(f"DROP SCHEMA IF EXISTS {self.schema} CASCADE"))
+        self.create_tables()
+
+        current_count = self.db.execute(text(f"SELECT COALESCE(MAX(id), 0) FROM {self.invoices_table}")).scalar()
+        if current_count < data_count:
+            self.insert_invoices(current_count + 1, data_count)
+        elif current_count > data_count:
+            self.db.execute(text(f"DELETE FROM {self.lines_table} WHERE purchase_invoice_id > :data_count"), { 'data_count': data_count })
+            self.db.execute(text(f"DELETE FROM {self.invoices_table} WHERE id > :data_count"), { 'data_count': data_count })
+
+        if current_count != data_count:
+            self.db.execute(text(f"ANALYZE {self.invoices_table}"))
+            self.db.execute(text(f"ANALYZE {self.lines_table}"))
+        self.db.commit()
+
+        return data_count
+
+    def create_tables(self):
+        self.db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {self.schema}"))
+        self.db.execute(text(f"CREATE TABLE IF NOT EXISTS {self.invoices_table} (LIKE purchase_invoices INCLUDING ALL)"))
+        self.db.execute(text(f"CREATE TABLE IF NOT EXISTS {self.lines_table} (LIKE purchase_invoice_lines INCLUDING ALL)"))
+
+    def insert_invoices(self, first_id: int, last_id: int):
+        # Ids are generated explicitly, the copied defaults would draw from the live sequences
+        self.db.execute(text(f"""
+            INSERT INTO {self.invoices_table} (
+                id, purchase_invoice_no, invoice_date, expected_delivery_date, notes, supplier_name,
+                status, sum_total_line_amounts, created_at, updated_at, deleted
+            )
+            SELECT
+                n,
+                'BENCH-' || lpad(n::text, 8, '0'),
+                timestamp '2020-01-01' + n * interval '97 seconds',
+                date '2020-01-08' + (n / 900),
+                'benchmark',
+                (ARRAY['Aftershock PC', 'Dynacore', 'Enter Komputer', 'Rakitan Jaya'])[1 + n % 4],
+                n % 4,
+                1400,
+                timestamp '2020-01-01' + n * interval '97 seconds',
+                timestamp '2020-01-01' + n * interval '97 seconds',
+                n % 50 = 0
+            FROM generate_series(CAST(:first_id AS integer), CAST(:last_id AS integer)) AS n
+        """), { 'first_id': first_id, 'last_id': last_id })
+
+        self.db.execute(text(f"""
+            INSERT INTO {self.lines_table} (
+                id, purchase_invoice_id, component_id, component_name, component_category_id,
+                component_category_name, quantity, price_per_unit, total_line_amount, created_at, updated_at
+            )
+            SELECT
+                (n - 1) * {LINES_PER_INVOICE} + k,
+                n,
+                1 + (n * k) % 200,
+                'Component ' || (1 + (n * k) % 200),
+                1 + (n + k) % 10,
+                'Category ' || (1 + (n + k) % 10),
+                k,
+                100 * k,
+                100 * k * k,
+                timestamp '2020-01-01' + n * interval '97 seconds',
+                timestamp '2020-01-01' + n * interval '97 seconds'
+            FROM generate_series(CAST(:first_id AS integer), CAST(:last_id AS integer)) AS n
+            CROSS JOIN generate_series(1, {LINES_PER_INVOICE}) AS k
+        """), { 'first_id': first_id, 'last_id': last_id })
@@ -0,0 +1,15 @@
+from decimal import Decimal
+
+# Report digests list this many entries per ranking, enough for the model to name the leaders
+TOP_LIMIT = 5
+# A value this many standard deviations above its group mean is reported as an outlier
+OUTLIER_Z_SCORE = 3
+
+def number(value):
+    """Compact JSON number: whole values as int, the rest rounded to 2 decimals"""
+    if value is None:
+        return None
+    value = Decimal(value)
+    if value == value.to_integral_value():
+        return int(value)
+    return float(round(value, 2))
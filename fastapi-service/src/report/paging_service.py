@@ -1,15 +1,31 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, Query
+from sqlalchemy import func, text, tuple_
+from sqlalchemy.dialects import postgresql
+from datetime import date, datetime
+from urllib.parse import urlencode
+import base64
+import json
+
+# Up to this many matches the count is exact, past it the planner estimate is used
+EXACT_COUNT_LIMIT = 10000
+
+class KeysetPage:
+    def __init__(self, *, items, has_next_page, next_cursor):
+        self.items = items
+        self.has_next_page = has_next_page
+        self.next_cursor = next_cursor
 
 class PagingService:
     def __init__(self, db: Session):
         self.db = db
 
-    def call(self, *, page, item_per_page, total_item, endpoint) -> dict:
+    def call(self, *, page, item_per_page, total_item, endpoint, has_next_page=None, next_cursor=None, params=None) -> dict:
         current_page = int(page)
-        has_next_page = (total_item > 0) and (total_item / (current_page * item_per_page) > 1)
+        if has_next_page is None:
+            has_next_page = (total_item > 0) and (total_item / (current_page * item_per_page) > 1)
         has_prev_page = (total_item > 0) and (current_page > 1)
-        next_page_url = (f"{endpoint}?page={current_page + 1}" if has_next_page else None)
-        prev_page_url = (f"{endpoint}?page={current_page - 1}" if has_prev_page else None)
+        next_page_url = (self.page_url(endpoint, params, page=current_page + 1, cursor=next_cursor) if has_next_page else None)
+        prev_page_url = (self.page_url(endpoint, params, page=current_page - 1) if has_prev_page else None)
 
         return {
                 'page': current_page,
@@ -18,4 +34,70 @@ class PagingService:
                     'prev_page_url': prev_page_url,
                     'next_page_url': next_page_url
                 }
-            }
\ No newline at end of file
+            }
+
+    def page_url(self, endpoint, params, *, page, cursor=None) -> str:
+        query_params = { key: value for key, value in (params or {}).items() if value not in (None, '') }
+        query_params['page'] = page
+        if cursor:
+            query_params['cursor'] = cursor
+
+        return f"{endpoint}?{urlencode(query_params)}"
+
+    def paginate(self, query: Query, *, keys, cursor_values, page, item_per_page, cursor=None, descending=False) -> KeysetPage:
+        """Orders by keys (the last one unique) and returns one page. With a cursor the page starts
+        right after the cursor row through an index-friendly row comparison, without one it falls
+        back to OFFSET so page numbers can still be jumped to directly."""
+        query = query.order_by(*[key.desc() if descending else key.asc() for key in keys])
+
+        if cursor:
+            position = tuple_(*keys)
+            after = tuple_(*decode_cursor(cursor, keys))
+            query = query.filter(position < after if descending else position > after)
+        else:
+            query = query.offset((int(page) - 1) * item_per_page)
+
+        rows = query.limit(item_per_page + 1).all()
+        has_next_page = len(rows) > item_per_page
+        items = rows[:item_per_page]
+        next_cursor = encode_cursor(cursor_values(items[-1])) if has_next_page else None
+
+        return KeysetPage(items=items, has_next_page=has_next_page, next_cursor=next_cursor)
+
+    def count(self, query: Query) -> int:
+        capped = query.order_by(None).limit(EXACT_COUNT_LIMIT + 1).subquery()
+        total_item = self.db.query(func.count()).select_from(capped).scalar()
+        if total_item <= EXACT_COUNT_LIMIT:
+            return total_item
+
+        return max(total_item, self.estimate(query))
+
+    def estimate(self, query: Query) -> int:
+        statement = query.order_by(None).statement.compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={ 'literal_binds': True }
+        )
+        plan = self.db.execute(text(f"EXPLAIN (FORMAT JSON) {statement}")).scalar()
+        return int(plan[0]['Plan']['Plan Rows'])
+
+def encode_cursor(values) -> str:
+    serialized = [value.isoformat() if isinstance(value, (date, datetime)) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(serialized).encode()).decode()
+
+def decode_cursor(cursor: str, keys) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except ValueError:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise ValueError("Invalid cursor")
+
+    decoded = []
+    for key, value in zip(keys, values):
+        python_type = key.type.python_type
+        if python_type in (date, datetime):
+            decoded.append(python_type.fromisoformat(value))
+        else:
+            decoded.append(python_type(value))
+
+    return decoded
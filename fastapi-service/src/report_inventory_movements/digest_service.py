@@ -0,0 +1,132 @@
+from src.models import ( Inventory, ComputerComponent, ComputerComponentCategory )
+from src.report_inventory_movements.filter_service import FilterService
+from src.report.digest import ( number, TOP_LIMIT, OUTLIER_Z_SCORE )
+from sqlalchemy.orm import Session
+from sqlalchemy import func, desc
+
+class DigestService:
+    """Condenses the filtered inventory movements into a few aggregates for the report analyzer.
+    Everything is computed in the database, so the size of the digest does not grow with the date range."""
+    def __init__(
+        self,
+        *,
+        db: Session,
+        start_date=None,
+        end_date=None,
+        component_name=None,
+        component_category_id=None,
+        transaction_type=None,
+        keyword=None):
+        self.db = db
+        self.filter_service = FilterService(
+            db=db,
+            start_date=start_date,
+            end_date=end_date,
+            page=1,
+            item_per_page=1,
+            component_name=component_name,
+            component_category_id=component_category_id,
+            transaction_type=transaction_type,
+            keyword=keyword
+        )
+
+    def call(self) -> dict:
+        return {
+            'totals': self.totals(),
+            'top_movers': self.top_movers(),
+            'category_trends': self.category_trends(),
+            'outliers': self.outliers()
+        }
+
+    def filtered(self, *columns):
+        return self.filter_service.filter_movements(self.filter_service.filter_components(
+            self.db.query(*columns).join(Inventory.component)
+        ))
+
+    def totals(self) -> dict:
+        row = self.filtered(
+            func.count(Inventory.id).label('movements'),
+            func.count(func.distinct(Inventory.component_id)).label('components'),
+            func.coalesce(func.sum(Inventory.in_stock), 0).label('total_in'),
+            func.coalesce(func.sum(Inventory.out_stock), 0).label('total_out'),
+            func.min(Inventory.stock_date).label('first_date'),
+            func.max(Inventory.stock_date).label('last_date')
+        ).one()
+
+        return {
+            'movements': row.movements,
+            'components': row.components,
+            'total_in': number(row.total_in),
+            'total_out': number(row.total_out),
+            'net': number(row.total_in - row.total_out),
+            'first_date': row.first_date.isoformat() if row.first_date else None,
+            'last_date': row.last_date.isoformat() if row.last_date else None
+        }
+
+    def top_movers(self) -> list:
+        total_in = func.coalesce(func.sum(Inventory.in_stock), 0)
+        total_out = func.coalesce(func.sum(Inventory.out_stock), 0)
+        rows = (
+            self.filtered(ComputerComponent.name, total_in.label('total_in'), total_out.label('total_out'))
+                .group_by(Inventory.component_id, ComputerComponent.name)
+                .order_by(desc(total_in + total_out), ComputerComponent.name)
+                .limit(TOP_LIMIT)
+                .all()
+        )
+
+        return [
+            { 'component': row.name, 'in': number(row.total_in), 'out': number(row.total_out), 'net': number(row.total_in - row.total_out) }
+            for row in rows
+        ]
+
+    def category_trends(self) -> dict:
+        month = func.to_char(func.date_trunc('month', Inventory.stock_date), 'YYYY-MM')
+        rows = (
+            self.filtered(
+                ComputerComponentCategory.name.label('category'),
+                month.label('month'),
+                func.coalesce(func.sum(Inventory.in_stock), 0).label('total_in'),
+                func.coalesce(func.sum(Inventory.out_stock), 0).label('total_out')
+            )
+                .join(ComputerComponent.component_category)
+                .group_by(ComputerComponentCategory.name, month)
+                .order_by(ComputerComponentCategory.name, month)
+                .all()
+        )
+
+        trends = {}
+        for row in rows:
+            trends.setdefault(row.category, []).append({ 'month': row.month, 'in': number(row.total_in), 'out': number(row.total_out) })
+        return trends
+
+    def outliers(self) -> list:
+        """Single movements far above what is usual for their component"""
+        quantity = func.coalesce(Inventory.in_stock, 0) + func.coalesce(Inventory.out_stock, 0)
+        movements = self.filtered(
+            Inventory.stock_date,
+            Inventory.resource_type,
+            ComputerComponent.name.label('component'),
+            quantity.label('quantity'),
+            func.avg(quantity).over(partition_by=Inventory.component_id).label('typical'),
+            func.stddev_pop(quantity).over(partition_by=Inventory.component_id).label('deviation')
+        ).subquery()
+
+        z_score = (movements.c.quantity - movements.c.typical) / func.nullif(movements.c.deviation, 0)
+        rows = (
+            self.db.query(movements, z_score.label('z_score'))
+                .filter(z_score >= OUTLIER_Z_SCORE)
+                .order_by(desc(z_score))
+                .limit(TOP_LIMIT)
+                .all()
+        )
+
+        return [
+            {
+                'date': row.stock_date.isoformat(),
+                'component': row.component,
+                'type': row.resource_type,
+                'quantity': number(row.quantity),
+                'typical': number(row.typical)
+            }
+            for row in rows
+        ]
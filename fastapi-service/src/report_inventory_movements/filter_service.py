@@ -1,7 +1,8 @@
 from src.models import ( Inventory, ComputerComponent, ComputerComponentCategory )
-from sqlalchemy.orm import joinedload, Session
-from sqlalchemy import ( event, desc, text )
-import re
+from sqlalchemy.orm import contains_eager, Session
+from sqlalchemy import func
+from src.inventories.resource_loader_service import InventoryResourceLoaderService
+from src.report.paging_service import ( PagingService, KeysetPage )
 from datetime import datetime
 
 class FilterService:
@@ -16,7 +17,8 @@ class FilterService:
         component_name,
         component_category_id,
         transaction_type,
-        keyword):
+        keyword,
+        cursor=None):
         self.db = db
         start_date = start_date or None
         start_date = datetime.strptime(start_date, "%Y-%m-%d").date() if start_date is not None else None
@@ -35,20 +37,81 @@ class FilterService:
 
         self.transaction_type = transaction_type or None
         self.keyword = keyword or None
+        self.cursor = cursor or None
 
-    def call(self):
-        query = (
-            self.db.query(Inventory.id)
+    def call(self) -> KeysetPage:
+        paging_service = PagingService(self.db)
+        page = paging_service.paginate(
+            self.report_query(),
+            keys=[
+                ComputerComponentCategory.name,
+                ComputerComponent.name,
+                Inventory.component_id,
+                Inventory.stock_date,
+                Inventory.created_at,
+                Inventory.id
+            ],
+            cursor_values=lambda row: [
+                row[0].component.component_category.name,
+                row[0].component.name,
+                row[0].component_id,
+                row[0].stock_date,
+                row[0].created_at,
+                row[0].id
+            ],
+            page=self.page,
+            item_per_page=self.item_per_page,
+            cursor=self.cursor
+        )
+        InventoryResourceLoaderService(self.db).call([inventory for inventory, _ in page.items])
+
+        return page
+
+    def report_query(self):
+        # Running stock per component, so every page and every date window starts from the real balance
+        # instead of zero. The window only reads the requested months (partitions outside the date range
+        # are pruned), everything before start_date is folded into one opening balance per component.
+        movement = func.coalesce(Inventory.in_stock, 0) - func.coalesce(Inventory.out_stock, 0)
+        running_stock = func.sum(movement).over(
+            partition_by=Inventory.component_id,
+            order_by=(Inventory.stock_date, Inventory.created_at, Inventory.id),
+            rows=(None, 0)
+        )
+
+        stock_movements = self.db.query(Inventory.id.label('inventory_id'), running_stock.label('running_stock'))
+        if self.start_date:
+            opening_balances = self.filter_components(
+                self.db.query(Inventory.component_id, func.sum(movement).label('balance'))
+                    .join(Inventory.component)
+                    .filter(Inventory.stock_date < self.start_date)
+                    .group_by(Inventory.component_id)
+            ).subquery()
+            stock_movements = (
+                self.db.query(
+                    Inventory.id.label('inventory_id'),
+                    (func.coalesce(opening_balances.c.balance, 0) + running_stock).label('running_stock')
+                )
+                .outerjoin(opening_balances, opening_balances.c.component_id == Inventory.component_id)
+            )
+        stock_movements = self.filter_stock_dates(self.filter_components(
+            stock_movements.join(Inventory.component)
+        )).subquery()
+
+        return self.filter_movements(
+            self.db.query(Inventory, stock_movements.c.running_stock)
+                .join(stock_movements, stock_movements.c.inventory_id == Inventory.id)
                 .join(Inventory.component)
                 .join(ComputerComponent.component_category)
+                .options(contains_eager(Inventory.component)
+                            .contains_eager(ComputerComponent.component_category))
         )
 
-        if self.start_date:
-            query = query.filter(Inventory.stock_date >= self.start_date)
-        if self.end_date:
-            query = query.filter(Inventory.stock_date <= self.end_date)
-        if self.transaction_type:
-            query = query.filter(Inventory.resource_type == self.transaction_type)
+    def filtered_query(self):
+        return self.filter_movements(self.filter_components(
+            self.db.query(Inventory.id).join(Inventory.component)
+        ))
+
+    def filter_components(self, query):
         if self.keyword:
             query = query.filter(ComputerComponent.name.ilike(f"%{self.keyword}%"))
         if self.component_name:
@@ -56,17 +119,20 @@ class FilterService:
         if self.component_category_id:
             query = query.filter(ComputerComponent.component_category_id == self.component_category_id)
 
-        inventory_ids = [id[0] for id in query.all()]
-        inventories = (
-            self.db.query(Inventory)
-                .join(Inventory.component)
-                .join(ComputerComponent.component_category)
-                .options(joinedload(Inventory.component)
-                            .subqueryload(ComputerComponent.component_category))
-                .filter(Inventory.id.in_(inventory_ids))
-                .order_by(ComputerComponentCategory.name, ComputerComponent.name, Inventory.stock_date, Inventory.created_at)
-                .offset((self.page - 1) * self.item_per_page)
-                .limit(self.item_per_page)
-        )
+        return query
+
+    def filter_stock_dates(self, query):
+        # Plain comparisons on the partition key, so the planner prunes the months outside the range
+        if self.start_date:
+            query = query.filter(Inventory.stock_date >= self.start_date)
+        if self.end_date:
+            query = query.filter(Inventory.stock_date <= self.end_date)
+
+        return query
+
+    def filter_movements(self, query):
+        query = self.filter_stock_dates(query)
+        if self.transaction_type:
+            query = query.filter(Inventory.resource_type == self.transaction_type)
 
-        return inventories
+        return query
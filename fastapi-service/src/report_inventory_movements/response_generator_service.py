@@ -4,27 +4,21 @@ from decimal import ROUND_HALF_UP, Decimal
 class ResponseGeneratorService:
     def call(self, inventories, component_name, component_category_id):
         result = []
-        current_component_id = None
-        total_per_component = 0
 
-        for inventory in inventories:
+        for inventory, running_stock in inventories:
             if component_name and (component_name.casefold() not in inventory.component.name.casefold()):
                 continue
             elif component_category_id and (int(component_category_id) != inventory.component.component_category_id):
                 continue
-            if current_component_id != inventory.component_id:
-                total_per_component = 0
-                current_component_id = inventory.component_id
-            row, total_per_component = self.build_row(inventory=inventory, total_per_component=total_per_component)
+            row = self.build_row(inventory=inventory, running_stock=running_stock)
             result.append(row)
 
         return result
     
-    def build_row(self, *, inventory, total_per_component):
+    def build_row(self, *, inventory, running_stock):
         in_stock = Decimal(inventory.in_stock or 0).quantize(Decimal('1'), rounding=ROUND_HALF_UP)
         out_stock = Decimal(inventory.out_stock or 0).quantize(Decimal('1'), rounding=ROUND_HALF_UP)
-        total_per_component = total_per_component + in_stock - out_stock
-        final_moving_stock = total_per_component
+        final_moving_stock = Decimal(running_stock or 0)
     
         buy_price = Decimal(inventory.buy_price or 0).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
 
@@ -45,4 +39,4 @@ class ResponseGeneratorService:
                 .build()
         )
 
-        return built_row, total_per_component
\ No newline at end of file
+        return built_row
\ No newline at end of file
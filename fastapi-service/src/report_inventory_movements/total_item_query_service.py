@@ -1,14 +1,10 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import ( text )
+from sqlalchemy.orm import Session, Query
+from src.report.paging_service import PagingService
 
 class TotalItemQueryService:
     def __init__(self, db: Session):
         self.db = db
 
-    def call(self) -> int:
-        query_total_item = self.db.execute(text(
-                "SELECT COUNT(*) " \
-                "FROM inventories i "
-            )).first()
-        total_item = query_total_item[0] if query_total_item else 0
-        return total_item
\ No newline at end of file
+    def call(self, filtered_query: Query) -> int:
+        paging_service = PagingService(self.db)
+        return paging_service.count(filtered_query)
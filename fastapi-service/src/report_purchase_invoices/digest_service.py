@@ -0,0 +1,152 @@
+from src.models import ( PurchaseInvoice, PurchaseInvoiceLine )
+from src.report_purchase_invoices.filter_service import FilterService
+from src.report.digest import ( number, TOP_LIMIT, OUTLIER_Z_SCORE )
+from src.schemas import PurchaseInvoiceStatusEnum
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import func, desc
+
+class DigestService:
+    """Condenses the filtered purchase invoices into a few aggregates for the report analyzer.
+    Everything is computed in the database, so the size of the digest does not grow with the date range."""
+    def __init__(
+        self,
+        *,
+        db: Session,
+        start_date=None,
+        end_date=None,
+        component_name=None,
+        component_category_id=None,
+        invoice_status=None,
+        keyword=None):
+        self.db = db
+        self.filter_service = FilterService(
+            db=db,
+            start_date=start_date,
+            end_date=end_date,
+            page=1,
+            item_per_page=1,
+            component_name=component_name,
+            component_category_id=component_category_id,
+            invoice_status=invoice_status,
+            keyword=keyword
+        )
+        # Aliased so the component filters' EXISTS on purchase_invoice_lines stays uncorrelated
+        self.line = aliased(PurchaseInvoiceLine, name='digest_lines')
+        self.filtered_invoices = self.invoices(PurchaseInvoice.id, PurchaseInvoice.invoice_date).subquery('filtered_invoices')
+
+    def call(self) -> dict:
+        return {
+            'totals': self.totals(),
+            'top_suppliers': self.top_suppliers(),
+            'top_components': self.top_components(),
+            'category_trends': self.category_trends(),
+            'outliers': self.outliers()
+        }
+
+    def invoices(self, *columns):
+        return self.filter_service.filtered_query().with_entities(*columns)
+
+    def lines(self, *columns):
+        return (
+            self.db.query(*columns)
+                .select_from(self.line)
+                .join(self.filtered_invoices, self.filtered_invoices.c.id == self.line.purchase_invoice_id)
+        )
+
+    def totals(self) -> dict:
+        row = self.invoices(
+            func.count(PurchaseInvoice.id).label('invoices'),
+            func.coalesce(func.sum(PurchaseInvoice.sum_total_line_amounts), 0).label('total_amount'),
+            func.avg(PurchaseInvoice.sum_total_line_amounts).label('average_amount'),
+            func.min(PurchaseInvoice.invoice_date).label('first_date'),
+            func.max(PurchaseInvoice.invoice_date).label('last_date')
+        ).one()
+        statuses = (
+            self.invoices(PurchaseInvoice.status, func.count(PurchaseInvoice.id))
+                .group_by(PurchaseInvoice.status)
+                .order_by(PurchaseInvoice.status)
+                .all()
+        )
+
+        return {
+            'invoices': row.invoices,
+            'total_amount': number(row.total_amount),
+            'average_amount': number(row.average_amount),
+            'first_date': row.first_date.date().isoformat() if row.first_date else None,
+            'last_date': row.last_date.date().isoformat() if row.last_date else None,
+            'by_status': { PurchaseInvoiceStatusEnum(status).name: count for status, count in statuses }
+        }
+
+    def top_suppliers(self) -> list:
+        amount = func.sum(PurchaseInvoice.sum_total_line_amounts)
+        rows = (
+            self.invoices(PurchaseInvoice.supplier_name, func.count(PurchaseInvoice.id).label('invoices'), amount.label('amount'))
+                .group_by(PurchaseInvoice.supplier_name)
+                .order_by(desc(amount), PurchaseInvoice.supplier_name)
+                .limit(TOP_LIMIT)
+                .all()
+        )
+
+        return [{ 'supplier': row.supplier_name, 'invoices': row.invoices, 'amount': number(row.amount) } for row in rows]
+
+    def top_components(self) -> list:
+        amount = func.sum(self.line.total_line_amount)
+        rows = (
+            self.lines(self.line.component_name, func.sum(self.line.quantity).label('quantity'), amount.label('amount'))
+                .group_by(self.line.component_name)
+                .order_by(desc(amount), self.line.component_name)
+                .limit(TOP_LIMIT)
+                .all()
+        )
+
+        return [{ 'component': row.component_name, 'quantity': number(row.quantity), 'amount': number(row.amount) } for row in rows]
+
+    def category_trends(self) -> dict:
+        month = func.to_char(func.date_trunc('month', self.filtered_invoices.c.invoice_date), 'YYYY-MM')
+        rows = (
+            self.lines(
+                self.line.component_category_name.label('category'),
+                month.label('month'),
+                func.sum(self.line.quantity).label('quantity'),
+                func.sum(self.line.total_line_amount).label('amount')
+            )
+                .group_by(self.line.component_category_name, month)
+                .order_by(self.line.component_category_name, month)
+                .all()
+        )
+
+        trends = {}
+        for row in rows:
+            trends.setdefault(row.category, []).append({ 'month': row.month, 'quantity': number(row.quantity), 'amount': number(row.amount) })
+        return trends
+
+    def outliers(self) -> list:
+        """Invoices far above the usual invoice amount of the filtered period"""
+        invoices = self.invoices(
+            PurchaseInvoice.purchase_invoice_no,
+            PurchaseInvoice.invoice_date,
+            PurchaseInvoice.supplier_name,
+            PurchaseInvoice.sum_total_line_amounts.label('amount'),
+            func.avg(PurchaseInvoice.sum_total_line_amounts).over().label('typical'),
+            func.stddev_pop(PurchaseInvoice.sum_total_line_amounts).over().label('deviation')
+        ).subquery()
+
+        z_score = (invoices.c.amount - invoices.c.typical) / func.nullif(invoices.c.deviation, 0)
+        rows = (
+            self.db.query(invoices, z_score.label('z_score'))
+                .filter(z_score >= OUTLIER_Z_SCORE)
+                .order_by(desc(z_score))
+                .limit(TOP_LIMIT)
+                .all()
+        )
+
+        return [
+            {
+                'invoice': row.purchase_invoice_no,
+                'date': row.invoice_date.date().isoformat(),
+                'supplier': row.supplier_name,
+                'amount': number(row.amount),
+                'typical': number(row.typical)
+            }
+            for row in rows
+        ]
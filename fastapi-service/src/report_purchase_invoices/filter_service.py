@@ -1,7 +1,7 @@
-from src.models import ( PurchaseInvoice, PurchaseInvoiceLine, InboundDelivery, InboundDeliveryLine )
-from sqlalchemy.orm import joinedload, Session
-from sqlalchemy import ( event, desc, text )
-import re
+from src.models import ( PurchaseInvoice, PurchaseInvoiceLine, InboundDeliveryLine )
+from sqlalchemy.orm import selectinload, Session
+from sqlalchemy import and_
+from src.report.paging_service import ( PagingService, KeysetPage )
 from datetime import datetime
 
 class FilterService:
@@ -16,7 +16,8 @@ class FilterService:
         component_name,
         component_category_id,
         invoice_status,
-        keyword):
+        keyword,
+        cursor=None):
         self.db = db
         start_date = start_date or None
         start_date = datetime.strptime(start_date, "%Y-%m-%d").date() if start_date is not None else None
@@ -37,11 +38,30 @@ class FilterService:
         invoice_status = int(invoice_status) if invoice_status is not None else None
         self.invoice_status = invoice_status
         self.keyword = keyword or None
+        self.cursor = cursor or None
 
-    def call(self):
+    def call(self) -> KeysetPage:
         query = (
-            self.db.query(PurchaseInvoice.id)
-                .join(PurchaseInvoice.purchase_invoice_lines)
+            self.filtered_query()
+                .options(selectinload(PurchaseInvoice.purchase_invoice_lines)
+                            .selectinload(PurchaseInvoiceLine.inbound_delivery_lines)
+                            .selectinload(InboundDeliveryLine.inbound_delivery))
+        )
+
+        paging_service = PagingService(self.db)
+        return paging_service.paginate(
+            query,
+            keys=[PurchaseInvoice.created_at, PurchaseInvoice.id],
+            cursor_values=lambda invoice: [invoice.created_at, invoice.id],
+            page=self.page,
+            item_per_page=self.item_per_page,
+            cursor=self.cursor,
+            descending=True
+        )
+
+    def filtered_query(self):
+        query = (
+            self.db.query(PurchaseInvoice)
                 .filter(PurchaseInvoice.deleted == False)
         )
 
@@ -53,21 +73,14 @@ class FilterService:
             query = query.filter(PurchaseInvoice.status == self.invoice_status)
         if self.keyword:
             query = query.filter((PurchaseInvoice.purchase_invoice_no.ilike(f"%{self.keyword}%")))
+
+        # Line filters go through EXISTS so an invoice matching on several lines is still one row
+        line_filters = []
         if self.component_name:
-            query = query.filter(PurchaseInvoiceLine.component_name.ilike(f"%{self.component_name}%"))
+            line_filters.append(PurchaseInvoiceLine.component_name.ilike(f"%{self.component_name}%"))
         if self.component_category_id:
-            query = query.filter(PurchaseInvoiceLine.component_category_id == self.component_category_id)
-
-        invoice_ids = [id[0] for id in query.distinct().limit(100).all()]
-        purchase_invoices = (
-            self.db.query(PurchaseInvoice)
-                .options(joinedload(PurchaseInvoice.purchase_invoice_lines)
-                            .subqueryload(PurchaseInvoiceLine.inbound_delivery_lines)
-                            .subqueryload(InboundDeliveryLine.inbound_delivery))
-                .filter(PurchaseInvoice.id.in_(invoice_ids))
-                .order_by(desc(PurchaseInvoice.created_at))
-                .offset((self.page - 1) * self.item_per_page)
-                .limit(self.item_per_page)
-        )
+            line_filters.append(PurchaseInvoiceLine.component_category_id == self.component_category_id)
+        if line_filters:
+            query = query.filter(PurchaseInvoice.purchase_invoice_lines.any(and_(*line_filters)))
 
-        return purchase_invoices
+        return query
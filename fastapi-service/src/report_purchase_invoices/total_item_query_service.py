@@ -1,19 +1,10 @@
-from src.models import ( PurchaseInvoice, PurchaseInvoiceLine, InboundDelivery, InboundDeliveryLine )
-from sqlalchemy.orm import joinedload, Session
-from sqlalchemy import ( event, desc, text )
-import re
-from src.schemas import ( PurchaseInvoiceStatusEnum )
-from datetime import datetime
+from sqlalchemy.orm import Session, Query
+from src.report.paging_service import PagingService
 
 class TotalItemQueryService:
     def __init__(self, db: Session):
         self.db = db
 
-    def call(self) -> int:
-        query_total_item = self.db.execute(text(
-                "SELECT COUNT(*) " \
-                "FROM purchase_invoices pi " \
-                "WHERE pi.deleted = FALSE"
-            )).first()
-        total_item = query_total_item[0] if query_total_item else 0
-        return total_item
\ No newline at end of file
+    def call(self, filtered_query: Query) -> int:
+        paging_service = PagingService(self.db)
+        return paging_service.count(filtered_query)
@@ -1,31 +1,40 @@
 from src.models import ( SalesInvoice, SalesDelivery, SalesDeliveryLine )
-from sqlalchemy.orm import joinedload, Session
+from sqlalchemy.orm import selectinload, Session
 from src.sales_deliveries.service import Service
-from datetime import datetime
 from src.schemas import (SalesInvoiceStatusEnum, SalesDeliveryStatusEnum)
 from typing import List
 
+# Invoices claimed per transaction, so one run never holds locks on the whole backlog
+BATCH_SIZE = 100
+
 class CreateService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, batch_size: int = BATCH_SIZE):
         self.db = db
+        self.batch_size = batch_size
 
-    # TODO: Possibility of later scheduler run in parallel with its previous scheduler, need to ensure later scheduler WAITS previous.
-    def call(self):
-        print(f"<<< Performing scheduled SalesDeliveryCreateService at: {datetime.now()}")
-
+    def call(self) -> int:
+        """Creates the deliveries of one batch of pending invoices and returns how many it handled.
+        Invoices another worker has claimed are skipped rather than waited for."""
         pending_invoices = (
-            self.db.query(SalesInvoice).options(joinedload(SalesInvoice.sales_invoice_lines))
+            self.db.query(SalesInvoice).options(selectinload(SalesInvoice.sales_invoice_lines))
                 .filter(SalesInvoice.status == SalesInvoiceStatusEnum(0).value)
+                .order_by(SalesInvoice.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True, of=SalesInvoice)
                 .all()
         )
+        if not pending_invoices:
+            self.db.commit()
+            return 0
+
         self.create_deliveries(pending_invoices)
+        return len(pending_invoices)
 
     def create_deliveries(self, pending_invoices: List[SalesInvoice]) -> None:
         new_deliveries = []
         updated_invoices = []
 
         service = Service(self.db)
-        service.generate_latest_sales_delivery_no()
 
         for source in pending_invoices:
             new_delivery = SalesDelivery(
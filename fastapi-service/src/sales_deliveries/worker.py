@@ -0,0 +1,40 @@
+from src.sales_deliveries.create_service import ( CreateService, BATCH_SIZE )
+from sqlalchemy.orm import Session
+from typing import Callable
+import logging
+
+logger = logging.getLogger(__name__)
+
+# A full batch is followed straight away by the next one, up to this many per run
+MAX_BATCHES_PER_RUN = 50
+
+class SalesDeliveryWorker:
+    """Turns pending sales invoices into deliveries, one batch and one session per transaction.
+    Batches are claimed with SKIP LOCKED, so any number of workers can run side by side."""
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        *,
+        batch_size: int = BATCH_SIZE,
+        max_batches: int = MAX_BATCHES_PER_RUN
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+
+    def run(self) -> int:
+        """Blocking, run it in a thread from async code. Returns how many invoices were handled"""
+        handled = 0
+        for _ in range(self.max_batches):
+            with self.session_factory() as session:
+                try:
+                    claimed = CreateService(session, self.batch_size).call()
+                except Exception:
+                    session.rollback()
+                    logger.exception("Sales delivery batch failed")
+                    raise
+            handled += claimed
+            if claimed < self.batch_size:
+                break
+
+        return handled
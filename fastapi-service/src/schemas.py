@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, field_validator, model_validator, model_serializer, ConfigDict
 from typing import (Dict, List, Optional, Union)
-from datetime import datetime
+from datetime import datetime, date
 from decimal import Decimal, ROUND_DOWN
 from enum import Enum, IntEnum
 from dateutil import parser
@@ -617,18 +617,94 @@ class UserParams(BaseModel):
                 values["role"] = f"UNKNOWN({role})"
         return values
     
+class ReportDigestTypeEnum(str, Enum):
+    INVENTORY_MOVEMENT = 'inventory_movement'
+    PURCHASE_INVOICE = 'purchase_invoice'
+
+class ReportDigestFilters(BaseModel):
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    component_name: Optional[str] = None
+    component_category_id: Optional[int] = None
+    transaction_type: Optional[str] = None
+    invoice_status: Optional[PurchaseInvoiceStatusEnum] = None
+    keyword: Optional[str] = None
+
 class ReportAnalyzerParams(BaseModel):
-    user_input: str
+    # Either pasted report output, or a report plus filters to digest server-side (user_input is then the question)
+    user_input: Optional[str] = None
+    report: Optional[ReportDigestTypeEnum] = None
+    filters: ReportDigestFilters = Field(default_factory=ReportDigestFilters)
+
+    @model_validator(mode='after')
+    def check_input(self):
+        if self.report is None and not (self.user_input or '').strip():
+            raise ValueError("user_input is required when no report is given")
+        return self
 
 class ReportAnalyzerResponse(BaseModel):
     chatgpt_response: str
+    cached: bool = False
+
+class QueryPlanSummary(BaseModel):
+    node_type: str
+    total_cost: float
+    plan_rows: int
+    actual_rows: int
+    execution_time_ms: float
+    shared_hit_blocks: int
+    shared_read_blocks: int
+    node_types: List[str]
+
+class QueryStrategyMeasurement(BaseModel):
+    name: str
+    median_seconds: Decimal
+    min_seconds: Decimal
+    max_seconds: Decimal
+    row_count: int
+    plan: QueryPlanSummary
 
 class DataPoints(BaseModel):
     data_count: int
     query_time1: Decimal
     query_time2: Decimal
     query_time3: Decimal
+    strategies: List[QueryStrategyMeasurement] = []
 
 class PurchaseInvoicesQueryAnalysis(BaseModel):
     message: str
-    data: List[DataPoints]
\ No newline at end of file
+    data: List[DataPoints]
+class BulkDataParams(BaseModel):
+    seed: Optional[int] = None
+    history_days: int = Field(365, ge=1)
+    component_popularity_skew: float = Field(1.1, ge=0)
+    users: int = Field(1000, ge=0)
+    component_categories: int = Field(10, ge=1)
+    computer_components: int = Field(500, ge=1)
+    weekday_price_ratio: float = Field(0.3, ge=0, le=1)
+    reviews_per_component: float = Field(5, ge=0)
+    purchase_invoices: int = Field(10000, ge=0)
+    lines_per_purchase_invoice_min: int = Field(1, ge=1)
+    lines_per_purchase_invoice_max: int = Field(5, ge=1)
+    inbound_delivery_ratio: float = Field(0.8, ge=0, le=1)
+    damaged_ratio: float = Field(0.02, ge=0, le=1)
+    attachment_ratio: float = Field(0.5, ge=0, le=1)
+    sales_invoices: int = Field(5000, ge=0)
+    lines_per_sales_invoice_min: int = Field(1, ge=1)
+    lines_per_sales_invoice_max: int = Field(4, ge=1)
+    sales_delivery_ratio: float = Field(0.7, ge=0, le=1)
+    cart_lines: int = Field(1000, ge=0)
+    payments: int = Field(10000, ge=0)
+
+    @model_validator(mode='after')
+    def check_line_ranges(self):
+        if self.lines_per_purchase_invoice_min > self.lines_per_purchase_invoice_max:
+            raise ValueError("lines_per_purchase_invoice_min cannot be greater than lines_per_purchase_invoice_max")
+        if self.lines_per_sales_invoice_min > self.lines_per_sales_invoice_max:
+            raise ValueError("lines_per_sales_invoice_min cannot be greater than lines_per_sales_invoice_max")
+        return self
+
+class BulkDataResponse(BaseModel):
+    message: str
+    elapsed_seconds: float
+    row_counts: Dict[str, int]
@@ -1,7 +1,7 @@
 from sqlalchemy.orm import Session
 from src.sellable_products.ratings_in_component_ids_service import RatingsInComponentIdsService
 from src.sellable_products.sell_price_and_ratings_finder_service import SellPriceAndRatingsFinderService
-from src.api.s3_dependencies import ( bucket_name, s3_client )
+from src.api.s3_dependencies import ( presigned_url )
 
 class InjectedComponentIdsAndRatingPerCategoriesService:
     def __init__(
@@ -33,12 +33,7 @@ class InjectedComponentIdsAndRatingPerCategoriesService:
             component = sell_price_and_ratings_service.call()
             images = []
             if component.images:
-                presigned_url = s3_client().generate_presigned_url(
-                    'get_object',
-                    Params={'Bucket': bucket_name(), 'Key': component.images[0]},
-                    ExpiresIn=3600
-                )
-                images = [presigned_url]
+                images = [presigned_url(component.images[0])]
             component.images = images
             components_by_category_ids.setdefault(component.component_category_id, []).append(component)
 
@@ -1,6 +1,6 @@
-from src.models import ( ComputerComponentReview )
+from src.models import ( ComputerComponentRatingSummary )
 from sqlalchemy.orm import Session
-from sqlalchemy import ( func )
+from sqlalchemy import ( desc )
 from fastapi import ( HTTPException )
 
 class MinRatingFilterComponentIdsService:
@@ -15,16 +15,16 @@ class MinRatingFilterComponentIdsService:
 
     def call(self):
         try:
-            # Subquery for components with average rating >= min_rating
-            avg_rating = self.db.query(
-                ComputerComponentReview.component_id,
-                func.avg(ComputerComponentReview.rating).label('avg_rating')
-            ).group_by(ComputerComponentReview.component_id).subquery()
-            
-            query = self.db.query(avg_rating.c.component_id)
+            query = (
+                self.db.query(ComputerComponentRatingSummary.component_id)
+                .filter(ComputerComponentRatingSummary.review_count > 0)
+            )
             if self.min_rating:
-                query = query.filter(avg_rating.c.avg_rating >= self.min_rating)
-            component_ids = [comp_id for comp_id, in query.all()]
+                # avg_rating >= min_rating, without dividing per row
+                query = query.filter(
+                    ComputerComponentRatingSummary.rating_sum >= self.min_rating * ComputerComponentRatingSummary.review_count
+                )
+            component_ids = [comp_id for comp_id, in query.order_by(desc(ComputerComponentRatingSummary.component_id)).all()]
 
             return component_ids
         except (ValueError, TypeError):
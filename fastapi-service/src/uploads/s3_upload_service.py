@@ -0,0 +1,120 @@
+from fastapi import HTTPException, UploadFile
+from botocore.exceptions import ClientError
+from src.api.s3_dependencies import ( bucket_name, s3_client )
+from typing import List
+import asyncio
+import httpx
+import logging
+import uuid
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_CONCURRENT_UPLOADS = 4
+
+def create_presigned_post(file_name: str):
+    try:
+        response = s3_client().generate_presigned_post(
+            bucket_name(),
+            file_name,
+            ExpiresIn=3600
+        )
+    except ClientError as e:
+        logging.error(e)
+        return None
+    
+    # The response contains the presigned URL and required fields
+    return response
+
+class MultipartFileStream:
+    """multipart/form-data body for an S3 presigned POST, streaming the file part in chunks.
+    S3 rejects chunked transfer encoding, so the exact length is computed up front."""
+    def __init__(self, *, fields: dict, file: UploadFile, filename: str, file_size: int):
+        self.boundary = uuid.uuid4().hex
+        self.file = file
+        self.file_size = file_size
+
+        head = b''
+        for name, value in fields.items():
+            head += (
+                f'--{self.boundary}\r\n'
+                f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+                f'{value}\r\n'
+            ).encode()
+        safe_filename = filename.replace('"', '%22')
+        head += (
+            f'--{self.boundary}\r\n'
+            f'Content-Disposition: form-data; name="file"; filename="{safe_filename}"\r\n'
+            f'Content-Type: {file.content_type or "application/octet-stream"}\r\n\r\n'
+        ).encode()
+
+        self.head = head
+        self.tail = f'\r\n--{self.boundary}--\r\n'.encode()
+
+    @property
+    def content_type(self) -> str:
+        return f'multipart/form-data; boundary={self.boundary}'
+
+    @property
+    def content_length(self) -> int:
+        return len(self.head) + self.file_size + len(self.tail)
+
+    async def __aiter__(self):
+        yield self.head
+
+        await self.file.seek(0)
+        while True:
+            chunk = await self.file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+        yield self.tail
+
+class S3UploadService:
+    def __init__(self, http_client: httpx.AsyncClient, *, max_concurrent_uploads: int = MAX_CONCURRENT_UPLOADS):
+        self.http_client = http_client
+        self.semaphore = asyncio.Semaphore(max_concurrent_uploads)
+
+    async def upload(self, file: UploadFile) -> dict:
+        s3_filename = f"{uuid.uuid4()}_{file.filename}"
+
+        presigned_post = create_presigned_post(s3_filename)
+        if presigned_post is None:
+            raise HTTPException(status_code=502, detail="Unable to create upload url")
+
+        body = MultipartFileStream(
+            fields=presigned_post['fields'],
+            file=file,
+            filename=s3_filename,
+            file_size=self.file_size(file)
+        )
+
+        async with self.semaphore:
+            try:
+                http_response = await self.http_client.post(
+                    presigned_post['url'],
+                    content=body,
+                    headers={
+                        'Content-Type': body.content_type,
+                        'Content-Length': str(body.content_length)
+                    }
+                )
+            except httpx.HTTPError as e:
+                logging.error(f"Upload of {s3_filename} failed: {e}")
+                raise HTTPException(status_code=502, detail="Upload to storage failed")
+
+        return {
+            'status_code': http_response.status_code,
+            's3_key': presigned_post['fields']['key']
+        }
+
+    async def upload_many(self, files: List[UploadFile]) -> List[dict]:
+        return await asyncio.gather(*(self.upload(file) for file in files))
+
+    def file_size(self, file: UploadFile) -> int:
+        if file.size is not None:
+            return file.size
+
+        file.file.seek(0, 2)
+        size = file.file.tell()
+        file.file.seek(0)
+        return size
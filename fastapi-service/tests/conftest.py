@@ -10,7 +10,8 @@ import inspect
 import importlib
 from pathlib import Path
 from tests.factories import BaseFactory
-from src.api.session_db import get_db
+from src.api.session_db import get_db, get_db_async, get_session_factory
+from src.document_numbers.sequences import sync_document_sequences
 from tests.factories.component_factory import ComponentFactory
 from tests.factories.component_category_factory import ComponentCategoryFactory
 from tests.factories.computer_component_sell_price_setting_factory import ComputerComponentSellPriceSettingFactory
@@ -186,6 +187,8 @@ def db_session(engine):
     transaction = connection.begin()
     Session = sessionmaker(bind=connection, autocommit=False, autoflush=False)
     session = Session()
+    # Sequences ignore the rollback, restart document numbering from the (empty) tables
+    sync_document_sequences(session)
 
     yield session
 
@@ -193,12 +196,38 @@ def db_session(engine):
     transaction.rollback()
     connection.close()
 
+class TransactionBoundAsyncSession:
+    """Serves AsyncSession calls from db_session so async routes see the rows of the test transaction"""
+    def __init__(self, session):
+        self.session = session
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return fn(self.session, *args, **kwargs)
+
+    async def execute(self, statement, *args, **kwargs):
+        return self.session.execute(statement, *args, **kwargs)
+
+    async def commit(self):
+        self.session.commit()
+
+    async def rollback(self):
+        self.session.rollback()
+
+    async def close(self):
+        pass
+
 @pytest.fixture
 def client(db_session):
     def override_get_db():
         yield db_session
 
+    async def override_get_db_async():
+        yield TransactionBoundAsyncSession(db_session)
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_db_async] = override_get_db_async
+    # Background jobs open their sessions through the factory, hand them the test transaction too
+    app.dependency_overrides[get_session_factory] = lambda: (lambda: db_session)
     with TestClient(app) as test_client:
         yield test_client
 
@@ -14,6 +14,8 @@ from unittest.mock import AsyncMock, patch
 import httpx
 from src.infrastructure.persistence.models.payment import Payment
 from fastapi import HTTPException
+from src.infrastructure.http.rails_client import RailsClient
+from src.infrastructure.persistence.models.outbox_event import ( OutboxEvent, JOURNAL_ENTRY_REQUESTED, PAYMENT_CREATED )
 
 @pytest.fixture
 def fetch_token_sean_ali(user_sean_ali):
@@ -49,9 +51,7 @@ def mock_process_payment_command(user_sean_ali, account_0):
 
 @pytest.mark.asyncio
 @patch.object(PaymentCommandHandler, '_validate_user', new_callable=AsyncMock)
-@patch.object(PaymentCommandHandler, '_create_sales_journal', new_callable=AsyncMock)
 async def test_create_payment(
-    mock_journal,
     mock_user,
     client,
     db_session,
@@ -64,15 +64,19 @@ async def test_create_payment(
                         fetch_token_sean_ali,
                         db_session)
 
-    assert mock_journal.call_count == 1
     assert mock_user.call_count == 1
+    events = db_session.query(OutboxEvent).order_by(OutboxEvent.id).all()
+    assert [event.event_type for event in events] == [JOURNAL_ENTRY_REQUESTED, PAYMENT_CREATED]
+    assert all(event.aggregate_id == response.id and event.status == 'pending' for event in events)
+    assert events[0].payload['journal_entry'] == { 'reference_id': response.id, 'reference_type': 'Payment', 'reversed_by_id': None }
+    assert events[1].payload['currency'] == 'IDR'
         
 
 @pytest.mark.asyncio
 @patch.object(PaymentCommandHandler, '_validate_user', new_callable=AsyncMock)
-@patch.object(PaymentCommandHandler, '_create_sales_journal', new_callable=AsyncMock, side_effect=httpx.HTTPError("Journal service unavailable"))
-async def test_create_payment_journal_fails(
-    mock_journal,
+@patch.object(PaymentCommandHandler, '_outbox_events', side_effect=ValueError("Outbox unavailable"))
+async def test_create_payment_rolls_back_with_its_outbox_events(
+    mock_outbox_events,
     mock_user,
     client,
     db_session,
@@ -81,19 +85,22 @@ async def test_create_payment_journal_fails(
 ):
     db_session.commit()
 
-    with pytest.raises(HTTPException):
+    with pytest.raises(HTTPException) as error:
         await PaymentCommandHandler().handle_process_payment(
             mock_process_payment_command,
             fetch_token_sean_ali,
             db_session
         )
 
-    assert mock_journal.call_count == 1
+    assert error.value.status_code == 500
+    assert mock_outbox_events.call_count == 1
+    assert db_session.query(Payment).count() == 0
+    assert db_session.query(OutboxEvent).count() == 0
         
 
 @pytest.mark.asyncio
 @patch.object(PaymentCommandHandler, '_validate_user', new_callable=AsyncMock)
-async def test_create_payment_network_timeout(
+async def test_create_payment_does_not_wait_for_the_journal(
     mock_user,
     client,
     db_session,
@@ -105,21 +112,16 @@ async def test_create_payment_network_timeout(
 
     assert initial_count == 0
 
-    with patch.object(
-        PaymentCommandHandler,
-        '_create_sales_journal',
-        new_callable=AsyncMock,
-        side_effect=httpx.TimeoutException("Request timeout")
-    ) as mock_journal:
-        with pytest.raises(HTTPException):
-            await PaymentCommandHandler().handle_process_payment(
-                mock_process_payment_command,
-                fetch_token_sean_ali,
-                db_session
-            )
-            
+    # Nothing listens here: a journal call in the request path would fail the payment
+    async with RailsClient("http://127.0.0.1:9", max_retries=0) as rails_client:
+        await PaymentCommandHandler(rails_client).handle_process_payment(
+            mock_process_payment_command,
+            fetch_token_sean_ali,
+            db_session
+        )
 
     final_count = db_session.query(Payment).count()
-    assert final_count == initial_count
+    assert final_count == initial_count + 1
 
-    assert mock_user.call_count == 1
\ No newline at end of file
+    assert mock_user.call_count == 1
+    assert db_session.query(OutboxEvent).filter(OutboxEvent.status == 'pending').count() == 2
@@ -13,8 +13,6 @@ class SalesDeliveryFactory(BaseFactory):
 
         if db:
             service = Service(db)
-            service.generate_latest_sales_delivery_no()
-
             sales_delivery = model_class(*args, **kwargs)
             sales_delivery = service.assign_sales_delivery_no(sales_delivery)
 
@@ -20,7 +20,7 @@ from sqlalchemy.orm import (
     object_session,
     joinedload
 )
-from src.api.api import create_sales_delivery_every_thirty_seconds
+from src.sales_deliveries.worker import SalesDeliveryWorker
 
 @pytest.fixture
 def component_gpu_4060(component_category_gpu, db_session):
@@ -131,19 +131,42 @@ def test_create(db_session,
         sales_invoice,
         sales_invoice_2
     ):
-    response = create_sales_delivery_every_thirty_seconds(db=db_session)
+    sales_invoice_id, sales_invoice_2_id = sales_invoice.id, sales_invoice_2.id
+    handled = SalesDeliveryWorker(lambda: db_session).run()
 
-    assert response is None
+    assert handled == 2
 
-    deliveries = db_session.query(SalesDelivery).all()
+    deliveries = db_session.query(SalesDelivery).order_by(SalesDelivery.id).all()
     assert len(deliveries) == 2
 
     delivery = deliveries[0]
-    assert delivery.sales_invoice_id == sales_invoice.id
+    assert delivery.sales_invoice_id == sales_invoice_id
     assert delivery.sales_delivery_no == 'OUTBOUND-DELIVERY-00001'
     assert delivery.status == 0
 
     delivery_2 = deliveries[1]
-    assert delivery_2.sales_invoice_id == sales_invoice_2.id
+    assert delivery_2.sales_invoice_id == sales_invoice_2_id
     assert delivery_2.sales_delivery_no == 'OUTBOUND-DELIVERY-00002'
-    assert delivery_2.status == 0
\ No newline at end of file
+    assert delivery_2.status == 0
+
+def test_create_in_batches(db_session,
+        sales_invoice,
+        sales_invoice_2
+    ):
+    sales_invoice_id, sales_invoice_2_id = sales_invoice.id, sales_invoice_2.id
+
+    # One invoice per batch, and the run stops after its batch budget
+    assert SalesDeliveryWorker(lambda: db_session, batch_size=1, max_batches=1).run() == 1
+    deliveries = db_session.query(SalesDelivery).all()
+    assert [(delivery.sales_invoice_id, delivery.sales_delivery_no) for delivery in deliveries] == [
+        (sales_invoice_id, 'OUTBOUND-DELIVERY-00001')
+    ]
+
+    # The next run picks up where the previous one stopped, with no pending invoice left after it
+    assert SalesDeliveryWorker(lambda: db_session, batch_size=1).run() == 1
+    assert SalesDeliveryWorker(lambda: db_session, batch_size=1).run() == 0
+    deliveries = db_session.query(SalesDelivery).order_by(SalesDelivery.id).all()
+    assert [(delivery.sales_invoice_id, delivery.sales_delivery_no) for delivery in deliveries] == [
+        (sales_invoice_id, 'OUTBOUND-DELIVERY-00001'),
+        (sales_invoice_2_id, 'OUTBOUND-DELIVERY-00002')
+    ]
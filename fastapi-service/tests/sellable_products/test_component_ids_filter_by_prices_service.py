@@ -129,3 +129,37 @@ def test_fallback_to_default_price(
     result = service.call()
     assert result == [sell_price_default_of_keyboard_logitech.component_id, sell_price_default_of_liquid_fan.component_id]
     traveller.stop()
+
+def test_price_change_refreshes_effective_price(
+        db_session,
+        sell_price_on_wednesday_of_keyboard_logitech,
+        sell_price_default_of_keyboard_logitech,
+        sell_price_on_wednesday_of_liquid_fan
+    ):
+    traveller = time_machine.travel(dt.date(2025, 7, 9)) # wednesday
+    traveller.start()
+
+    sell_price_on_wednesday_of_liquid_fan.price_per_unit = 2000000
+    db_session.add(sell_price_on_wednesday_of_liquid_fan)
+    db_session.commit()
+
+    service = ComponentIdsFilterByPricesService(db=db_session, start_price=1900000, end_price=None)
+    result = service.call()
+    assert result == [sell_price_on_wednesday_of_liquid_fan.component_id]
+    traveller.stop()
+
+def test_deleted_weekday_price_falls_back_to_default(
+        db_session,
+        sell_price_on_wednesday_of_keyboard_logitech,
+        sell_price_default_of_keyboard_logitech
+    ):
+    traveller = time_machine.travel(dt.date(2025, 7, 9)) # wednesday
+    traveller.start()
+
+    db_session.delete(sell_price_on_wednesday_of_keyboard_logitech)
+    db_session.commit()
+
+    service = ComponentIdsFilterByPricesService(db=db_session, start_price=None, end_price=sell_price_default_of_keyboard_logitech.price_per_unit)
+    result = service.call()
+    assert result == [sell_price_default_of_keyboard_logitech.component_id]
+    traveller.stop()
@@ -4,6 +4,7 @@ from tests.conftest import (
     review_component_liquid_fan
 )
 from src.sellable_products.ratings_in_component_ids_service import RatingsInComponentIdsService
+from src.models import ComputerComponentRatingSummary
 import datetime as dt
 import time_machine
 
@@ -18,4 +19,18 @@ def test_default(db_session, review_component_keyboard_logitech, review_componen
     result = service.call()
     assert result == {
         review_component_keyboard_logitech.component_id: {'rating': 5.0, 'count_review_given': 1},
-        review_component_liquid_fan.component_id: {'rating': 4.0, 'count_review_given': 1}}
\ No newline at end of file
+        review_component_liquid_fan.component_id: {'rating': 4.0, 'count_review_given': 1}}
+def test_review_changes_update_summary(db_session, review_component_keyboard_logitech, review_component_liquid_fan):
+    review_component_keyboard_logitech.rating = 3
+    db_session.add(review_component_keyboard_logitech)
+    db_session.delete(review_component_liquid_fan)
+    db_session.commit()
+
+    service = RatingsInComponentIdsService(db=db_session, component_ids=[review_component_keyboard_logitech.component_id,
+                                                                         review_component_liquid_fan.component_id])
+    result = service.call()
+    assert result == {
+        review_component_keyboard_logitech.component_id: {'rating': 3.0, 'count_review_given': 1}}
+
+    summary = db_session.get(ComputerComponentRatingSummary, review_component_keyboard_logitech.component_id)
+    assert summary.rating_histogram == {1: 0, 2: 0, 3: 1, 4: 0, 5: 0}
@@ -0,0 +1,69 @@
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from tests.stub_server import StubServer
+import argparse
+import asyncio
+import json
+import time
+
+class StubLLMServer(StubServer):
+    """OpenAI compatible chat completions server answering every prompt with the same text.
+    Runs in a background thread for tests; point OPENAI_BASE_URL at `url` to use it locally."""
+    def __init__(self, *, answer: str = "Stock is steady, purchases trend up.", delay: float = 0.0, chunk_size: int = 8):
+        super().__init__()
+        self.answer = answer
+        self.delay = delay
+        self.chunk_size = chunk_size
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.app.post("/v1/chat/completions")(self.chat_completions)
+
+    @property
+    def url(self) -> str:
+        return f"{self.base_url}/v1"
+
+    async def chat_completions(self, request: Request):
+        body = await request.json()
+        self.prompts.append(body['messages'][-1]['content'])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        if body.get('stream'):
+            return StreamingResponse(self.chunks(body['model']), media_type='text/event-stream')
+
+        return {
+            'id': 'chatcmpl-stub',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body['model'],
+            'choices': [{ 'index': 0, 'message': { 'role': 'assistant', 'content': self.answer }, 'finish_reason': 'stop' }],
+            'usage': { 'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0 }
+        }
+
+    async def chunks(self, model: str):
+        pieces = [self.answer[i:i + self.chunk_size] for i in range(0, len(self.answer), self.chunk_size)]
+        for index, piece in enumerate(pieces):
+            last = index == len(pieces) - 1
+            yield "data: " + json.dumps({
+                'id': 'chatcmpl-stub',
+                'object': 'chat.completion.chunk',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [{ 'index': 0, 'delta': { 'content': piece }, 'finish_reason': 'stop' if last else None }]
+            }) + "\n\n"
+        yield "data: [DONE]\n\n"
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve a stub OpenAI chat completions API")
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--delay', type=float, default=0.5)
+    args = parser.parse_args()
+
+    stub = StubLLMServer(delay=args.delay).start(args.port)
+    print(f"Stub LLM listening, use OPENAI_BASE_URL={stub.url}")
+    stub.thread.join()
@@ -0,0 +1,48 @@
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from tests.stub_server import StubServer
+import argparse
+
+class StubRailsServer(StubServer):
+    """The two Rails endpoints payments call: user lookup and journal entry creation.
+    Set `failures` to answer that many upcoming requests with a 503.
+    Runs in a background thread for tests; point RAILS_BASE_URL at `base_url` to use it locally."""
+    def __init__(self, *, user_ids=None):
+        super().__init__()
+        self.user_ids = user_ids
+        self.failures = 0
+        self.requests = []
+        self.connections = set()
+        self.journal_entries = []
+        self.app.get("/rails/api/users/{user_id}")(self.show_user)
+        self.app.post("/rails/api/journal_entries")(self.create_journal_entry)
+
+    def track(self, request: Request):
+        self.requests.append((request.method, request.url.path))
+        self.connections.add((request.client.host, request.client.port))
+        if self.failures > 0:
+            self.failures -= 1
+            return JSONResponse({ 'error': 'unavailable' }, status_code=503)
+
+    async def show_user(self, user_id: int, request: Request):
+        if (failure := self.track(request)) is not None:
+            return failure
+        if self.user_ids is not None and user_id not in self.user_ids:
+            return JSONResponse({ 'error': 'not found' }, status_code=404)
+        return { 'id': user_id }
+
+    async def create_journal_entry(self, request: Request):
+        if (failure := self.track(request)) is not None:
+            return failure
+        body = await request.json()
+        self.journal_entries.append(body['journal_entry'])
+        return JSONResponse({ 'id': len(self.journal_entries) }, status_code=201)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve a stub Rails users and journal entries API")
+    parser.add_argument('--port', type=int, default=3000)
+    args = parser.parse_args()
+
+    stub = StubRailsServer().start(args.port)
+    print(f"Stub Rails listening, use RAILS_BASE_URL={stub.base_url}")
+    stub.thread.join()
@@ -0,0 +1,32 @@
+from fastapi import FastAPI
+import socket
+import threading
+import time
+import uvicorn
+
+class StubServer:
+    """Serves `self.app` with uvicorn in a background thread on a free (or given) local port"""
+    def __init__(self):
+        self.app = FastAPI()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self, port: int = 0):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(('127.0.0.1', port))
+        self.port = sock.getsockname()[1]
+
+        self.server = uvicorn.Server(uvicorn.Config(self.app, log_level='warning'))
+        self.thread = threading.Thread(target=self.server.run, kwargs={ 'sockets': [sock] }, daemon=True)
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+
+        return self
+
+    def stop(self):
+        self.server.should_exit = True
+        self.thread.join()
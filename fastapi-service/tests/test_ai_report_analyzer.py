@@ -0,0 +1,258 @@
+import pytest
+import asyncio
+import json
+from openai import AsyncOpenAI
+from src.api.api import app
+from src.api.dependencies.report_analyzer import get_report_analyzer
+from src.chatgpt.ask_chatgpt import AskChatGPT
+from src.chatgpt.report_analyzer import ReportAnalyzer
+from src.chatgpt.response_cache import ResponseCache
+from tests.stub_llm_server import StubLLMServer
+from tests.factories.inventory_factory import InventoryFactory
+from tests.factories.purchase_invoice_factory import PurchaseInvoiceFactory
+from tests.factories.purchase_invoice_line_factory import PurchaseInvoiceLineFactory
+from tests.conftest import (
+    client,
+    db_session,
+    setup_factories,
+    component_category_fan,
+    component_category_peripherals,
+    component_liquid_cooling_fan_1,
+    component_keyboard_logitech
+)
+from datetime import ( date, datetime, timedelta )
+
+@pytest.fixture
+def stub_llm():
+    stub = StubLLMServer().start()
+    yield stub
+    stub.stop()
+
+def build_analyzer(stub_llm, **kwargs) -> ReportAnalyzer:
+    openai_client = AsyncOpenAI(api_key='stub', base_url=stub_llm.url, max_retries=0)
+    return ReportAnalyzer(AskChatGPT(openai_client, model='stub-model'), **kwargs)
+
+@pytest.fixture
+def analyzer(stub_llm):
+    analyzer = build_analyzer(stub_llm)
+    app.dependency_overrides[get_report_analyzer] = lambda: analyzer
+    return analyzer
+
+def parse_events(body: str) -> list:
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((fields.get('event', 'message'), json.loads(fields['data'])))
+    return events
+
+def test_analyze_report_caches_by_normalized_input(client, stub_llm, analyzer):
+    response = client.post("/api/chatbot/analyze_report", json={ 'user_input': "Summarize   the March report" })
+    assert response.status_code == 200
+    assert response.json() == { 'chatgpt_response': stub_llm.answer, 'cached': False }
+
+    response = client.post("/api/chatbot/analyze_report", json={ 'user_input': " Summarize the March\nreport " })
+    assert response.status_code == 200
+    assert response.json() == { 'chatgpt_response': stub_llm.answer, 'cached': True }
+    assert stub_llm.prompts == ["Summarize   the March report"]
+
+def test_stream_analyze_report_sends_tokens_as_events(client, stub_llm, analyzer):
+    response = client.post("/api/chatbot/analyze_report/stream", json={ 'user_input': "Which component sells best?" })
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/event-stream')
+
+    events = parse_events(response.text)
+    deltas = [data['delta'] for event, data in events if event == 'message']
+    assert len(deltas) > 1
+    assert ''.join(deltas) == stub_llm.answer
+    assert events[-1] == ('done', { 'cached': False })
+
+    # A completed stream fills the cache for both endpoints
+    response = client.post("/api/chatbot/analyze_report", json={ 'user_input': "Which component sells best?" })
+    assert response.json()['cached'] is True
+    response = client.post("/api/chatbot/analyze_report/stream", json={ 'user_input': "Which component sells best?" })
+    assert parse_events(response.text) == [('message', { 'delta': stub_llm.answer }), ('done', { 'cached': True })]
+    assert len(stub_llm.prompts) == 1
+
+def test_analyze_report_answers_503_when_every_slot_stays_busy(client, stub_llm):
+    analyzer = build_analyzer(stub_llm, max_concurrent_requests=1, queue_timeout=0.05)
+    app.dependency_overrides[get_report_analyzer] = lambda: analyzer
+
+    async def occupy_slot():
+        await analyzer.acquire()
+    asyncio.run(occupy_slot())
+
+    response = client.post("/api/chatbot/analyze_report", json={ 'user_input': "Any slow movers?" })
+    assert response.status_code == 503
+    assert response.headers['retry-after'] == '5'
+    response = client.post("/api/chatbot/analyze_report/stream", json={ 'user_input': "Any slow movers?" })
+    assert response.status_code == 503
+    assert stub_llm.prompts == []
+
+def test_analyzer_bounds_concurrent_upstream_calls(stub_llm):
+    stub_llm.delay = 0.1
+    analyzer = build_analyzer(stub_llm, max_concurrent_requests=2)
+
+    async def analyze_all():
+        return await asyncio.gather(*[analyzer.analyze(f"Report {index}") for index in range(6)])
+    results = asyncio.run(analyze_all())
+
+    assert [cached for _, cached in results] == [False] * 6
+    assert len(stub_llm.prompts) == 6
+    assert stub_llm.max_in_flight == 2
+
+def prompt_digest(prompt: str) -> dict:
+    question, serialized = prompt.split("\n\nReport digest (JSON):\n")
+    digest = json.loads(serialized)
+    assert serialized == json.dumps(digest, separators=(',', ':'))
+    return question, digest
+
+def test_analyze_report_digests_inventory_movements_server_side(
+        client,
+        stub_llm,
+        analyzer,
+        component_liquid_cooling_fan_1,
+        component_keyboard_logitech
+    ):
+    today = datetime.now().date()
+    fan_id, fan_name = component_liquid_cooling_fan_1.id, component_liquid_cooling_fan_1.name
+    keyboard_id, keyboard_name = component_keyboard_logitech.id, component_keyboard_logitech.name
+    for days_ago in range(10):
+        InventoryFactory(
+            out_stock=2,
+            stock_date=today - timedelta(days=days_ago),
+            component_id=fan_id,
+            resource_line_id=0,
+            resource_line_type='SalesDeliveryLine',
+            resource_id=0,
+            resource_type='SalesDelivery',
+            buy_price=0
+        )
+    InventoryFactory(
+        in_stock=100,
+        stock_date=today,
+        component_id=fan_id,
+        resource_line_id=0,
+        resource_line_type='InboundDeliveryLine',
+        resource_id=0,
+        resource_type='InboundDelivery',
+        buy_price=1500
+    )
+    InventoryFactory(
+        in_stock=7,
+        stock_date=today,
+        component_id=keyboard_id,
+        resource_line_id=0,
+        resource_line_type='InboundDeliveryLine',
+        resource_id=0,
+        resource_type='InboundDelivery',
+        buy_price=300
+    )
+    start_date = (today - timedelta(days=30)).isoformat()
+
+    response = client.post("/api/chatbot/analyze_report", json={
+        'report': 'inventory_movement',
+        'filters': { 'start_date': start_date }
+    })
+    assert response.status_code == 200
+    assert response.json()['chatgpt_response'] == stub_llm.answer
+
+    question, digest = prompt_digest(stub_llm.prompts[0])
+    assert question == "Point out the notable totals, top movers, outliers and category trends in this report."
+    assert digest['report'] == 'inventory_movement'
+    assert digest['filters'] == { 'start_date': start_date }
+    assert digest['totals'] == {
+        'movements': 12,
+        'components': 2,
+        'total_in': 107,
+        'total_out': 20,
+        'net': 87,
+        'first_date': (today - timedelta(days=9)).isoformat(),
+        'last_date': today.isoformat()
+    }
+    assert digest['top_movers'] == [
+        { 'component': fan_name, 'in': 100, 'out': 20, 'net': 80 },
+        { 'component': keyboard_name, 'in': 7, 'out': 0, 'net': 7 }
+    ]
+    assert digest['outliers'] == [
+        { 'date': today.isoformat(), 'component': fan_name, 'type': 'InboundDelivery', 'quantity': 100, 'typical': 10.91 }
+    ]
+    assert set(digest['category_trends']) == { 'FAN', 'Peripherals' }
+
+    # Filters narrow the digest, and the user's own question leads the prompt
+    response = client.post("/api/chatbot/analyze_report", json={
+        'user_input': "Why   did keyboards move?",
+        'report': 'inventory_movement',
+        'filters': { 'component_name': 'logitech' }
+    })
+    question, digest = prompt_digest(stub_llm.prompts[1])
+    assert question == "Why did keyboards move?"
+    assert digest['totals']['movements'] == 1
+    assert digest['top_movers'] == [{ 'component': keyboard_name, 'in': 7, 'out': 0, 'net': 7 }]
+    assert digest['outliers'] == []
+
+def test_stream_analyze_report_digests_purchase_invoices(
+        client,
+        stub_llm,
+        analyzer,
+        component_category_fan,
+        component_liquid_cooling_fan_1
+    ):
+    for supplier_name, quantity in [("Aftershock PC", 2), ("Aftershock PC", 3), ("Cube Gaming", 1)]:
+        PurchaseInvoiceFactory(
+            invoice_date=datetime.now(),
+            supplier_name=supplier_name,
+            sum_total_line_amounts=quantity * 1500,
+            purchase_invoice_lines=[
+                PurchaseInvoiceLineFactory.build(
+                    component_id=component_liquid_cooling_fan_1.id,
+                    component_name=component_liquid_cooling_fan_1.name,
+                    component_category_id=component_category_fan.id,
+                    component_category_name=component_category_fan.name,
+                    quantity=quantity,
+                    price_per_unit=1500,
+                    total_line_amount=quantity * 1500
+                )
+            ]
+        )
+    component_name = component_liquid_cooling_fan_1.name
+
+    response = client.post("/api/chatbot/analyze_report/stream", json={
+        'report': 'purchase_invoice',
+        'filters': { 'invoice_status': 0 }
+    })
+    assert response.status_code == 200
+    assert parse_events(response.text)[-1] == ('done', { 'cached': False })
+
+    _, digest = prompt_digest(stub_llm.prompts[0])
+    assert digest['filters'] == { 'invoice_status': 0 }
+    assert digest['totals']['invoices'] == 3
+    assert digest['totals']['total_amount'] == 9000
+    assert digest['totals']['average_amount'] == 3000
+    assert digest['totals']['by_status'] == { 'PENDING': 3 }
+    assert digest['top_suppliers'] == [
+        { 'supplier': "Aftershock PC", 'invoices': 2, 'amount': 7500 },
+        { 'supplier': "Cube Gaming", 'invoices': 1, 'amount': 1500 }
+    ]
+    assert digest['top_components'] == [{ 'component': component_name, 'quantity': 6, 'amount': 9000 }]
+    assert digest['category_trends'] == { 'FAN': [{ 'month': date.today().strftime('%Y-%m'), 'quantity': 6, 'amount': 9000 }] }
+    assert digest['outliers'] == []
+
+def test_analyze_report_requires_user_input_or_report(client, stub_llm, analyzer):
+    response = client.post("/api/chatbot/analyze_report", json={ 'filters': { 'keyword': 'PI' } })
+    assert response.status_code == 422
+    assert stub_llm.prompts == []
+
+def test_response_cache_expires_and_evicts_least_recently_used():
+    now = [0.0]
+    cache = ResponseCache(ttl_seconds=10, max_entries=2, clock=lambda: now[0])
+    cache.set('a', 'answer a')
+    cache.set('b', 'answer b')
+    assert cache.get('a') == 'answer a'
+
+    cache.set('c', 'answer c')
+    assert cache.get('b') is None
+    assert cache.get('a') == 'answer a'
+
+    now[0] = 10
+    assert cache.get('a') is None
+    assert cache.get('c') is None
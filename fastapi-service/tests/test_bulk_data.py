@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy import text
+from tests.conftest import ( client, db_session, setup_factories )
+from unittest.mock import patch
+
+BULK_PARAMS = {
+    'seed': 7,
+    'users': 20,
+    'component_categories': 3,
+    'computer_components': 15,
+    'reviews_per_component': 2,
+    'purchase_invoices': 40,
+    'lines_per_purchase_invoice_min': 1,
+    'lines_per_purchase_invoice_max': 3,
+    'inbound_delivery_ratio': 0.5,
+    'sales_invoices': 30,
+    'sales_delivery_ratio': 0.5,
+    'cart_lines': 10,
+    'payments': 50
+}
+
+def count(db_session, sql):
+    return db_session.execute(text(sql)).scalar()
+
+def test_generate(client, db_session):
+    response = client.post("/api/bulk-data", json=BULK_PARAMS)
+    assert response.status_code == 201
+    row_counts = response.json()['row_counts']
+
+    assert row_counts['users'] == 20
+    assert row_counts['computer_components'] == 15
+    assert row_counts['purchase_invoices'] == 40
+    assert row_counts['sales_invoices'] == 30
+    assert row_counts['payments'] == 50
+    assert count(db_session, "SELECT COUNT(*) FROM purchase_invoices") == 40
+    assert count(db_session, "SELECT COUNT(*) FROM purchase_invoice_lines") == row_counts['purchase_invoice_lines']
+    assert count(db_session, "SELECT COUNT(*) FROM inventories") == (
+        row_counts['inbound_delivery_lines'] + row_counts['sales_delivery_lines']
+    )
+
+    # Totals add up and every polymorphic inventory row points at a real delivery line
+    assert count(db_session, """
+        SELECT COUNT(*) FROM purchase_invoices pi
+        WHERE pi.sum_total_line_amounts <> (SELECT SUM(total_line_amount) FROM purchase_invoice_lines WHERE purchase_invoice_id = pi.id)
+    """) == 0
+    assert count(db_session, """
+        SELECT COUNT(*) FROM inventories i
+        LEFT JOIN inbound_delivery_lines idl ON i.resource_line_type = 'InboundDeliveryLine' AND idl.id = i.resource_line_id
+        LEFT JOIN sales_delivery_lines sdl ON i.resource_line_type = 'SalesDeliveryLine' AND sdl.id = i.resource_line_id
+        WHERE idl.id IS NULL AND sdl.id IS NULL
+    """) == 0
+
+    # COPY fires the statement triggers that maintain the derived tables
+    assert count(db_session, "SELECT COALESCE(SUM(review_count), 0) FROM computer_component_rating_summaries") == row_counts['computer_component_reviews']
+    assert count(db_session, "SELECT COUNT(DISTINCT component_id) FROM computer_component_effective_prices") == 15
+
+def test_generate_twice_continues_ids_and_document_numbers(client, db_session):
+    assert client.post("/api/bulk-data", json=BULK_PARAMS).status_code == 201
+    assert client.post("/api/bulk-data", json={ **BULK_PARAMS, 'seed': 8 }).status_code == 201
+
+    assert count(db_session, "SELECT COUNT(*) FROM purchase_invoices") == 80
+    assert count(db_session, "SELECT MAX(purchase_invoice_no) FROM purchase_invoices") == 'BUY-0000080'
+    assert count(db_session, "SELECT COUNT(*) FROM accounts") == 9
+    assert count(db_session, "SELECT COUNT(*) FROM payment_methods") == 4
+    assert count(db_session, "SELECT last_value FROM purchase_invoices_id_seq") == count(db_session, "SELECT MAX(id) FROM purchase_invoices")
+
+def test_generate_rejects_inverted_line_ranges(client):
+    response = client.post("/api/bulk-data", json={ **BULK_PARAMS, 'lines_per_sales_invoice_min': 5, 'lines_per_sales_invoice_max': 2 })
+    assert response.status_code == 422
+
+def test_generate_is_disabled_in_production(client):
+    with patch.dict('os.environ', { 'WEB_ENVIRONMENT': 'production' }):
+        response = client.post("/api/bulk-data", json=BULK_PARAMS)
+    assert response.status_code == 403
@@ -0,0 +1,45 @@
+from sqlalchemy import text
+from src.document_numbers.numbering_service import ( NumberingService, SequenceBlocks )
+from src.document_numbers.sequences import (
+    PURCHASE_INVOICE_NO,
+    SALES_INVOICE_NO,
+    SALES_PAYMENT_INVOICE_NO,
+    PURCHASE_INVOICE_NO_SEQUENCE,
+    sync_document_sequences
+)
+from tests.factories.purchase_invoice_factory import PurchaseInvoiceFactory
+from tests.conftest import ( db_session, setup_factories )
+from datetime import datetime
+
+def last_value(db_session, sequence) -> int:
+    return db_session.execute(text(f"SELECT last_value FROM {sequence.name}")).scalar()
+
+def test_numbers_continue_after_existing_documents(db_session):
+    invoice = PurchaseInvoiceFactory(invoice_date=datetime.now(), supplier_name="Aftershock PC", sum_total_line_amounts=0)
+    assert invoice.purchase_invoice_no == 'BUY-0000001'
+
+    # Documents numbered outside the service, e.g. imported ones, are skipped once the sequences are synced
+    invoice.purchase_invoice_no = 'BUY-0000041'
+    db_session.commit()
+    sync_document_sequences(db_session)
+
+    assert NumberingService(db_session).next_number(PURCHASE_INVOICE_NO) == 'BUY-0000042'
+
+def test_sales_invoice_formats_share_one_sequence(db_session):
+    numbering_service = NumberingService(db_session)
+
+    assert numbering_service.next_number(SALES_INVOICE_NO) == 'PS-CUAN-00000001'
+    assert numbering_service.next_number(SALES_PAYMENT_INVOICE_NO) == 'HSF-SALES-00002'
+    assert numbering_service.next_number(SALES_INVOICE_NO) == 'PS-CUAN-00000003'
+
+def test_blocks_take_numbers_from_the_database_once_per_block(db_session):
+    blocks = SequenceBlocks(block_size=3)
+
+    numbers = [NumberingService(db_session, blocks).next_number(PURCHASE_INVOICE_NO) for _ in range(3)]
+    assert numbers == ['BUY-0000001', 'BUY-0000002', 'BUY-0000003']
+    assert last_value(db_session, PURCHASE_INVOICE_NO_SEQUENCE) == 3
+
+    # A process without the block keeps numbering after it
+    assert NumberingService(db_session, SequenceBlocks()).next_number(PURCHASE_INVOICE_NO) == 'BUY-0000004'
+    assert NumberingService(db_session, blocks).next_number(PURCHASE_INVOICE_NO) == 'BUY-0000005'
+    assert last_value(db_session, PURCHASE_INVOICE_NO_SEQUENCE) == 7
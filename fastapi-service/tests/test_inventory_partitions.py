@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy import text
+from src.inventories.partition_service import PartitionService
+from tests.factories.inventory_factory import InventoryFactory
+from tests.conftest import ( component_category_fan, component_liquid_cooling_fan_1, db_session, setup_factories )
+from datetime import date
+
+def inventory(component, stock_date):
+    return InventoryFactory(
+        in_stock=1,
+        stock_date=stock_date,
+        component_id=component.id,
+        resource_line_id=0,
+        resource_line_type='InboundDeliveryLine',
+        resource_id=0,
+        resource_type='InboundDelivery',
+        buy_price=0
+    )
+
+def count(db_session, table):
+    return db_session.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+
+def test_rows_without_month_partition_move_out_of_default(db_session, component_liquid_cooling_fan_1):
+    inventory(component_liquid_cooling_fan_1, date(2019, 3, 10))
+    inventory(component_liquid_cooling_fan_1, date(2019, 3, 31))
+    inventory(component_liquid_cooling_fan_1, date(2019, 4, 1))
+    db_session.flush()
+    assert count(db_session, 'inventories_default') == 3
+
+    service = PartitionService(db_session)
+    assert service.call(date(2019, 3, 1), date(2019, 3, 31)) == 1
+    assert service.call(date(2019, 3, 1), date(2019, 3, 31)) == 0
+
+    assert 'inventories_2019_03' in service.partitions()
+    assert count(db_session, 'inventories_2019_03') == 2
+    assert count(db_session, 'inventories_default') == 1
+    assert count(db_session, 'inventories') == 3
+
+def test_detach_before_keeps_rows_in_a_plain_table(db_session, component_liquid_cooling_fan_1):
+    service = PartitionService(db_session)
+    service.call(date(2019, 1, 1), date(2019, 2, 28))
+    inventory(component_liquid_cooling_fan_1, date(2019, 1, 20))
+    inventory(component_liquid_cooling_fan_1, date(2019, 2, 20))
+    db_session.flush()
+
+    assert service.detach_before(date(2019, 2, 15)) == ['inventories_2019_01']
+    assert 'inventories_2019_01' not in service.partitions()
+    assert 'inventories_2019_02' in service.partitions()
+    assert count(db_session, 'inventories_2019_01') == 1
+    assert count(db_session, 'inventories') == 1
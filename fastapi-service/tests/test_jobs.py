@@ -17,8 +17,14 @@ from src.infrastructure.persistence.models.payment import Payment
 from src.api.schemas.payment_schemas import PaymentRequestSchema
 from src.api.routers.jobs import execute_load_test
 from src.domain.payment.commands.generate_payment_load_command import GeneratePaymentLoadCommand
-from src.domain.payment.handlers.payment_load_test_handler import PaymentLoadTestHandler
+from src.domain.payment.handlers.payment_load_test_handler import PaymentLoadTestHandler, start_offset
+from src.domain.payment.handlers.latency_recorder import LatencyRecorder
+from src.infrastructure.persistence.job_store import JobStore, JobCache
+from src.infrastructure.persistence.models.job import Job
+from src.infrastructure.persistence.models.outbox_event import ( OutboxEvent, JOURNAL_ENTRY_REQUESTED )
+import src.domain.payment.handlers.payment_load_test_handler as payment_load_test_handler
 import asyncio
+import time
 
 @pytest.fixture
 def fetch_token_sean_ali(user_sean_ali):
@@ -61,9 +67,7 @@ def payment_request_json(user_sean_ali, account_0):
     }
 
 @patch.object(PaymentCommandHandler, '_validate_user', new_callable=AsyncMock)
-@patch.object(PaymentCommandHandler, '_create_sales_journal', new_callable=AsyncMock)
 def test_write_request(
-    mock_journal,
     mock_user,
     client,
     db_session,
@@ -80,16 +84,21 @@ def test_write_request(
     assert list(response_body.keys()) == ['job_id', 'status', 'message', 'total_requests']
     assert response.status_code == 202
 
-    assert mock_journal.call_count == 10
     assert mock_user.call_count == 10
     assert db_session.query(Payment).count() == 10
+    assert db_session.query(OutboxEvent).filter(OutboxEvent.event_type == JOURNAL_ENTRY_REQUESTED).count() == 10
+
+    response = client.get(f"/api/jobs/payment-load-test/{response_body['job_id']}", headers=headers)
+    job = response.json()
+    assert job['status'] == 'completed'
+    assert job['progress'] == { 'total': 10, 'successful': 10, 'failed': 0 }
+    assert job['result']['successful'] == 10
+    assert set(job['result']['latency_ms']) == { 'total', 'validate_user', 'db_insert' }
 
 @patch.object(PaymentCommandHandler, '_validate_user', new_callable=AsyncMock)
-@patch.object(PaymentCommandHandler, '_create_sales_journal', new_callable=AsyncMock)
 @patch('src.api.routers.jobs.execute_load_test')
 def test_api_load_test(
     mock_execute_load_test,
-    mock_sales_journal,
     mock_user,
     client,
     db_session,
@@ -119,7 +128,6 @@ def test_api_load_test(
     assert isinstance(command, GeneratePaymentLoadCommand)
     assert command.num_requests == 10
 
-    assert mock_sales_journal.call_count == 0
     assert mock_user.call_count == 0
     assert db_session.query(Payment).count() == 0
     
@@ -152,10 +160,8 @@ async def test_process_payment_n_times(
         assert call_db == db_session    
 
 @patch.object(PaymentCommandHandler, '_validate_user', new_callable=AsyncMock)
-@patch.object(PaymentCommandHandler, '_create_sales_journal', new_callable=AsyncMock)
 @pytest.mark.asyncio
 async def test_handle_create_journal(
-    mock_journal,
     mock_user,
     db_session,
     user_sean_ali,
@@ -175,4 +181,141 @@ async def test_handle_create_journal(
     await handler.handle_process_payment(command, fetch_token_sean_ali, db_session)
 
     mock_user.assert_called_once()
-    mock_journal.assert_called_once()
+    journal_entry = db_session.query(OutboxEvent).filter(OutboxEvent.event_type == JOURNAL_ENTRY_REQUESTED).one()
+    assert journal_entry.payload['journal_entry']['reference_type'] == "Payment"
+
+
+@pytest.mark.asyncio
+async def test_load_test_bounds_concurrency_and_times_each_phase(
+    db_session,
+    user_sean_ali,
+    account_0,
+    fetch_token_sean_ali
+):
+    db_session.commit()
+    in_flight = { 'now': 0, 'max': 0 }
+
+    async def slow_validate_user(user_id, token):
+        in_flight['now'] += 1
+        in_flight['max'] = max(in_flight['max'], in_flight['now'])
+        await asyncio.sleep(0.02)
+        in_flight['now'] -= 1
+
+    command = GeneratePaymentLoadCommand(
+        num_requests=12,
+        user_id=user_sean_ali.id,
+        account_id=account_0.id,
+        concurrency=3
+    )
+
+    with patch.object(PaymentCommandHandler, '_validate_user', side_effect=slow_validate_user):
+        result = await PaymentLoadTestHandler().handle_generate_load(command, fetch_token_sean_ali, db_session)
+
+    assert in_flight['max'] == 3
+    assert result['successful'] == 12
+    assert result['failed'] == 0
+    assert db_session.query(Payment).count() == 12
+
+    latency = result['latency_ms']
+    assert set(latency) == { 'total', 'validate_user', 'db_insert' }
+    assert all(phase['count'] == 12 for phase in latency.values())
+    assert latency['validate_user']['p50_ms'] >= 20
+    assert latency['total']['max_ms'] >= latency['validate_user']['max_ms']
+    assert sum(latency['total']['histogram'].values()) == 12
+
+@patch.object(PaymentCommandHandler, 'handle_process_payment', new_callable=AsyncMock)
+@pytest.mark.asyncio
+async def test_load_test_paces_requests_to_target_rps(mock_process_payment, db_session):
+    command = GeneratePaymentLoadCommand(num_requests=11, concurrency=5, target_rps=50)
+
+    started_at = time.perf_counter()
+    result = await PaymentLoadTestHandler().handle_generate_load(command, "token", db_session)
+
+    assert time.perf_counter() - started_at >= 0.2
+    assert mock_process_payment.call_count == 11
+    assert result['target_rps'] == 50
+
+def test_start_offset_ramps_up_linearly_to_target_rps():
+    assert start_offset(5, None, 10) == 0
+
+    # 100 rps after a 2 second ramp: the first 100 requests spread over the ramp
+    assert start_offset(0, 100, 2) == 0
+    assert start_offset(25, 100, 2) == pytest.approx(1.0)
+    assert start_offset(100, 100, 2) == pytest.approx(2.0)
+    assert start_offset(150, 100, 2) == pytest.approx(2.5)
+
+def test_latency_recorder_summarizes_percentiles():
+    recorder = LatencyRecorder()
+    for ms in range(1, 101):
+        recorder.record('db_insert', ms / 1000)
+
+    summary = recorder.summary()['db_insert']
+    assert summary['count'] == 100
+    assert (summary['p50_ms'], summary['p95_ms'], summary['p99_ms'], summary['max_ms']) == (50, 95, 99, 100)
+    assert summary['histogram']['<=1'] == 1
+    assert summary['histogram']['<=100'] == 50
+    assert summary['histogram']['>5000'] == 0
+
+@pytest.fixture
+def job_store(db_session):
+    return JobStore(lambda: db_session, JobCache())
+
+def test_job_store_is_shared_through_the_jobs_table(db_session, job_store):
+    job_store.create("payment-load-test-1", "payment-load-test", 300)
+    job_store.start("payment-load-test-1")
+    assert job_store.report_progress("payment-load-test-1", 120, 3) is False
+
+    # Another worker (or a restarted one) starts with an empty cache and reads the table
+    other_worker = JobStore(lambda: db_session, JobCache())
+    job = other_worker.get("payment-load-test-1")
+    assert (job['status'], job['successful'], job['failed']) == ('running', 120, 3)
+    assert job_store.cache.get("payment-load-test-1") is None
+
+    job_store.finish("payment-load-test-1", "completed", result={ 'successful': 297, 'failed': 3 })
+    job = other_worker.get("payment-load-test-1")
+    assert (job['status'], job['successful'], job['result']) == ('completed', 297, { 'successful': 297, 'failed': 3 })
+    assert other_worker.cache.get("payment-load-test-1") == job
+
+    # Finished jobs can no longer be cancelled
+    assert job_store.request_cancel("payment-load-test-1")['cancel_requested'] is False
+    assert job_store.get("payment-load-test-404") is None
+
+def test_job_cache_keeps_the_most_recently_used_jobs():
+    cache = JobCache(max_entries=2)
+    cache.set('a', { 'status': 'completed' })
+    cache.set('b', { 'status': 'failed' })
+    cache.get('a')
+    cache.set('c', { 'status': 'completed' })
+
+    assert list(cache.entries) == ['a', 'c']
+
+@pytest.mark.asyncio
+async def test_cancelled_load_test_stops_at_the_next_progress_batch(
+    db_session,
+    job_store,
+    user_sean_ali,
+    account_0,
+    fetch_token_sean_ali
+):
+    db_session.commit()
+    command = GeneratePaymentLoadCommand(num_requests=50, user_id=user_sean_ali.id, account_id=account_0.id, concurrency=1)
+    job_store.create("payment-load-test-2", "payment-load-test", 50)
+    validate_calls = []
+
+    async def validate_then_cancel(user_id, token):
+        validate_calls.append(user_id)
+        if len(validate_calls) == 3:
+            job_store.request_cancel("payment-load-test-2")
+
+    with patch.object(payment_load_test_handler, 'PROGRESS_BATCH_SIZE', 5), \
+         patch.object(PaymentCommandHandler, '_validate_user', side_effect=validate_then_cancel):
+        await execute_load_test("payment-load-test-2", command, fetch_token_sean_ali, job_store)
+
+    job = db_session.get(Job, "payment-load-test-2")
+    assert job.status == 'cancelled'
+    assert job.cancel_requested is True
+    assert (job.successful, job.failed) == (5, 0)
+    assert job.result['cancelled'] is True
+    assert job.completed_at is not None
+    assert len(validate_calls) == 5
+    assert db_session.query(Payment).count() == 5
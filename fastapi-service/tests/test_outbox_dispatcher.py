@@ -0,0 +1,109 @@
+import pytest
+from decimal import Decimal
+from sqlalchemy import update, func, text
+from unittest.mock import AsyncMock, patch
+from tests.factories.account_factory import AccountFactory
+from tests.stub_rails_server import StubRailsServer
+from tests.conftest import ( db_session, setup_factories, user_sean_ali )
+from src.domain.payment.commands.process_payment_command import ProcessPaymentCommand
+from src.domain.payment.handlers.payment_command_handler import PaymentCommandHandler
+from src.infrastructure.http.rails_client import RailsClient
+from src.infrastructure.messaging.outbox_dispatcher import OutboxDispatcher
+from src.infrastructure.messaging.payment_event_publisher import PaymentEventPublisher
+from src.infrastructure.persistence.models.outbox_event import ( OutboxEvent, JOURNAL_ENTRY_REQUESTED )
+
+@pytest.fixture
+def stub_rails():
+    stub = StubRailsServer().start()
+    yield stub
+    stub.stop()
+
+@pytest.fixture
+def account_0(db_session):
+    account = AccountFactory(
+        account_code=200,
+        account_name="Cash",
+        account_type=0,
+        subtype=0,
+        parent_id=None,
+        normal_balance=0,
+        is_active=True,
+        tax_code_id=None
+    )
+
+    db_session.add(account)
+    db_session.commit()
+
+    return account
+
+class RecordingPublisher(PaymentEventPublisher):
+    def __init__(self):
+        self.batches = []
+
+    async def publish_payment_events(self, payments_data):
+        self.batches.append(payments_data)
+
+def journal_event(payment_id: int) -> OutboxEvent:
+    return OutboxEvent(
+        event_type=JOURNAL_ENTRY_REQUESTED,
+        aggregate_type="Payment",
+        aggregate_id=payment_id,
+        payload={ "user_id": 7, "journal_entry": { "reference_id": payment_id, "reference_type": "Payment", "reversed_by_id": None } }
+    )
+
+@pytest.mark.asyncio
+@patch.object(PaymentCommandHandler, '_validate_user', new_callable=AsyncMock)
+async def test_dispatcher_delivers_journal_entries_and_payment_events_in_batches(
+    mock_user,
+    stub_rails,
+    db_session,
+    user_sean_ali,
+    account_0
+):
+    db_session.commit()
+    command = ProcessPaymentCommand(
+        user_id=user_sean_ali.id,
+        debit_account_id=account_0.id,
+        amount=Decimal("100.00"),
+        currency="EUR",
+        payment_method="CASH"
+    )
+    payment_ids = [(await PaymentCommandHandler().handle_process_payment(command, "token", db_session)).id for _ in range(3)]
+    publisher = RecordingPublisher()
+
+    async with RailsClient(stub_rails.base_url) as rails_client:
+        dispatcher = OutboxDispatcher(lambda: db_session, rails_client, publisher, batch_size=4)
+        assert await dispatcher.dispatch() == 6
+        assert await dispatcher.dispatch() == 0
+
+    assert [entry['reference_id'] for entry in stub_rails.journal_entries] == payment_ids
+    assert [[event['payment_id'] for event in batch] for batch in publisher.batches] == [payment_ids[:2], payment_ids[2:]]
+    events = db_session.query(OutboxEvent).all()
+    assert all(event.status == 'delivered' and event.delivered_at is not None and event.attempts == 1 for event in events)
+
+@pytest.mark.asyncio
+async def test_failed_deliveries_are_retried_later_and_parked_after_max_attempts(stub_rails, db_session):
+    db_session.add_all([journal_event(1), journal_event(2)])
+    db_session.commit()
+    stub_rails.failures = 1
+
+    async with RailsClient(stub_rails.base_url) as rails_client:
+        dispatcher = OutboxDispatcher(lambda: db_session, rails_client, max_attempts=2)
+        assert await dispatcher.dispatch() == 1
+
+        failed = db_session.query(OutboxEvent).filter(OutboxEvent.status == 'pending').one()
+        assert failed.attempts == 1
+        assert '503' in failed.last_error
+        assert db_session.scalar(text("SELECT available_at > now() FROM outbox_events WHERE id = :id"), { 'id': failed.id })
+
+        # Not due yet
+        assert await dispatcher.dispatch() == 0
+
+        db_session.execute(update(OutboxEvent).values(available_at=func.now()))
+        db_session.commit()
+        stub_rails.failures = 1
+        assert await dispatcher.dispatch() == 0
+
+    statuses = sorted((event.status, event.attempts) for event in db_session.query(OutboxEvent).all())
+    assert statuses == [('delivered', 1), ('failed', 2)]
+    assert len(stub_rails.journal_entries) == 1
@@ -1,5 +1,5 @@
 import pytest
-from sqlalchemy import select, desc, func
+from sqlalchemy import select, desc, func, text
 from sqlalchemy.orm import joinedload
 from decimal import Decimal
 from fastapi import HTTPException
@@ -13,8 +13,28 @@ def test_analyze(client, db_session, user_sean_ali):
     headers = {
         "Authorization": f"Bearer {token}"
     }
-    response = client.get("/api/purchase_invoices_query_analysis", headers=headers)
+    response = client.get("/api/purchase_invoices_query_analysis?data_counts=200&data_counts=100&runs=2", headers=headers)
     assert response.status_code == 200
     response_body = response.json()
 
-    assert len(response_body['data']) == 10
\ No newline at end of file
+    assert [data_point['data_count'] for data_point in response_body['data']] == [100, 200]
+    for data_point in response_body['data']:
+        assert [strategy['name'] for strategy in data_point['strategies']] == ['id_prefetch_offset', 'single_query_offset', 'keyset']
+        assert Decimal(data_point['query_time1']) > 0
+        assert Decimal(data_point['query_time3']) > 0
+        for strategy in data_point['strategies']:
+            assert strategy['row_count'] == 6
+            assert strategy['plan']['execution_time_ms'] >= 0
+
+def test_analyze_reuses_and_shrinks_seeded_invoices(client, db_session):
+    response = client.get("/api/purchase_invoices_query_analysis?data_counts=150&runs=1")
+    assert response.status_code == 200
+
+    response = client.get("/api/purchase_invoices_query_analysis?data_counts=120&runs=1")
+    assert response.status_code == 200
+    assert db_session.execute(text("SELECT COUNT(*) FROM query_benchmark.purchase_invoices")).scalar() == 120
+    assert db_session.execute(text("SELECT COUNT(*) FROM query_benchmark.purchase_invoice_lines")).scalar() == 360
+
+def test_analyze_rejects_out_of_range_data_counts(client):
+    response = client.get("/api/purchase_invoices_query_analysis?data_counts=0")
+    assert response.status_code == 422
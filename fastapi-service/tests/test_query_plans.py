@@ -0,0 +1,161 @@
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.orm import sessionmaker
+from src.schemas import BulkDataParams
+from src.bulk_data.generate_service import GenerateService
+from src.report_purchase_invoices.filter_service import FilterService as PurchaseInvoiceReportFilterService
+from src.report_inventory_movements.filter_service import FilterService as InventoryMovementReportFilterService
+from src.sellable_products.filter_service import FilterService as SellableProductsFilterService
+from src.sales_deliveries.create_service import CreateService as SalesDeliveryCreateService
+from src.payments.filter_service import FilterService as PaymentsFilterService
+from datetime import datetime, timedelta
+
+# Big enough that the planner prefers an index wherever one fits, small enough to seed in a few seconds
+SEED_PARAMS = BulkDataParams(
+    seed=13,
+    users=1000,
+    computer_components=2000,
+    reviews_per_component=2,
+    purchase_invoices=8000,
+    attachment_ratio=0,
+    sales_invoices=8000,
+    sales_delivery_ratio=0.99,
+    cart_lines=0,
+    payments=20000
+)
+
+# Tables that must never be read with a sequential scan by the hot queries below
+LARGE_TABLES = {
+    'purchase_invoices',
+    'purchase_invoice_lines',
+    'inbound_delivery_lines',
+    'sales_invoices',
+    'sales_invoice_lines',
+    'payments',
+    'computer_component_effective_prices'
+}
+
+@pytest.fixture(scope="module")
+def seeded_connection(engine):
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = sessionmaker(bind=connection)()
+    GenerateService(session, SEED_PARAMS).call()
+    session.close()
+    connection.execute(text("ANALYZE"))
+
+    yield connection
+
+    transaction.rollback()
+    connection.close()
+
+@pytest.fixture
+def db_session(seeded_connection):
+    savepoint = seeded_connection.begin_nested()
+    session = sessionmaker(bind=seeded_connection)()
+
+    yield session
+
+    session.close()
+    savepoint.rollback()
+
+def explain_statements(db_session, run, matches):
+    """Runs the real service code and returns the plan of every SELECT it issued that matches"""
+    statements = []
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT') and matches(statement):
+            statements.append((statement, parameters))
+
+    connection = db_session.connection()
+    event.listen(connection, 'before_cursor_execute', record_statement)
+    try:
+        run()
+    finally:
+        event.remove(connection, 'before_cursor_execute', record_statement)
+
+    assert statements, "the service issued no matching statement"
+    return [
+        connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()[0]['Plan']
+        for statement, parameters in statements
+    ]
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from plan_nodes(child)
+
+def sequential_scans(plan):
+    return sorted({
+        node['Relation Name'] for node in plan_nodes(plan)
+        if node['Node Type'] == 'Seq Scan' and node['Relation Name'] in LARGE_TABLES
+    })
+
+def report_dates():
+    today = datetime.now().date()
+    return (today - timedelta(days=60)).strftime('%Y-%m-%d'), today.strftime('%Y-%m-%d')
+
+def purchase_invoice_report(db_session):
+    start_date, end_date = report_dates()
+    return PurchaseInvoiceReportFilterService(
+        db=db_session,
+        start_date=start_date,
+        end_date=end_date,
+        page=1,
+        item_per_page=10,
+        component_name=None,
+        component_category_id=None,
+        invoice_status=None,
+        keyword=None
+    ).call
+
+def inventory_movement_report(db_session):
+    start_date, end_date = report_dates()
+    return InventoryMovementReportFilterService(
+        db=db_session,
+        start_date=start_date,
+        end_date=end_date,
+        page=1,
+        item_per_page=10,
+        component_name=None,
+        component_category_id=None,
+        transaction_type=None,
+        keyword=None
+    ).call
+
+def sellable_products(db_session):
+    return SellableProductsFilterService(
+        db=db_session,
+        start_price='100000',
+        end_price='150000',
+        min_rating='4',
+        component_category_ids=None
+    ).call
+
+def pending_sales_invoices(db_session):
+    return SalesDeliveryCreateService(db_session).call
+
+def payments_index(db_session):
+    return PaymentsFilterService(db=db_session, page=3, item_per_page=50).call
+
+# name: (service under test, which of its statements to explain, planner cost ceiling).
+# Ceilings sit about 50% above the cost measured on SEED_PARAMS; a plan that outgrows one has
+# regressed (dropped index, changed join order, lost partition pruning) and must be looked at.
+HOT_QUERIES = {
+    'purchase_invoice_report': (purchase_invoice_report, 'FROM purchase_invoices', 350),
+    'purchase_invoice_report_lines': (purchase_invoice_report, 'FROM purchase_invoice_lines', 75),
+    'purchase_invoice_report_deliveries': (purchase_invoice_report, 'FROM inbound_delivery_lines', 165),
+    'inventory_movement_report': (inventory_movement_report, 'FROM inventories', 4600),
+    'sellable_products_prices': (sellable_products, 'FROM computer_component_effective_prices', 75),
+    'sellable_products_ratings': (sellable_products, 'FROM computer_component_rating_summaries', 50),
+    'pending_sales_invoices': (pending_sales_invoices, 'FROM sales_invoices', 675),
+    'payments_index': (payments_index, 'FROM payments', 10)
+}
+
+@pytest.mark.parametrize('name', HOT_QUERIES.keys())
+def test_hot_query_plan(db_session, name):
+    build, statement_marker, cost_ceiling = HOT_QUERIES[name]
+    plans = explain_statements(db_session, build(db_session), lambda statement: statement_marker in statement)
+
+    for plan in plans:
+        assert sequential_scans(plan) == []
+        assert plan['Total Cost'] <= cost_ceiling
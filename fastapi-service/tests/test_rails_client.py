@@ -0,0 +1,121 @@
+import pytest
+import httpx
+from fastapi import HTTPException
+from tests.factories.account_factory import AccountFactory
+from tests.stub_rails_server import StubRailsServer
+from tests.conftest import ( db_session, setup_factories, user_sean_ali )
+from src.infrastructure.http.rails_client import ( RailsClient, CircuitBreaker, CircuitOpenError )
+from src.infrastructure.persistence.models.payment import Payment
+from src.domain.payment.commands.generate_payment_load_command import GeneratePaymentLoadCommand
+from src.domain.payment.handlers.payment_command_handler import PaymentCommandHandler
+from src.domain.payment.handlers.payment_load_test_handler import PaymentLoadTestHandler
+
+@pytest.fixture
+def stub_rails():
+    stub = StubRailsServer().start()
+    yield stub
+    stub.stop()
+
+@pytest.fixture
+def account_0(db_session):
+    account = AccountFactory(
+        account_code=200,
+        account_name="Cash",
+        account_type=0,
+        subtype=0,
+        parent_id=None,
+        normal_balance=0,
+        is_active=True,
+        tax_code_id=None
+    )
+
+    db_session.add(account)
+    db_session.commit()
+
+    return account
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.mark.asyncio
+async def test_payments_reuse_pooled_rails_connections(stub_rails, db_session, user_sean_ali, account_0):
+    db_session.commit()
+    command = GeneratePaymentLoadCommand(num_requests=10, user_id=user_sean_ali.id, account_id=account_0.id, concurrency=1)
+
+    async with RailsClient(stub_rails.base_url) as rails_client:
+        result = await PaymentLoadTestHandler(rails_client).handle_generate_load(command, "token", db_session)
+
+    assert result['successful'] == 10
+    assert db_session.query(Payment).count() == 10
+    assert len(stub_rails.requests) == 10
+    # Every user lookup went over the same keep-alive connection
+    assert len(stub_rails.connections) == 1
+
+@pytest.mark.asyncio
+async def test_idempotent_calls_are_retried_with_jittered_backoff(stub_rails):
+    sleeps = []
+    async def record_sleep(seconds):
+        sleeps.append(seconds)
+
+    stub_rails.failures = 2
+    async with RailsClient(stub_rails.base_url, backoff=0.1, sleep=record_sleep) as rails_client:
+        response = await rails_client.get("/rails/api/users/7", "token")
+
+    assert response.status_code == 200
+    assert len(stub_rails.requests) == 3
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= 0.1
+    assert 0 <= sleeps[1] <= 0.2
+
+@pytest.mark.asyncio
+async def test_journal_posts_that_reached_rails_are_not_retried(stub_rails):
+    stub_rails.failures = 1
+    async with RailsClient(stub_rails.base_url) as rails_client:
+        response = await rails_client.post("/rails/api/journal_entries", "token", json={ 'journal_entry': {} })
+
+    assert response.status_code == 503
+    assert stub_rails.requests == [('POST', '/rails/api/journal_entries')]
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_fails_fast_then_recovers(stub_rails):
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+    stub_rails.failures = 2
+
+    async with RailsClient(stub_rails.base_url, breaker=breaker, max_retries=0) as rails_client:
+        handler = PaymentCommandHandler(rails_client)
+        for _ in range(2):
+            assert (await rails_client.get("/rails/api/users/7", "token")).status_code == 503
+        assert breaker.state == "open"
+
+        with pytest.raises(CircuitOpenError):
+            await rails_client.get("/rails/api/users/7", "token")
+        with pytest.raises(HTTPException) as error:
+            await handler._validate_user(7, "token")
+        assert error.value.status_code == 503
+        assert len(stub_rails.requests) == 2
+
+        clock.now = 30
+        assert breaker.state == "half_open"
+        await handler._validate_user(7, "token")
+        assert breaker.state == "closed"
+        assert len(stub_rails.requests) == 3
+
+@pytest.mark.asyncio
+async def test_unreachable_rails_is_reported_as_unavailable(stub_rails):
+    stub_rails.stop()
+    sleeps = []
+    async def record_sleep(seconds):
+        sleeps.append(seconds)
+
+    async with RailsClient(stub_rails.base_url, sleep=record_sleep) as rails_client:
+        with pytest.raises(HTTPException) as error:
+            await PaymentCommandHandler(rails_client)._validate_user(7, "token")
+
+    assert error.value.status_code == 503
+    assert len(sleeps) == 2
+    stub_rails.start(stub_rails.port)
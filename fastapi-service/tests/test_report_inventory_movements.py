@@ -2,7 +2,8 @@ from src.models import (
     Inventory
 )
 import pytest
-from sqlalchemy import select, desc, func
+from sqlalchemy import select, desc, func, event, text
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import joinedload
 from tests.factories.inbound_delivery_factory import InboundDeliveryFactory
 from tests.factories.inbound_delivery_line_factory import InboundDeliveryLineFactory
@@ -12,9 +13,11 @@ from tests.factories.purchase_invoice_line_factory import PurchaseInvoiceLineFac
 from tests.factories.component_factory import ComponentFactory
 from tests.factories.component_category_factory import ComponentCategoryFactory
 from tests.factories.inventory_factory import InventoryFactory
+from src.report_inventory_movements.filter_service import FilterService
 from tests.conftest import ( component_category_fan, component_liquid_cooling_fan_1, client, db_session, setup_factories )
 from decimal import Decimal
 from datetime import ( datetime, timedelta )
+import re
 
 @pytest.fixture
 def component_fan_1(component_category_fan):
@@ -303,3 +306,148 @@ def test_index(
                                 {'text': 'Out Stock'},
                                 {'text': 'Final Moving Stock'},
                                 {'text': 'Buy Price / Unit'}]}
+
+def test_index_second_page_continues_running_stock(
+        client,
+        db_session,
+        inbound_delivery_1,
+        inbound_delivery_2,
+        inventories_from_inbound_d1,
+        inventories_from_inbound_d2
+    ):
+    db_session.commit()
+    response = client.get("/api/report/inventory-movement?page=2&item_per_page=1")
+    assert response.status_code == 200
+
+    report_body = response.json()['report_body']
+    assert len(report_body) == 1
+    assert report_body[0][1]['text'] == 'CPU Liquid Cooling RGB'
+    assert report_body[0][5]['text'] == inbound_delivery_2.inbound_delivery_no
+    assert report_body[0][9] == {'cell_type': 'quantity', 'text': '4'}
+
+def test_index_date_filter_keeps_opening_balance(
+        client,
+        db_session,
+        component_fan_1,
+        inbound_delivery_1,
+        inventories_from_inbound_d1
+    ):
+    InventoryFactory(
+        out_stock=1,
+        stock_date=datetime.now().date() - timedelta(days=3),
+        component_id=component_fan_1.id,
+        resource_line_id=0,
+        resource_line_type='SalesDeliveryLine',
+        resource_id=0,
+        resource_type='SalesDelivery',
+        buy_price=0
+    )
+    InventoryFactory(
+        in_stock=5,
+        stock_date=datetime.now().date() - timedelta(days=5),
+        component_id=component_fan_1.id,
+        resource_line_id=0,
+        resource_line_type='SalesDeliveryLine',
+        resource_id=0,
+        resource_type='SalesDelivery',
+        buy_price=0
+    )
+    db_session.commit()
+
+    start_date = (datetime.now().date() - timedelta(days=1)).strftime('%Y-%m-%d')
+    response = client.get(f"/api/report/inventory-movement?start_date={start_date}&component_name=Noctua")
+    assert response.status_code == 200
+
+    report_body = response.json()['report_body']
+    assert len(report_body) == 1
+    assert report_body[0][7] == {'cell_type': 'quantity', 'text': '3'}
+    assert report_body[0][9] == {'cell_type': 'quantity', 'text': '7'}
+
+def test_index_loads_inventory_resources_in_batch(
+        client,
+        db_session,
+        inbound_delivery_1,
+        inbound_delivery_2,
+        inventories_from_inbound_d1,
+        inventories_from_inbound_d2
+    ):
+    db_session.commit()
+    expected_transaction_nos = [
+        inbound_delivery_1.inbound_delivery_no,
+        inbound_delivery_2.inbound_delivery_no,
+        inbound_delivery_1.inbound_delivery_no,
+        inbound_delivery_2.inbound_delivery_no
+    ]
+    db_session.expunge_all()
+
+    statements = []
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind().engine
+    event.listen(engine, 'before_cursor_execute', record_statement)
+    try:
+        response = client.get("/api/report/inventory-movement")
+    finally:
+        event.remove(engine, 'before_cursor_execute', record_statement)
+
+    assert response.status_code == 200
+    transaction_nos = [row[5]['text'] for row in response.json()['report_body']]
+    assert transaction_nos == expected_transaction_nos
+    assert len([statement for statement in statements if 'FROM inbound_deliveries' in statement]) == 1
+    assert len([statement for statement in statements if 'FROM inbound_delivery_lines' in statement]) == 1
+
+def test_index_follows_cursor_with_filters(
+        client,
+        db_session,
+        inbound_delivery_1,
+        inbound_delivery_2,
+        inventories_from_inbound_d1,
+        inventories_from_inbound_d2
+    ):
+    db_session.commit()
+    inbound_delivery_2_no = inbound_delivery_2.inbound_delivery_no
+    response = client.get("/api/report/inventory-movement?item_per_page=1&component_name=Noctua")
+    assert response.status_code == 200
+    response_body = response.json()
+    assert response_body['paging']['total_item'] == 2
+    assert response_body['report_body'][0][9] == {'cell_type': 'quantity', 'text': '3'}
+
+    next_page_url = response_body['paging']['pagination']['next_page_url']
+    assert 'cursor=' in next_page_url
+    assert 'component_name=Noctua' in next_page_url
+
+    response = client.get(next_page_url)
+    assert response.status_code == 200
+    response_body = response.json()
+    assert response_body['report_body'][0][5]['text'] == inbound_delivery_2_no
+    assert response_body['report_body'][0][9] == {'cell_type': 'quantity', 'text': '6'}
+    assert response_body['paging']['pagination']['next_page_url'] is None
+
+def explained_partitions(db_session, query):
+    statement = query.statement.compile(dialect=postgresql.dialect(), compile_kwargs={ 'literal_binds': True })
+    plan = db_session.execute(text(f"EXPLAIN {statement}")).scalars().all()
+    return set(re.findall(r'on (inventories_\w+)', '\n'.join(plan)))
+
+def test_index_date_filter_prunes_partitions(db_session):
+    today = datetime.now().date()
+    this_month = f"inventories_{today:%Y_%m}"
+    next_month = f"inventories_{(today.replace(day=1) + timedelta(days=32)):%Y_%m}"
+    filter_service = FilterService(
+        db=db_session,
+        start_date=today.replace(day=1).strftime('%Y-%m-%d'),
+        end_date=today.strftime('%Y-%m-%d'),
+        page=1,
+        item_per_page=10,
+        component_name=None,
+        component_category_id=None,
+        transaction_type=None,
+        keyword=None
+    )
+
+    assert explained_partitions(db_session, filter_service.filtered_query()) == { this_month }
+
+    # The opening balance reads the earlier months, nothing after end_date is touched
+    report_partitions = explained_partitions(db_session, filter_service.report_query())
+    assert this_month in report_partitions
+    assert next_month not in report_partitions
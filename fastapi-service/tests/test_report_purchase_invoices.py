@@ -652,3 +652,57 @@ def test_index_all_filter_assigned_yet_empty(client, db_session, inbound_deliver
                                 {'text': 'Total Amount Received'},
                                 {'text': 'Inbound Delivery Date'},
                                 {'text': 'Inbound Delivery No'}]}
+
+def test_index_paginates_with_cursor_and_filtered_total(client, db_session, component_category_fan, component_fan_1, component_liquid_cooling_fan_1):
+    purchase_invoices = []
+    for component in [component_fan_1, component_liquid_cooling_fan_1, component_fan_1]:
+        purchase_invoices.append(PurchaseInvoiceFactory(
+            invoice_date=func.now(),
+            notes="testing",
+            supplier_name="Aftershock PC",
+            purchase_invoice_lines=[
+                PurchaseInvoiceLineFactory.build(
+                    component_id=component.id,
+                    component_name=component.name,
+                    component_category_id=component_category_fan.id,
+                    component_category_name=component_category_fan.name,
+                    quantity=1,
+                    price_per_unit=1000,
+                    total_line_amount=1000
+                )
+            ]
+        ))
+    db_session.commit()
+    newest_first = [invoice.purchase_invoice_no for invoice in reversed(purchase_invoices)]
+    component_fan_1_name = component_fan_1.name
+
+    response = client.get("/api/report/purchase-invoice?item_per_page=2")
+    assert response.status_code == 200
+    response_body = response.json()
+    assert [row[0]['text'] for row in response_body['report_body']] == newest_first[:2]
+    assert response_body['paging']['total_item'] == 3
+    next_page_url = response_body['paging']['pagination']['next_page_url']
+    assert 'cursor=' in next_page_url
+    assert 'item_per_page=2' in next_page_url
+
+    response = client.get(next_page_url)
+    assert response.status_code == 200
+    response_body = response.json()
+    assert [row[0]['text'] for row in response_body['report_body']] == newest_first[2:]
+    assert response_body['paging']['page'] == 2
+    assert response_body['paging']['pagination']['next_page_url'] is None
+
+    response = client.get(f"/api/report/purchase-invoice?component_name={component_fan_1_name}")
+    assert response.json()['paging']['total_item'] == 2
+
+    response = client.get("/api/report/purchase-invoice?invoice_status=3")
+    assert response.json()['paging']['total_item'] == 0
+
+def test_index_estimates_total_past_exact_count_limit(client, db_session, inbound_delivery_1):
+    db_session.commit()
+
+    with patch('src.report.paging_service.EXACT_COUNT_LIMIT', 0):
+        response = client.get("/api/report/purchase-invoice?keyword=BUY&start_date=2000-01-01")
+
+    assert response.status_code == 200
+    assert response.json()['paging']['total_item'] >= 1
@@ -3,12 +3,17 @@ from unittest.mock import patch, ANY, MagicMock, AsyncMock
 from io import BytesIO
 from fastapi import UploadFile
 from src.api.api import app
+from src.api.dependencies.http_clients import get_upload_http_client
 
 import pytest
 import boto3
-import requests
+import asyncio
+import httpx
 import uuid
 
+def mock_upload_http_client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
 @pytest.mark.asyncio
 async def test_upload_file_success(client):
     test_uuid = uuid.UUID('12345678123456781234567812345678')
@@ -19,15 +24,15 @@ async def test_upload_file_success(client):
         }
     }
 
-    mock_http_response = MagicMock()
-    mock_http_response.status_code = 200
-    mock_file = AsyncMock(spec=UploadFile)
-    mock_file.file_name = "test_image.jpg"
-    mock_file.read.return_value = b"test file content"
+    uploaded_requests = []
+    def handler(request: httpx.Request):
+        uploaded_requests.append(request)
+        return httpx.Response(204)
+
+    app.dependency_overrides[get_upload_http_client] = lambda: mock_upload_http_client(handler)
 
     with patch('uuid.uuid4', return_value=test_uuid), \
-         patch('src.api.api.create_presigned_post', return_value=mock_presigned_post), \
-         patch('requests.post', return_value=mock_http_response):
+         patch('src.uploads.s3_upload_service.create_presigned_post', return_value=mock_presigned_post):
         
         test_file = BytesIO(b"test file content")
 
@@ -35,10 +40,110 @@ async def test_upload_file_success(client):
                                files={"file": ("test_image.jpg", test_file, "image/jpeg")})
         assert response.status_code == 200
         assert response.json() == {
-            'status_code': 200,
+            'status_code': 204,
             's3_key': '12345678123456781234567812345678_test.jpg'
         }
 
+    assert len(uploaded_requests) == 1
+    uploaded = uploaded_requests[0]
+    assert str(uploaded.url) == 'https://mock-s3-url.com'
+    assert 'transfer-encoding' not in uploaded.headers
+    assert int(uploaded.headers['content-length']) == len(uploaded.content)
+    assert b'name="key"\r\n\r\n12345678123456781234567812345678_test.jpg' in uploaded.content
+    assert b'Content-Type: image/jpeg\r\n\r\ntest file content\r\n' in uploaded.content
+
+def test_upload_file_returns_bad_gateway_when_storage_is_unreachable(client):
+    mock_presigned_post = { 'url': 'https://mock-s3-url.com', 'fields': { 'key': 'test.jpg' } }
+
+    def handler(request: httpx.Request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    app.dependency_overrides[get_upload_http_client] = lambda: mock_upload_http_client(handler)
+
+    with patch('src.uploads.s3_upload_service.create_presigned_post', return_value=mock_presigned_post):
+        response = client.post("/api/upload_url",
+                               files={"file": ("test_image.jpg", BytesIO(b"test file content"), "image/jpeg")})
+
+    assert response.status_code == 502
+
+@pytest.fixture
+def moto_s3_bucket():
+    from moto.server import ThreadedMotoServer
+    from config import setting
+    from src.api.s3_dependencies import s3_client, bucket_name
+
+    server = ThreadedMotoServer(port=0)
+    server.start()
+    host, port = server.get_host_and_port()
+
+    original_endpoint_url = setting.AWS_S3_ENDPOINT_URL
+    setting.AWS_S3_ENDPOINT_URL = f"http://{host}:{port}"
+    s3_client.cache_clear()
+    s3_client().create_bucket(Bucket=bucket_name())
+
+    yield s3_client()
+
+    setting.AWS_S3_ENDPOINT_URL = original_endpoint_url
+    s3_client.cache_clear()
+    server.stop()
+
+def test_upload_file_to_s3(client, moto_s3_bucket):
+    from src.api.s3_dependencies import bucket_name
+
+    response = client.post("/api/upload_url",
+                           files={"file": ("test_image.jpg", BytesIO(b"test file content"), "image/jpeg")})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['status_code'] == 204
+    assert body['s3_key'].endswith('_test_image.jpg')
+
+    s3_object = moto_s3_bucket.get_object(Bucket=bucket_name(), Key=body['s3_key'])
+    assert s3_object['Body'].read() == b"test file content"
+
+def test_multi_upload_files_to_s3(client, moto_s3_bucket):
+    from src.api.s3_dependencies import bucket_name
+
+    contents = [f"image {index}".encode() * 1000 for index in range(6)]
+    files = [("files", (f"image_{index}.jpg", BytesIO(content), "image/jpeg")) for index, content in enumerate(contents)]
+
+    response = client.post("/api/multi_upload_url", files=files)
+
+    assert response.status_code == 200
+    image_list = response.json()['image_list']
+    assert len(image_list) == 6
+
+    for index, image in enumerate(image_list):
+        assert image['status_code'] == 204
+        assert image['s3_key'].endswith(f'_image_{index}.jpg')
+        s3_object = moto_s3_bucket.get_object(Bucket=bucket_name(), Key=image['s3_key'])
+        assert s3_object['Body'].read() == contents[index]
+
+@pytest.mark.asyncio
+async def test_upload_many_respects_concurrency_limit():
+    from src.uploads.s3_upload_service import S3UploadService
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def handler(request: httpx.Request):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(204)
+
+    files = [UploadFile(file=BytesIO(b"content"), filename=f"image_{index}.jpg", size=7) for index in range(10)]
+
+    with patch('src.uploads.s3_upload_service.create_presigned_post',
+               side_effect=lambda name: { 'url': 'https://mock-s3-url.com', 'fields': { 'key': name } }):
+        async with mock_upload_http_client(handler) as http_client:
+            results = await S3UploadService(http_client, max_concurrent_uploads=3).upload_many(files)
+
+    assert len(results) == 10
+    assert max_in_flight == 3
+
 def test_upload_file(client):
     s3_client = boto3.client('s3')
     bucket_name = 'test-bucket'
@@ -65,3 +170,41 @@ def test_upload_file(client):
         assert stubbed_response == sample_response
         mock_method.assert_called_with(bucket_name, file_name, ExpiresIn=3600)
 
+
+def test_presigned_url_is_cached_per_key():
+    from src.api.s3_dependencies import presigned_url, presigned_url_cache, s3_client
+
+    presigned_url_cache.clear()
+    with patch.object(s3_client(), 'generate_presigned_url', side_effect=['https://signed/1', 'https://signed/2']) as mock_method:
+        assert presigned_url('component-a.jpg') == 'https://signed/1'
+        assert presigned_url('component-a.jpg') == 'https://signed/1'
+        assert presigned_url('component-b.jpg') == 'https://signed/2'
+
+        assert mock_method.call_count == 2
+        mock_method.assert_called_with(
+            'get_object',
+            Params={'Bucket': 'hassle-free-computers-bucket', 'Key': 'component-b.jpg'},
+            ExpiresIn=3600
+        )
+    presigned_url_cache.clear()
+
+def test_presigned_url_cache_expires_before_the_link():
+    from src.api.s3_dependencies import PresignedUrlCache, PRESIGNED_URL_CACHE_TTL, PRESIGNED_URL_EXPIRES_IN
+
+    assert PRESIGNED_URL_CACHE_TTL < PRESIGNED_URL_EXPIRES_IN
+
+    cache = PresignedUrlCache(ttl_seconds=10, max_size=2)
+    with patch('src.api.s3_dependencies.time.monotonic', return_value=100.0):
+        cache.set('a', 'https://signed/a')
+        cache.set('b', 'https://signed/b')
+        cache.set('c', 'https://signed/c')
+        assert cache.get('a') is None
+        assert cache.get('b') == 'https://signed/b'
+
+    with patch('src.api.s3_dependencies.time.monotonic', return_value=110.0):
+        assert cache.get('b') is None
+
+def test_s3_client_is_shared():
+    from src.api.s3_dependencies import s3_client
+
+    assert s3_client() is s3_client()
@@ -0,0 +1,138 @@
+import pytest
+from fastapi import HTTPException
+from tests.factories.account_factory import AccountFactory
+from tests.stub_rails_server import StubRailsServer
+from tests.conftest import ( client, db_session, setup_factories, user_sean_ali )
+from utils.auth import create_access_token
+from src.api.api import app
+from src.infrastructure.http.rails_client import RailsClient
+from src.infrastructure.http.user_validation_cache import UserValidationCache
+from src.domain.payment.commands.generate_payment_load_command import GeneratePaymentLoadCommand
+from src.domain.payment.handlers.payment_command_handler import PaymentCommandHandler
+from src.domain.payment.handlers.payment_load_test_handler import PaymentLoadTestHandler
+
+@pytest.fixture
+def stub_rails():
+    stub = StubRailsServer(user_ids={ 7 }).start()
+    yield stub
+    stub.stop()
+
+@pytest.fixture
+def account_0(db_session):
+    account = AccountFactory(
+        account_code=200,
+        account_name="Cash",
+        account_type=0,
+        subtype=0,
+        parent_id=None,
+        normal_balance=0,
+        is_active=True,
+        tax_code_id=None
+    )
+
+    db_session.add(account)
+    db_session.commit()
+
+    return account
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def user_lookups(stub_rails) -> list:
+    return [path for method, path in stub_rails.requests if method == 'GET']
+
+@pytest.mark.asyncio
+async def test_repeat_payments_skip_the_user_lookup(db_session, user_sean_ali, account_0):
+    db_session.commit()
+    stub_rails = StubRailsServer(user_ids={ user_sean_ali.id }).start()
+    command = GeneratePaymentLoadCommand(num_requests=10, user_id=user_sean_ali.id, account_id=account_0.id, concurrency=1)
+
+    try:
+        async with RailsClient(stub_rails.base_url) as rails_client:
+            handler = PaymentLoadTestHandler(rails_client, UserValidationCache())
+            result = await handler.handle_generate_load(command, "token", db_session)
+    finally:
+        stub_rails.stop()
+
+    assert result['successful'] == 10
+    assert user_lookups(stub_rails) == [f"/rails/api/users/{user_sean_ali.id}"]
+    # Journal entries wait in the outbox, the payments themselves only touched Rails once
+    assert stub_rails.journal_entries == []
+    assert 'validate_user' in result['latency_ms']
+
+@pytest.mark.asyncio
+async def test_user_lookups_are_remembered_per_token_until_they_expire(stub_rails):
+    clock = FakeClock()
+    cache = UserValidationCache(ttl_seconds=120, negative_ttl_seconds=30, clock=clock)
+
+    async with RailsClient(stub_rails.base_url) as rails_client:
+        handler = PaymentCommandHandler(rails_client, cache)
+        for _ in range(3):
+            await handler._validate_user(7, "token-a")
+            with pytest.raises(HTTPException) as error:
+                await handler._validate_user(404, "token-a")
+            assert error.value.status_code == 404
+        assert len(user_lookups(stub_rails)) == 2
+
+        # Another token has not been accepted by Rails yet
+        await handler._validate_user(7, "token-b")
+        assert len(user_lookups(stub_rails)) == 3
+
+        # Not found answers expire first
+        clock.now = 30
+        await handler._validate_user(7, "token-a")
+        with pytest.raises(HTTPException):
+            await handler._validate_user(404, "token-a")
+        assert len(user_lookups(stub_rails)) == 4
+
+        clock.now = 120
+        await handler._validate_user(7, "token-a")
+        assert len(user_lookups(stub_rails)) == 5
+
+@pytest.mark.asyncio
+async def test_failed_lookups_are_not_remembered(stub_rails):
+    cache = UserValidationCache()
+    stub_rails.failures = 3
+
+    async with RailsClient(stub_rails.base_url, max_retries=0) as rails_client:
+        handler = PaymentCommandHandler(rails_client, cache)
+        with pytest.raises(HTTPException):
+            await handler._validate_user(7, "token")
+
+    assert cache.get(7, "token") is None
+    assert cache.entries == {}
+
+def test_invalidate_forgets_every_token_of_the_user():
+    cache = UserValidationCache(max_entries=3)
+    cache.set(7, "token-a", True)
+    cache.set(7, "token-b", True)
+    cache.set(8, "token-a", False)
+
+    assert cache.invalidate(7) == 2
+    assert cache.get(7, "token-a") is None
+    assert cache.get(8, "token-a") is False
+
+    # The least recently used entry goes once the cache is full
+    cache.set(9, "token-a", True)
+    cache.set(10, "token-a", True)
+    cache.get(8, "token-a")
+    cache.set(11, "token-a", True)
+    assert cache.get(9, "token-a") is None
+    assert cache.get(8, "token-a") is False
+    assert len(cache.entries) == 3
+    assert 9 not in cache.keys_by_user
+
+def test_invalidation_hook(client, user_sean_ali):
+    token = create_access_token(user_sean_ali.id, 30)
+    cache = app.state.user_validation_cache
+    cache.set(42, token, True)
+
+    response = client.delete("/api/payments/user-validation-cache/42", headers={ "Authorization": f"Bearer {token}" })
+
+    assert response.status_code == 200
+    assert response.json() == { 'user_id': 42, 'invalidated': 1 }
+    assert cache.get(42, token) is None